@@ -0,0 +1 @@
+# Orchestrator benchmarks package initialization
@@ -0,0 +1,310 @@
+"""Benchmark: latency percentiles and throughput of the main API endpoints, against a fake Docker daemon.
+
+Runs the FastAPI app in-process and drives `/schedule`, `/status`, `/jobs`, `/logs` and
+`/download` for every combination of `--concurrency` (requests in flight) and `--history`
+(finished job records already in the store). The fake daemon's per-operation latencies and
+failure rates are set with `--latency` and `--failure-rate`; no daemon or network is needed.
+
+p50/p95/p99 latency and requests/second per endpoint are written to `--output` as JSON. Pass an
+earlier run's file as `--baseline` to print the change per endpoint; with `--max-regression`
+the run exits non-zero when any endpoint's p95 grew by more than that many percent.
+
+Run with: python -m benchmarks.bench_api --concurrency 8,32 --history 0,10000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import docker
+import httpx
+from benchmarks.fake_docker import FakeDockerClient
+
+ENDPOINTS = ("schedule", "status", "jobs", "logs", "download")
+DEFAULT_MIX = "schedule=1,status=4,jobs=1,logs=2,download=1"
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of non-empty `samples`."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(len(ordered) * pct / 100) - 1)]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+    }
+    for pct in (50, 95, 99):
+        summary[f"p{pct}_ms"] = round(percentile(latencies, pct) * 1000, 3) if latencies else None
+    summary["max_ms"] = round(max(latencies) * 1000, 3) if latencies else None
+    return summary
+
+
+def parse_pairs(text: str, cast: Any = float) -> Dict[str, Any]:
+    """'a=1,b=2' -> {"a": 1.0, "b": 2.0}."""
+    pairs = {}
+    for item in filter(None, text.split(",")):
+        key, _, value = item.partition("=")
+        pairs[key.strip()] = cast(value)
+    return pairs
+
+
+def seed_history(manager: Any, count: int) -> None:
+    """Store `count` finished job records in one transaction, as a long-running orchestrator would have."""
+    jobs = {}
+    now = time.time()
+    for i in range(count):
+        job_id, job = manager._new_job(f"history {i}", 0, None)
+        job.update({"status": "complete", "container_id": f"gone-{i}", "started": now, "completed": now, "exit_code": 0})
+        jobs[job_id] = job
+    if jobs:
+        manager.store.upsert_many(jobs)
+        with manager.lock:
+            manager.jobs.update(jobs)
+
+
+async def finish_jobs(manager: Any, fake: FakeDockerClient, count: int, artifact_kb: int, log_lines: int) -> List[str]:
+    """Run `count` jobs to completion with some output and logs, for `/logs` and `/download` to serve."""
+    job_ids = [manager.submit_job(f"finished {i}") for i in range(count)]
+    while any(manager.jobs[job_id]["status"] != "running" for job_id in job_ids):
+        await asyncio.sleep(0.01)
+    for job_id in job_ids:
+        with open(os.path.join(manager.jobs[job_id]["output_path"], "payload.bin"), "wb") as f:
+            f.write(os.urandom(artifact_kb * 1024))
+        container = fake.containers_by_id[manager.jobs[job_id]["container_id"]]
+        container.write(b"".join(b"log line %d\n" % n for n in range(log_lines)))
+        fake.finish(container.id, 0)
+    while any(manager.jobs[job_id]["status"] != "complete" for job_id in job_ids):
+        await asyncio.sleep(0.01)
+    for job_id in job_ids:
+        manager.get_output(job_id)  # build archives now, so /download measures serving them
+    return job_ids
+
+
+async def drive(
+    app: Any, finished: List[str], concurrency: int, duration: float, mix: Dict[str, float], seed: int
+) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+    """Keep `concurrency` requests in flight for `duration` seconds, picking endpoints by `mix` weight."""
+    latencies: Dict[str, List[float]] = {name: [] for name in mix}
+    errors: Dict[str, int] = {name: 0 for name in mix}
+    names, weights = list(mix), list(mix.values())
+    known = list(finished)  # /status alternates between finished and freshly scheduled jobs
+    counter = 0
+
+    async def request(client: httpx.AsyncClient, name: str, rng: random.Random) -> httpx.Response:
+        nonlocal counter
+        if name == "schedule":
+            counter += 1
+            resp = await client.post("/schedule", json={"prompt": f"bench {counter}", "no_cache": True})
+            if resp.is_success:
+                known.append(resp.json()["job_id"])
+            return resp
+        if name == "status":
+            return await client.get(f"/status/{rng.choice(known)}")
+        if name == "jobs":
+            return await client.get("/jobs", params={"limit": 50})
+        if name == "logs":
+            return await client.get(f"/logs/{rng.choice(finished)}", params={"lines": 100})
+        return await client.get(f"/download/{rng.choice(finished)}")
+
+    async def worker(client: httpx.AsyncClient, index: int, deadline: float) -> None:
+        rng = random.Random(seed + index)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                ok = (await request(client, name, rng)).is_success
+            except httpx.HTTPError:
+                ok = False
+            latencies[name].append(time.perf_counter() - start)
+            if not ok:
+                errors[name] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(worker(client, i, deadline) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+async def run_scenario(
+    app: Any,
+    manager: Any,
+    fake: FakeDockerClient,
+    concurrency: int,
+    history: int,
+    duration: float,
+    mix: Dict[str, float],
+    latencies: Optional[Dict[str, float]] = None,
+    failure_rates: Optional[Dict[str, float]] = None,
+    job_duration: Optional[float] = None,
+    finished_jobs: int = 8,
+    artifact_kb: int = 256,
+    log_lines: int = 1000,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Measure one (concurrency, history) combination against an already started JobManager."""
+    seed_history(manager, history)
+    while not manager.reconciled.is_set():
+        await asyncio.sleep(0.01)
+    finished = await finish_jobs(manager, fake, finished_jobs, artifact_kb, log_lines)
+    # Set up with a well-behaved daemon; the configured one applies to the measured part only.
+    fake.latencies.update(latencies or {})
+    fake.failure_rates.update(failure_rates or {})
+    fake.job_duration = job_duration
+    completed_before = manager.store.count_by_status().get("complete", 0)
+    samples, errors, elapsed = await drive(app, finished, concurrency, duration, mix, seed)
+    all_samples = [sample for name in samples for sample in samples[name]]
+    return {
+        "concurrency": concurrency,
+        "history": history,
+        "duration_seconds": round(elapsed, 3),
+        "endpoints": {name: summarize(samples[name], errors[name], elapsed) for name in samples},
+        "total": summarize(all_samples, sum(errors.values()), elapsed),
+        "jobs_completed": manager.store.count_by_status().get("complete", 0) - completed_before,
+        "injected_failures": dict(fake.injected_failures),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from src.orchestrator.api import job_manager as job_manager_module
+    from src.orchestrator.api import orchestrator
+    from src.orchestrator.api.async_job_manager import AsyncJobManager
+    from src.orchestrator.api.job_store import SqliteJobStore
+    from src.orchestrator.config import config
+
+    logging.getLogger().setLevel(logging.WARNING)  # per-request INFO logging would dominate the profile
+    # Admission must not depend on how busy the benchmarking machine is.
+    config.HEALTH_MONITOR_ENABLED = False
+    config.MAX_CONCURRENT_JOBS = args.max_running
+    mix = parse_pairs(args.mix)
+    unknown = set(mix) - set(ENDPOINTS)
+    if unknown:
+        raise SystemExit(f"Unknown endpoints in --mix: {', '.join(sorted(unknown))}")
+    scenarios = []
+    for history in (int(h) for h in args.history.split(",")):
+        for concurrency in (int(c) for c in args.concurrency.split(",")):
+            output_dir = tempfile.mkdtemp(prefix="agent_jobs_bench_")
+            job_manager_module.OUTPUT_DIR = output_dir
+            fake = FakeDockerClient(seed=args.seed)
+            store = SqliteJobStore(os.path.join(output_dir, "jobs.db"))
+            manager = job_manager_module.JobManager(docker_client=fake, store=store)
+            orchestrator.job_manager = manager
+            orchestrator.async_job_manager = AsyncJobManager(manager)
+            manager.start()
+            try:
+                result = await run_scenario(
+                    orchestrator.app, manager, fake, concurrency, history, args.duration, mix,
+                    parse_pairs(args.latency), parse_pairs(args.failure_rate), args.job_duration,
+                    args.finished_jobs, args.artifact_kb, args.log_lines, args.seed,
+                )
+            finally:
+                manager.stop()
+                orchestrator.async_job_manager.shutdown()
+                store.close()
+                shutil.rmtree(output_dir, ignore_errors=True)
+            scenarios.append(result)
+            total = result["total"]
+            print(
+                f"history={history} concurrency={concurrency}: {total['throughput_rps']} req/s, "
+                f"p50 {total['p50_ms']} ms, p95 {total['p95_ms']} ms, p99 {total['p99_ms']} ms, "
+                f"{total['errors']} errors"
+            )
+    return {
+        "benchmark": "bench_api",
+        "created": time.time(),
+        "python": platform.python_version(),
+        "settings": {
+            "duration": args.duration,
+            "mix": mix,
+            "latency": parse_pairs(args.latency),
+            "failure_rate": parse_pairs(args.failure_rate),
+            "job_duration": args.job_duration,
+            "max_running": args.max_running,
+            "finished_jobs": args.finished_jobs,
+            "artifact_kb": args.artifact_kb,
+            "seed": args.seed,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-endpoint p95 and throughput change against `baseline`, for scenarios present in both."""
+    previous = {(s["concurrency"], s["history"]): s for s in baseline.get("scenarios", [])}
+    changes = []
+    for scenario in report["scenarios"]:
+        before = previous.get((scenario["concurrency"], scenario["history"]))
+        if not before:
+            continue
+        for name, now in scenario["endpoints"].items():
+            old = before["endpoints"].get(name)
+            if not old or not old["p95_ms"] or not now["p95_ms"]:
+                continue
+            changes.append({
+                "concurrency": scenario["concurrency"],
+                "history": scenario["history"],
+                "endpoint": name,
+                "p95_ms": (old["p95_ms"], now["p95_ms"]),
+                "p95_change_pct": round((now["p95_ms"] / old["p95_ms"] - 1) * 100, 1),
+                "throughput_rps": (old["throughput_rps"], now["throughput_rps"]),
+            })
+    return changes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="8,32", help="comma-separated requests in flight")
+    parser.add_argument("--history", default="0,10000", help="comma-separated finished jobs already stored")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds measured per scenario")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint weights")
+    parser.add_argument("--latency", default="run=0.05", help="fake daemon seconds per operation, e.g. run=0.5,get=0.002")
+    parser.add_argument("--failure-rate", default="", help="fake daemon failure probability per operation, e.g. run=0.01")
+    parser.add_argument("--job-duration", type=float, default=0.5, help="seconds before a scheduled job's container exits")
+    parser.add_argument("--max-running", type=int, default=64, help="MAX_CONCURRENT_JOBS during the run")
+    parser.add_argument("--finished-jobs", type=int, default=8, help="completed jobs served by /logs and /download")
+    parser.add_argument("--artifact-kb", type=int, default=256)
+    parser.add_argument("--log-lines", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_api.json")
+    parser.add_argument("--baseline", help="earlier --output file to compare against")
+    parser.add_argument("--max-regression", type=float, help="fail if any p95 grew by more than this many percent")
+    args = parser.parse_args()
+    os.environ.setdefault("AGENT_OUTPUT_DIR", tempfile.mkdtemp(prefix="agent_jobs_bench_"))
+    docker.from_env = FakeDockerClient
+
+    report = asyncio.run(run(args))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+    if not args.baseline:
+        return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        changes = compare(report, json.load(f))
+    print(f"{'history':>8} {'conc':>5} {'endpoint':>9} {'p95 before':>11} {'p95 after':>10} {'change':>8}")
+    for change in changes:
+        before, after = change["p95_ms"]
+        print(
+            f"{change['history']:>8} {change['concurrency']:>5} {change['endpoint']:>9} "
+            f"{before:>11.2f} {after:>10.2f} {change['p95_change_pct']:>+7.1f}%"
+        )
+    regressed = [c for c in changes if args.max_regression is not None and c["p95_change_pct"] > args.max_regression]
+    if regressed:
+        print(f"{len(regressed)} endpoint(s) regressed by more than {args.max_regression}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Micro-benchmark: cost of persisting one job update as the job history grows.
+
+Run with: python -m benchmarks.bench_job_store
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from src.orchestrator.api.job_store import JsonJobStore, SqliteJobStore
+
+def _job(i: int) -> dict:
+    return {
+        "container_id": uuid.uuid4().hex,
+        "status": "running",
+        "output_path": f"/tmp/agent_jobs/{i}",
+        "logs_path": f"/tmp/agent_jobs/{i}/logs",
+        "error": None,
+        "created": float(i),
+        "started": float(i),
+        "completed": None,
+        "cancelled": None,
+        "exit_code": None,
+    }
+
+def bench(store_cls, path: str, history: int, writes: int) -> float:
+    """Return mean seconds per single-job upsert with `history` jobs already stored."""
+    store = store_cls(path)
+    store.upsert_many({str(i): _job(i) for i in range(history)})
+    ids = [str(i % history) for i in range(writes)]
+    start = time.perf_counter()
+    for job_id in ids:
+        job = _job(int(job_id))
+        job["status"] = "complete"
+        store.upsert(job_id, job)
+    elapsed = time.perf_counter() - start
+    store.close()
+    return elapsed / writes
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="100,1000,5000,20000")
+    parser.add_argument("--writes", type=int, default=200)
+    args = parser.parse_args()
+    print(f"{'jobs':>8} {'json ms/write':>15} {'sqlite ms/write':>17}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as d:
+            json_cost = bench(JsonJobStore, os.path.join(d, "jobs.json"), size, args.writes)
+            sqlite_cost = bench(SqliteJobStore, os.path.join(d, "jobs.db"), size, args.writes)
+        print(f"{size:>8} {json_cost * 1000:>15.3f} {sqlite_cost * 1000:>17.3f}")
+
+if __name__ == "__main__":
+    main()
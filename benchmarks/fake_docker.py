@@ -0,0 +1,326 @@
+"""In-process stand-in for the docker-py client, covering the calls the orchestrator makes.
+
+Per-operation latencies and failure rates ("run", "get", "list", "reload", "remove", "kill") make it
+usable for load tests and benchmarks as well as unit tests.
+"""
+import queue
+import random
+import time
+import uuid
+from threading import Lock, Timer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import docker
+
+
+class FakeEventStream:
+    def __init__(self, filters: Optional[Dict[str, Any]] = None) -> None:
+        self.filters = filters or {}
+        self.events: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self.closed = False
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        label = self.filters.get("label")
+        if not label:
+            return True
+        key, _, value = label.partition("=")
+        attributes = event["Actor"]["Attributes"]
+        return key in attributes and (not value or attributes[key] == value)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        event = self.events.get()
+        if event is None or self.closed:
+            raise StopIteration
+        return event
+
+    def close(self) -> None:
+        self.closed = True
+        self.events.put(None)
+
+
+class FakeContainer:
+    def __init__(self, client: "FakeDockerClient", image: str, name: Optional[str], **kwargs: Any) -> None:
+        self.client = client
+        self.id = uuid.uuid4().hex
+        self.image = image
+        self.name = name or self.id[:12]
+        self.kwargs = kwargs
+        self.labels: Dict[str, str] = kwargs.get("labels") or {}
+        self.status = "running"
+        self.exit_code: Optional[int] = None
+        self.output: List[Tuple[Optional[bytes], Optional[bytes]]] = []
+        self.output_times: List[float] = []
+        self.usage = {"cpus": 0.0, "memory": 0}  # what stats() reports: CPU cores and memory bytes in use
+        self.signals: List[Any] = []
+        self.ignore_sigterm = False  # set to simulate a hung process that only SIGKILL stops
+
+    @property
+    def attrs(self) -> Dict[str, Any]:
+        return {
+            "Id": self.id,
+            "Name": self.name,
+            "Config": {"Image": self.image, "Labels": self.labels},
+            "State": {"Status": self.status, "ExitCode": self.exit_code or 0},
+        }
+
+    def reload(self) -> None:
+        self.client._call("reload")
+        self.client._check_exists(self.id)
+
+    def remove(self, force: bool = False) -> None:
+        self.client._call("remove")
+        self.client._remove(self.id)
+
+    def stop(self, timeout: int = 10) -> None:
+        self.client.finish(self.id, 143)
+
+    def kill(self, signal: Any = "SIGKILL") -> None:
+        self.client._call("kill")
+        self.signals.append(signal)
+        if signal == "SIGTERM" and self.ignore_sigterm:
+            return
+        self.client.finish(self.id, 143 if signal == "SIGTERM" else 137)
+
+    def write(self, data: bytes, stream: str = "stdout") -> None:
+        """Append output as if the agent process had printed it."""
+        self.output_times.append(time.time())
+        self.output.append((data, None) if stream == "stdout" else (None, data))
+
+    def logs(self, stdout: bool = True, stderr: bool = True, stream: bool = False, follow: bool = False,
+             since: Optional[float] = None, **kwargs: Any) -> Any:
+        if stream:
+            return FakeLogStream(self, stdout, stderr, since, follow)
+        return b"".join(out or err for out, err in self.output)
+
+    def stats(self, stream: bool = True, decode: bool = False, **kwargs: Any) -> Any:
+        """Samples in the Docker stats API shape, built from `usage`; streamed every 10ms while running."""
+        def sample(n: int) -> Dict[str, Any]:
+            def cpu(i: int) -> Dict[str, Any]:
+                return {"cpu_usage": {"total_usage": int(i * self.usage["cpus"] * 1e9)},
+                        "system_cpu_usage": int(i * 1e9), "online_cpus": 1}
+            return {"cpu_stats": cpu(n), "precpu_stats": cpu(n - 1),
+                    "memory_stats": {"usage": self.usage["memory"], "stats": {"inactive_file": 0}}}
+        if not stream:
+            return sample(1)
+
+        def follow() -> Iterator[Dict[str, Any]]:
+            n = 1
+            while self.status == "running":
+                yield sample(n)
+                n += 1
+                time.sleep(0.01)
+        return follow()
+
+    def attach(self, **kwargs: Any) -> Iterator[Tuple[Optional[bytes], Optional[bytes]]]:
+        """Replay output so far, then follow it until the container stops (demux=True form)."""
+        sent = 0
+        while True:
+            if sent < len(self.output):
+                yield self.output[sent]
+                sent += 1
+            elif self.status != "running":
+                return
+            else:
+                time.sleep(0.005)
+
+
+class FakeLogStream:
+    """`logs(stream=True)`: one stream's chunks written at or after `since`; closable like docker-py's."""
+
+    def __init__(self, container: FakeContainer, stdout: bool, stderr: bool, since: Optional[float], follow: bool) -> None:
+        self.container = container
+        self.stdout = stdout
+        self.stderr = stderr
+        self.since = since or 0
+        self.follow = follow
+        self.closed = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        sent = 0
+        while not self.closed:
+            if sent < len(self.container.output):
+                out, err = self.container.output[sent]
+                written = self.container.output_times[sent]
+                sent += 1
+                chunk = (out if self.stdout else None) or (err if self.stderr else None)
+                if chunk and written >= self.since:
+                    yield chunk
+            elif not self.follow or self.container.status != "running":
+                return
+            else:
+                time.sleep(0.005)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _SparseContainer:
+    """What `containers.list(sparse=True)` returns: list-API attrs only."""
+
+    def __init__(self, container: FakeContainer) -> None:
+        self.id = container.id
+        status_text = f"Exited ({container.exit_code}) 1 second ago" if container.status == "exited" else "Up 1 second"
+        self.attrs = {"Id": container.id, "State": container.status, "Status": status_text, "Labels": container.labels}
+
+
+class FakeContainers:
+    def __init__(self, client: "FakeDockerClient") -> None:
+        self.client = client
+
+    def run(self, image: str, name: Optional[str] = None, **kwargs: Any) -> FakeContainer:
+        self.client._call("run")
+        container = FakeContainer(self.client, image, name, **kwargs)
+        with self.client.lock:
+            self.client.containers_by_id[container.id] = container
+        self.client.emit(container, "start")
+        if self.client.job_duration is not None:
+            timer = Timer(self.client.job_duration, self.client._run_to_completion, (container.id,))
+            timer.daemon = True
+            timer.start()
+        return container
+
+    def get(self, container_id: str) -> FakeContainer:
+        self.client.get_calls += 1
+        self.client._call("get")
+        return self.client._check_exists(container_id)
+
+    def list(self, all: bool = False, sparse: bool = False, filters: Optional[Dict[str, Any]] = None) -> List[Any]:
+        self.client.list_calls += 1
+        self.client._call("list")
+        with self.client.lock:
+            containers = list(self.client.containers_by_id.values())
+        if not all:
+            containers = [c for c in containers if c.status == "running"]
+        ancestor = (filters or {}).get("ancestor")
+        if ancestor:
+            containers = [c for c in containers if c.image == ancestor]
+        name = (filters or {}).get("name")
+        if name:
+            containers = [c for c in containers if name in c.name]
+        label = (filters or {}).get("label")
+        if label:
+            key, _, value = label.partition("=")
+            containers = [c for c in containers if key in c.labels and (not value or c.labels[key] == value)]
+        return [_SparseContainer(c) for c in containers] if sparse else containers
+
+
+class FakeImage:
+    def __init__(self, image_id: str) -> None:
+        self.id = image_id
+
+
+class FakeImages:
+    def __init__(self) -> None:
+        self.ids: Dict[str, str] = {}  # tag -> image ID; set one to simulate a rebuilt image
+
+    def get(self, name: str) -> FakeImage:
+        return FakeImage(self.ids.setdefault(name, "sha256:" + uuid.uuid4().hex))
+
+
+class FakeDockerClient:
+    def __init__(
+        self,
+        run_latency: float = 0.0,
+        latencies: Optional[Dict[str, float]] = None,
+        failure_rates: Optional[Dict[str, float]] = None,
+        job_duration: Optional[float] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """`latencies` and `failure_rates` are per operation, in seconds and as a 0-1 probability of
+        raising docker.errors.APIError. With `job_duration` set, every container prints a line and
+        exits 0 that many seconds after it starts.
+        """
+        self.latencies: Dict[str, float] = dict(latencies or {})
+        if run_latency:
+            self.latencies["run"] = run_latency
+        self.failure_rates: Dict[str, float] = dict(failure_rates or {})
+        self.job_duration = job_duration
+        self.random = random.Random(seed)
+        self.injected_failures: Dict[str, int] = {}
+        self.lock = Lock()
+        self.containers_by_id: Dict[str, FakeContainer] = {}
+        self.streams: List[FakeEventStream] = []
+        self.containers = FakeContainers(self)
+        self.images = FakeImages()
+        self.list_calls = 0
+        self.get_calls = 0
+
+    @property
+    def run_latency(self) -> float:
+        return self.latencies.get("run", 0.0)
+
+    @run_latency.setter
+    def run_latency(self, seconds: float) -> None:
+        self.latencies["run"] = seconds
+
+    def _call(self, op: str) -> None:
+        """Apply the configured latency of an operation, then fail it at the configured rate."""
+        latency = self.latencies.get(op)
+        if latency:
+            time.sleep(latency)
+        rate = self.failure_rates.get(op)
+        if rate and self.random.random() < rate:
+            with self.lock:
+                self.injected_failures[op] = self.injected_failures.get(op, 0) + 1
+            raise docker.errors.APIError(f"Injected {op} failure")
+
+    def _run_to_completion(self, container_id: str) -> None:
+        try:
+            container = self._check_exists(container_id)
+        except docker.errors.NotFound:
+            return
+        if container.status == "running":
+            container.write(b"done\n")
+            self.finish(container_id, 0)
+
+    def events(self, decode: bool = False, filters: Optional[Dict[str, Any]] = None) -> FakeEventStream:
+        stream = FakeEventStream(filters)
+        with self.lock:
+            self.streams.append(stream)
+        return stream
+
+    def emit(self, container: FakeContainer, action: str, **attributes: Any) -> None:
+        event = {
+            "Type": "container",
+            "Action": action,
+            "Actor": {"ID": container.id, "Attributes": {"image": container.image, **container.labels, **attributes}},
+        }
+        with self.lock:
+            streams = [s for s in self.streams if not s.closed]
+        for stream in streams:
+            if stream.matches(event):
+                stream.events.put(event)
+
+    def finish(self, container_id: str, exit_code: int = 0) -> None:
+        """Make a running container exit, as the agent process ending would."""
+        container = self._check_exists(container_id)
+        container.status = "exited"
+        container.exit_code = exit_code
+        self.emit(container, "die", exitCode=str(exit_code))
+
+    def drop_event_streams(self) -> None:
+        """Simulate the daemon connection dropping."""
+        with self.lock:
+            streams, self.streams = self.streams, []
+        for stream in streams:
+            stream.close()
+
+    def _check_exists(self, container_id: str) -> FakeContainer:
+        with self.lock:
+            container = self.containers_by_id.get(container_id)
+        if container is None:
+            raise docker.errors.NotFound(f"No such container: {container_id}")
+        return container
+
+    def _remove(self, container_id: str) -> None:
+        with self.lock:
+            container = self.containers_by_id.pop(container_id, None)
+        if container is None:
+            raise docker.errors.NotFound(f"No such container: {container_id}")
+        if container.status == "running":
+            container.status = "exited"
+            container.exit_code = 137
+            self.emit(container, "die", exitCode="137")
+        self.emit(container, "destroy")
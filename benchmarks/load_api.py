@@ -0,0 +1,108 @@
+"""Load test: `/` and `/status` latency while `/schedule` and `/download` are saturated.
+
+Runs the FastAPI app in-process against a fake Docker daemon whose `containers.run` takes
+`--launch-latency` seconds, so no daemon or network is needed.
+
+Run with: python -m benchmarks.load_api
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+import docker
+import httpx
+from benchmarks.fake_docker import FakeDockerClient
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _probe(client: httpx.AsyncClient, job_id: str, duration: float) -> List[float]:
+    """Alternate `/` and `/status` requests for `duration` seconds, returning per-request latencies."""
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        for path in ("/", f"/status/{job_id}"):
+            start = time.perf_counter()
+            resp = await client.get(path)
+            resp.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+    return latencies
+
+
+async def _saturate(client: httpx.AsyncClient, job_ids: List[str], duration: float, concurrency: int) -> int:
+    """Keep `concurrency` /schedule and /download requests in flight for `duration` seconds."""
+    deadline = time.perf_counter() + duration
+    done = 0
+
+    async def worker(i: int) -> None:
+        nonlocal done
+        while time.perf_counter() < deadline:
+            if i % 2:
+                await client.post("/schedule", json={"prompt": "load"})
+            else:
+                await client.get(f"/download/{job_ids[i % len(job_ids)]}")
+            done += 1
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return done
+
+
+async def run(args: argparse.Namespace) -> None:
+    from src.orchestrator.api import orchestrator
+    from src.orchestrator.api.job_manager import job_manager
+
+    fake = job_manager.backend.docker_client
+    job_manager.scheduler.max_concurrent = args.concurrency * 4
+    job_manager.start()
+    status_job = job_manager.submit_job("probe")
+    download_jobs = [job_manager.submit_job(f"finished {i}") for i in range(args.concurrency)]
+    while any(job_manager.jobs[job_id]["status"] != "running" for job_id in download_jobs):
+        await asyncio.sleep(0.01)
+    for job_id in download_jobs:
+        output_path = job_manager.jobs[job_id]["output_path"]
+        with open(os.path.join(output_path, "payload.bin"), "wb") as f:
+            f.write(os.urandom(args.artifact_kb * 1024))
+        fake.finish(job_manager.jobs[job_id]["container_id"], 0)
+    while any(job_manager.jobs[job_id]["status"] != "complete" for job_id in download_jobs):
+        await asyncio.sleep(0.01)
+    fake.run_latency = args.launch_latency
+
+    transport = httpx.ASGITransport(app=orchestrator.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        idle = await _probe(client, status_job, args.duration)
+        loaded, completed = await asyncio.gather(
+            _probe(client, status_job, args.duration),
+            _saturate(client, download_jobs, args.duration, args.concurrency),
+        )
+
+    job_manager.stop()
+    print(f"saturating requests completed: {completed}")
+    print(f"{'':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for label, samples in (("idle", idle), ("loaded", loaded)):
+        print(
+            f"{label:>8} {statistics.median(samples) * 1000:>8.2f} "
+            f"{_percentile(samples, 95) * 1000:>8.2f} {max(samples) * 1000:>8.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--launch-latency", type=float, default=0.5)
+    parser.add_argument("--artifact-kb", type=int, default=2048)
+    args = parser.parse_args()
+    os.environ.setdefault("AGENT_OUTPUT_DIR", tempfile.mkdtemp(prefix="agent_jobs_bench_"))
+    docker.from_env = FakeDockerClient
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,105 @@
 #!/bin/bash
 set -e
 
-# Validate required environment variables
-if [ -z "$JOB_PROMPT" ]; then
-    echo "❌ Error: JOB_PROMPT is required. Pass it as an env var."
-    exit 1
-fi
-
 if [ -z "$GEMINI_API_KEY" ]; then
     echo "❌ Error: GEMINI_API_KEY is required. Pass it as an env var."
     exit 1
 fi
 
-JOB_ID=${JOB_ID:-$(date +%s)}
-
-echo "🚀 Starting agent for job $JOB_ID"
-echo "   Prompt: $JOB_PROMPT"
+WORKSPACE=/workspace
 
-mkdir -p /workspace
-chown -R agentuser:agentuser /workspace 2>/dev/null || true
+# Append a timing marker to $WORKSPACE/.agent_phases.jsonl, which the orchestrator folds into the
+# job's timeline: phase_mark <phase> <start|end|mark> [exit_code]. Never fails the job.
+phase_mark() {
+    printf '{"phase":"%s","event":"%s","at":%s%s}\n' "$1" "$2" "$(date +%s.%N)" "${3:+,\"exit_code\":$3}" \
+        >> "$WORKSPACE/.agent_phases.jsonl" 2>/dev/null || true
+}
 
 cleanup() {
     echo "📦 Creating project archive..."
-    cd /workspace
+    cd "$WORKSPACE" 2>/dev/null || return 0
     if [ "$(ls -A .)" ]; then
+        phase_mark archive start
         zip -r "agent_project_${JOB_ID}.zip" . -x "*.zip" 2>/dev/null || true
-        echo "✅ Project archived to /workspace/agent_project_${JOB_ID}.zip"
+        phase_mark archive end
+        echo "✅ Project archived to $WORKSPACE/agent_project_${JOB_ID}.zip"
     else
         echo "⚠️  No files found in workspace to archive"
     fi
-    exit 0
 }
-trap cleanup SIGTERM SIGINT
+# Archive, then exit with the conventional 128+signal status so a killed job never looks successful.
+trap 'cleanup; exit 143' SIGTERM
+trap 'cleanup; exit 130' SIGINT
+# Bash runs a trap only once the foreground command returns, so the agent runs in the background
+# and is waited for: a SIGTERM (cancel, or the orchestrator's timeout watchdog) then archives at once.
+
+# Echo stdin through unchanged, recording when the first line of agent output appears.
+mark_first_output() {
+    if IFS= read -r line; then
+        date +%s.%N > "$WORKSPACE/.agent_first_output"
+        phase_mark first_output mark
+        printf '%s\n' "$line"
+    fi
+    cat
+}
 
-# Run Gemini agent directly (no supervisor needed)
-gemini --model "gemini-2.5-flash" --prompt "$JOB_PROMPT" --all-files --approval-mode=yolo
+run_agent() {
+    echo "🚀 Starting agent for job $JOB_ID"
+    echo "   Prompt: $JOB_PROMPT"
+    mkdir -p "$WORKSPACE"
+    phase_mark setup start
+    chown -R agentuser:agentuser "$WORKSPACE" 2>/dev/null || true
+    cd "$WORKSPACE"
+    phase_mark setup end
+    set -o pipefail
+    # Run Gemini agent directly (no supervisor needed)
+    local agent_status=0
+    phase_mark agent start
+    gemini --model "gemini-2.5-flash" --prompt "$JOB_PROMPT" --all-files --approval-mode=yolo | mark_first_output \
+        || agent_status=$?
+    # test command gemini --prompt "build a react app which can handle 10 users sec" --all-files --approval-mode=yolo --model "gemini-2.5-flash"
+    phase_mark agent end "$agent_status"
+    return "$agent_status"
+}
+
+if [ "$AGENT_WARM_POOL" = "1" ]; then
+    # Warm pool mode: block until the orchestrator hands over a job by writing
+    # /pool/next/{job_id,prompt} followed by /pool/next/ready. This saves container creation and
+    # start only: gemini-cli runs one prompt per process, so it still starts for every job. Running
+    # it once here just pulls its files into the page cache.
+    gemini --version >/dev/null 2>&1 || true
+    uses=0
+    status=0
+    while [ "$uses" -lt "${AGENT_POOL_MAX_USES:-1}" ]; do
+        echo "⏳ Waiting for a job in /pool/next"
+        while [ ! -f /pool/next/ready ]; do
+            sleep 0.1
+        done
+        JOB_ID=$(cat /pool/next/job_id)
+        JOB_PROMPT=$(cat /pool/next/prompt)
+        rm -rf /pool/next
+        WORKSPACE="/pool/$JOB_ID"
+        status=0
+        run_agent &
+        wait $! || status=$?
+        # Write then rename so the orchestrator never reads a half-written exit code.
+        echo "$status" > "$WORKSPACE/.agent_exit_code.tmp"
+        mv "$WORKSPACE/.agent_exit_code.tmp" "$WORKSPACE/.agent_exit_code"
+        echo "Agent completed for job $JOB_ID (exit $status)"
+        uses=$((uses + 1))
+    done
+    exit "$status"
+fi
+
+# Validate required environment variables
+if [ -z "$JOB_PROMPT" ]; then
+    echo "❌ Error: JOB_PROMPT is required. Pass it as an env var."
+    exit 1
+fi
+
+JOB_ID=${JOB_ID:-$(date +%s)}
 
-# test command gemini --prompt "build a react app which can handle 10 users sec" --all-files --approval-mode=yolo --model "gemini-2.5-flash"
+run_agent &
+wait $!
 
-echo "Agent completed for job $JOB_ID"    
+echo "Agent completed for job $JOB_ID"
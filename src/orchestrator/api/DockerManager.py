@@ -5,9 +5,8 @@ import os
 IMAGE = os.getenv("AGENT_IMAGE", "containerized-agent:latest")
 
 class DockerManager():
-    def __init__(self): # connect to the docker deamon
-        self.client = docker.from_env()
-        pass
+    def __init__(self, client=None): # connect to the docker deamon unless a client is given
+        self.client = client if client is not None else docker.from_env()
     
     def run_container(self , prompt :str ):
 
@@ -0,0 +1,324 @@
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import requests
+from src.orchestrator.api.execution_backend import ExecutionBackend
+from src.orchestrator.api.metrics import KUBE_CALL_SECONDS
+from src.orchestrator.api.status_watcher import REMOVED, ContainerState, ContainerStatusWatcher, StateListener
+from src.orchestrator.config import config
+
+logging.basicConfig(level=logging.INFO)
+
+MANAGED_BY = "agent-orchestrator"
+POD_SELECTOR = f"app.kubernetes.io/managed-by={MANAGED_BY}"
+JOB_ID_LABEL = "agent-orchestrator/job-id"
+CONTAINER_NAME = "agent"
+WORKSPACE_VOLUME = "workspace"
+
+
+class KubeApi:
+    """The few Kubernetes REST calls the backend needs, over a plain requests session."""
+
+    def __init__(self, base_url: str, namespace: str, token: Optional[str] = None, verify: Any = True) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.namespace = namespace
+        self.session = requests.Session()
+        self.session.verify = verify
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    @classmethod
+    def from_config(cls) -> "KubeApi":
+        """Connect with K8S_API_URL, or in-cluster with the pod's service account."""
+        base_url = config.K8S_API_URL
+        if not base_url:
+            host, port = os.environ["KUBERNETES_SERVICE_HOST"], os.getenv("KUBERNETES_SERVICE_PORT", "443")
+            base_url = f"https://{host}:{port}"
+        token = None
+        if os.path.exists(config.K8S_TOKEN_FILE):
+            with open(config.K8S_TOKEN_FILE, "r", encoding="utf-8") as f:
+                token = f.read().strip()
+        verify = config.K8S_CA_FILE if os.path.exists(config.K8S_CA_FILE) else True
+        return cls(base_url, config.K8S_NAMESPACE, token, verify)
+
+    def create_job(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        with KUBE_CALL_SECONDS.time(op="create_job"):
+            response = self.session.post(self._jobs_url(), json=manifest, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    def delete_job(self, name: str, grace_seconds: Optional[int] = None) -> bool:
+        """Delete a Job and its pods, giving them `grace_seconds` between SIGTERM and SIGKILL if set.
+        Returns False if it did not exist.
+        """
+        body: Dict[str, Any] = {"propagationPolicy": "Background"}
+        if grace_seconds is not None:
+            body["gracePeriodSeconds"] = grace_seconds
+        with KUBE_CALL_SECONDS.time(op="delete_job"):
+            response = self.session.delete(f"{self._jobs_url()}/{name}", json=body, timeout=30)
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    def list_pods(self, selector: str) -> Tuple[List[Dict[str, Any]], str]:
+        """(pods, list resourceVersion) for a label selector."""
+        with KUBE_CALL_SECONDS.time(op="list_pods"):
+            response = self.session.get(self._pods_url(), params={"labelSelector": selector}, timeout=30)
+        response.raise_for_status()
+        body = response.json()
+        return body.get("items") or [], body.get("metadata", {}).get("resourceVersion", "")
+
+    def watch_pods(self, selector: str, resource_version: str, timeout_seconds: int) -> requests.Response:
+        """Open a pod watch; the response yields one JSON event per line until the server ends it."""
+        params = {
+            "labelSelector": selector,
+            "watch": "true",
+            "resourceVersion": resource_version,
+            "allowWatchBookmarks": "true",
+            "timeoutSeconds": str(timeout_seconds),
+        }
+        response = self.session.get(self._pods_url(), params=params, stream=True, timeout=(10, timeout_seconds + 30))
+        response.raise_for_status()
+        return response
+
+    def pod_logs(self, pod_name: str) -> requests.Response:
+        """Follow a pod's container log from the beginning; raises HTTPError while it cannot be read yet."""
+        response = self.session.get(
+            f"{self._pods_url()}/{pod_name}/log",
+            params={"container": CONTAINER_NAME, "follow": "true"},
+            stream=True,
+            timeout=(10, None),
+        )
+        response.raise_for_status()
+        return response
+
+    def _jobs_url(self) -> str:
+        return f"{self.base_url}/apis/batch/v1/namespaces/{self.namespace}/jobs"
+
+    def _pods_url(self) -> str:
+        return f"{self.base_url}/api/v1/namespaces/{self.namespace}/pods"
+
+
+def pod_state(pod: Dict[str, Any]) -> ContainerState:
+    """Map a pod onto a Docker-style (status, exit code): pending and running pods are "running"."""
+    phase = (pod.get("status") or {}).get("phase")
+    if phase not in ("Succeeded", "Failed"):
+        return "running", None
+    for status in (pod.get("status") or {}).get("containerStatuses") or []:
+        terminated = (status.get("state") or {}).get("terminated")
+        if status.get("name") == CONTAINER_NAME and terminated:
+            return "exited", terminated.get("exitCode")
+    return "exited", 0 if phase == "Succeeded" else None
+
+
+def _job_name(pod: Dict[str, Any]) -> Optional[str]:
+    return (pod.get("metadata", {}).get("labels") or {}).get("job-name")
+
+
+class PodStatusWatcher(ContainerStatusWatcher):
+    """ContainerStatusWatcher fed by a Kubernetes pod watch instead of the Docker events stream.
+
+    Follows the usual list-then-watch pattern: one pod listing seeds the cache and gives a
+    resourceVersion, and the watch continues from the last version seen. Only an expired version
+    (410 Gone) or a broken stream costs another listing. States are keyed by Job name.
+    """
+
+    def __init__(
+        self, api: KubeApi, on_change: StateListener, resync_interval: float, watch_timeout: int = 300
+    ) -> None:
+        super().__init__(None, "", on_change, resync_interval)
+        self.api = api
+        self.watch_timeout = watch_timeout
+        self.resource_version: Optional[str] = None
+
+    def resync(self) -> None:
+        pods, resource_version = self.api.list_pods(POD_SELECTOR)
+        seen: Dict[str, ContainerState] = {}
+        for pod in pods:
+            name = _job_name(pod)
+            if name:
+                seen[name] = pod_state(pod)
+        with self.lock:
+            missing = [name for name, state in self.states.items() if name not in seen and state[0] != REMOVED]
+        for name, (status, exit_code) in seen.items():
+            self._set(name, status, exit_code)
+        for name in missing:
+            self._set(name, REMOVED, None)
+        self.resource_version = resource_version
+        self._synced.set()
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """Apply one pod watch event to the cache."""
+        pod = event.get("object") or {}
+        version = pod.get("metadata", {}).get("resourceVersion")
+        if version:
+            self.resource_version = version
+        name = _job_name(pod)
+        if event.get("type") in ("ADDED", "MODIFIED") and name:
+            self._set(name, *pod_state(pod))
+        elif event.get("type") == "DELETED" and name:
+            with self.lock:
+                known = name in self.states
+            if known:
+                self._set(name, REMOVED, None)
+
+    def _event_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.resource_version is None:
+                    self._synced.clear()
+                    self.resync()
+                self._stream = self.api.watch_pods(POD_SELECTOR, self.resource_version, self.watch_timeout)
+                self._connected.set()
+                for line in self._stream.iter_lines():
+                    if self._stop.is_set():
+                        break
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    if event.get("type") == "ERROR":
+                        # Usually 410 Gone: the version is too old to resume from; list again.
+                        logging.info(f"Pod watch ended: {event.get('object', {}).get('message')}")
+                        self.resource_version = None
+                        break
+                    self.handle_event(event)
+                continue  # the server closed the watch at timeoutSeconds; resume from the last version
+            except Exception as e:
+                if not self._stop.is_set():
+                    logging.warning(f"Kubernetes pod watch failed: {e}")
+                self.resource_version = None
+            self._connected.clear()
+            self._stop.wait(self.reconnect_delay)
+
+
+class PodLogs:
+    """LogPump source for a Job's pod. Kubernetes merges stdout and stderr, so all output lands in stdout.log."""
+
+    def __init__(self, api: KubeApi, job_name: str, start_timeout: float, retry_delay: float = 0.5) -> None:
+        self.api = api
+        self.id = job_name
+        self.start_timeout = start_timeout
+        self.retry_delay = retry_delay
+
+    def attach(self, **kwargs: Any) -> Iterator[Tuple[Optional[bytes], Optional[bytes]]]:
+        response = self._open()
+        try:
+            for chunk in response.iter_content(chunk_size=None):
+                if chunk:
+                    yield chunk, None
+        finally:
+            response.close()
+
+    def _open(self) -> requests.Response:
+        """Wait for the Job's pod to be scheduled and its container started, then follow its log."""
+        deadline = time.time() + self.start_timeout
+        while True:
+            pods, _ = self.api.list_pods(f"job-name={self.id}")
+            try:
+                if pods:
+                    return self.api.pod_logs(pods[0]["metadata"]["name"])
+            except requests.HTTPError:
+                if time.time() >= deadline:
+                    raise
+            if time.time() >= deadline:
+                raise RuntimeError(f"No pod started for job {self.id}")
+            time.sleep(self.retry_delay)
+
+
+class KubernetesBackend(ExecutionBackend):
+    """Runs each job as a Kubernetes Job, so jobs spread across the cluster's nodes.
+
+    The workspace is a subPath (the job ID) of the `workspace_claim` PersistentVolumeClaim, which the
+    orchestrator mounts at AGENT_OUTPUT_DIR, so logs and artifacts land where they do with Docker.
+    Cluster capacity is the Kubernetes scheduler's concern, so host health sampling and the warm
+    pool do not apply. `image_id` is the configured image reference, so pin AGENT_IMAGE by digest
+    for exact result-cache keys.
+    """
+
+    name = "kubernetes"
+    local = False
+
+    def __init__(
+        self, api: KubeApi, image: str, workspace_claim: str, watch_timeout: int = 300, log_start_timeout: float = 600
+    ) -> None:
+        self.api = api
+        self.image = image
+        self.workspace_claim = workspace_claim
+        self.watch_timeout = watch_timeout
+        self.log_start_timeout = log_start_timeout
+
+    @classmethod
+    def from_config(cls, image: str) -> "KubernetesBackend":
+        return cls(KubeApi.from_config(), image, config.K8S_WORKSPACE_CLAIM, config.K8S_WATCH_TIMEOUT)
+
+    def job_manifest(self, job_id: str, prompt: str, size: str) -> Dict[str, Any]:
+        """batch/v1 Job for one agent run: no retries, limits from the job's size class."""
+        size_class = config.SIZE_CLASSES[size]
+        memory = str(size_class["mem_limit"]).upper().rstrip("B")
+        resources = {"cpu": str(size_class["cpus"]), "memory": f"{memory}i" if memory[-1:].isalpha() else memory}
+        labels = {"app.kubernetes.io/managed-by": MANAGED_BY, JOB_ID_LABEL: job_id}
+        return {
+            "apiVersion": "batch/v1",
+            "kind": "Job",
+            "metadata": {"name": f"agent-job-{job_id}", "labels": labels},
+            "spec": {
+                "backoffLimit": 0,
+                "template": {
+                    "metadata": {"labels": labels},
+                    "spec": {
+                        "restartPolicy": "Never",
+                        "containers": [{
+                            "name": CONTAINER_NAME,
+                            "image": self.image,
+                            "env": [{"name": "JOB_PROMPT", "value": prompt}, {"name": "JOB_ID", "value": job_id}],
+                            "resources": {"limits": resources, "requests": resources},
+                            "volumeMounts": [{"name": WORKSPACE_VOLUME, "mountPath": "/workspace", "subPath": job_id}],
+                        }],
+                        "volumes": [{
+                            "name": WORKSPACE_VOLUME,
+                            "persistentVolumeClaim": {"claimName": self.workspace_claim},
+                        }],
+                    },
+                },
+            },
+        }
+
+    def launch(self, job_id: str, prompt: str, output_path: str, size: str) -> str:
+        os.makedirs(output_path, exist_ok=True)
+        return self.api.create_job(self.job_manifest(job_id, prompt, size))["metadata"]["name"]
+
+    def watcher(self, on_change: StateListener, resync_interval: float) -> ContainerStatusWatcher:
+        return PodStatusWatcher(self.api, on_change, resync_interval, self.watch_timeout)
+
+    def inspect(self, handle: str) -> ContainerState:
+        pods, _ = self.api.list_pods(f"job-name={handle}")
+        return pod_state(pods[0]) if pods else (REMOVED, None)
+
+    def list_workloads(self) -> Dict[str, Tuple[str, ContainerState]]:
+        pods, _ = self.api.list_pods(POD_SELECTOR)
+        workloads = {}
+        for pod in pods:
+            job_id, name = (pod.get("metadata", {}).get("labels") or {}).get(JOB_ID_LABEL), _job_name(pod)
+            if job_id and name:
+                workloads[job_id] = (name, pod_state(pod))
+        return workloads
+
+    def log_source(self, handle: str) -> Any:
+        return PodLogs(self.api, handle, self.log_start_timeout)
+
+    def cancel(self, handle: str) -> None:
+        if not self.api.delete_job(handle):
+            raise RuntimeError(f"Kubernetes job {handle} not found")
+
+    def remove(self, handle: str) -> bool:
+        return self.api.delete_job(handle)
+
+    def terminate(self, handle: str, grace: float) -> None:
+        # The kubelet sends SIGTERM, and escalates to SIGKILL itself once the grace period ends.
+        self.api.delete_job(handle, grace_seconds=int(grace))
+
+    def kill(self, handle: str) -> None:
+        self.api.delete_job(handle, grace_seconds=0)
@@ -0,0 +1,168 @@
+import logging
+import os
+import tempfile
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from src.orchestrator.api.metrics import ARCHIVE_BUILD_SECONDS
+
+logging.basicConfig(level=logging.INFO)
+
+COMPRESSION_MODES = {"deflate": zipfile.ZIP_DEFLATED, "store": zipfile.ZIP_STORED}
+CHUNK_SIZE = 1024 * 1024
+TEMP_SUFFIX = ".zip.tmp"
+
+
+def iter_files(root: str, job_id: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+    """Yield (path, archive name) for every file under `root`.
+
+    Only the archive the agent's entrypoint writes for this job (`agent_project_<job_id>.zip` at the
+    top level) and half-written packager temp files are skipped; zips the agent produced as part of
+    the project are kept.
+    """
+    own_archive = f"agent_project_{job_id}.zip" if job_id else None
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.endswith(TEMP_SUFFIX) or (dirpath == root and name == own_archive):
+                continue
+            path = os.path.join(dirpath, name)
+            if os.path.isfile(path):
+                yield path, os.path.relpath(path, root)
+
+
+def write_zip(
+    root: str, fileobj, compression: str, compresslevel: Optional[int], job_id: Optional[str] = None
+) -> None:
+    """Write every file under `root` into a zip on `fileobj` (seekable or not)."""
+    with zipfile.ZipFile(fileobj, "w", COMPRESSION_MODES[compression], compresslevel=compresslevel) as zf:
+        for path, arcname in iter_files(root, job_id):
+            zf.write(path, arcname)
+
+
+class _ChunkSink:
+    """Write-only file object that buffers what zipfile writes so a generator can hand it out."""
+
+    def __init__(self) -> None:
+        self.chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_zip(
+    root: str, compression: str = "deflate", compresslevel: Optional[int] = None, job_id: Optional[str] = None
+) -> Iterator[bytes]:
+    """Build a zip of `root` on the fly, yielding bytes as they are produced, with no temp file.
+
+    zipfile falls back to data descriptors when its output is not seekable, so entries can be
+    emitted before their sizes are known.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", COMPRESSION_MODES[compression], compresslevel=compresslevel) as zf:
+        for path, arcname in iter_files(root, job_id):
+            info = zipfile.ZipInfo.from_file(path, arcname)
+            info.compress_type = COMPRESSION_MODES[compression]
+            with open(path, "rb") as src, zf.open(info, "w") as dest:
+                while True:
+                    chunk = src.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    dest.write(chunk)
+                    if sink.chunks:
+                        yield sink.drain()
+            if sink.chunks:
+                yield sink.drain()
+    tail = sink.drain()
+    if tail:
+        yield tail
+
+
+def etag_for(path: str) -> str:
+    """Strong ETag for an immutable artifact file, derived from its size and mtime."""
+    st = os.stat(path)
+    return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+class ArtifactPackager:
+    """Packages a finished job's workspace once, in the background, into `<artifacts_dir>/<job_id>.zip`.
+
+    The archive is written next to (not inside) the workspace it archives. If the agent's own
+    entrypoint already produced `agent_project_<job_id>.zip`, that file is used as-is instead of
+    being rebuilt.
+    """
+
+    def __init__(self, artifacts_dir: str, compression: str, compresslevel: Optional[int], workers: int) -> None:
+        if compression not in COMPRESSION_MODES:
+            raise ValueError(f"Unknown artifact compression: {compression}")
+        self.artifacts_dir = artifacts_dir
+        self.compression = compression
+        self.compresslevel = compresslevel
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifact")
+        self.lock = Lock()
+        self.in_flight: Dict[str, Future] = {}
+        os.makedirs(artifacts_dir, exist_ok=True)
+
+    def artifact_path(self, job_id: str) -> str:
+        return os.path.join(self.artifacts_dir, f"{job_id}.zip")
+
+    def submit(self, job_id: str, output_path: str, on_done: Optional[Callable[[str, str], None]] = None) -> Future:
+        """Queue packaging for a job; concurrent requests for the same job share one build."""
+        with self.lock:
+            future = self.in_flight.get(job_id)
+            if future is not None:
+                return future
+            future = self.executor.submit(self.build, job_id, output_path)
+            self.in_flight[job_id] = future
+        # Outside the lock: the callback runs inline if the build has already finished.
+        future.add_done_callback(lambda f: self._finished(job_id, f, on_done))
+        return future
+
+    def build(self, job_id: str, output_path: str) -> str:
+        """Package a workspace synchronously and return the artifact path."""
+        agent_zip = os.path.join(output_path, f"agent_project_{job_id}.zip")
+        if os.path.exists(agent_zip):
+            return agent_zip
+        target = self.artifact_path(job_id)
+        if os.path.exists(target):
+            return target
+        fd, tmp_path = tempfile.mkstemp(dir=self.artifacts_dir, prefix=f"{job_id}_", suffix=TEMP_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as f, ARCHIVE_BUILD_SECONDS.time():
+                write_zip(output_path, f, self.compression, self.compresslevel, job_id)
+            os.replace(tmp_path, target)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        logging.info(f"Packaged artifact for job {job_id} ({os.path.getsize(target)} bytes)")
+        return target
+
+    def remove(self, job_id: str) -> None:
+        path = self.artifact_path(job_id)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _finished(self, job_id: str, future: Future, on_done: Optional[Callable[[str, str], None]]) -> None:
+        with self.lock:
+            self.in_flight.pop(job_id, None)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logging.error(f"Failed to package artifact for job {job_id}: {error}")
+        elif on_done:
+            on_done(job_id, future.result())
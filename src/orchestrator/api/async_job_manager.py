@@ -0,0 +1,140 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from src.orchestrator.api.job_manager import TERMINAL_STATUSES, JobManager, job_manager
+from src.orchestrator.api.metrics import REGISTRY
+from src.orchestrator.config import config
+
+
+class AsyncJobManager:
+    """Awaitable facade over JobManager for the API layer.
+
+    Every JobManager call that can touch the Docker daemon or the filesystem runs on a bounded
+    thread pool instead of the event loop. Calls are split into lanes with their own pools, so a
+    burst of slow launches or archive builds cannot starve cheap status lookups.
+    """
+
+    LANES = ("launch", "artifacts", "status")
+
+    def __init__(self, manager: JobManager, workers: Optional[Dict[str, int]] = None) -> None:
+        self.manager = manager
+        workers = workers or {
+            "launch": config.LAUNCH_WORKERS,
+            "artifacts": config.ARTIFACT_WORKERS,
+            "status": config.STATUS_WORKERS,
+        }
+        self.executors = {
+            lane: ThreadPoolExecutor(max_workers=workers[lane], thread_name_prefix=f"jobmgr-{lane}")
+            for lane in self.LANES
+        }
+
+    async def _run(self, lane: str, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executors[lane], functools.partial(fn, *args))
+
+    async def submit_job(
+        self,
+        prompt: str,
+        priority: int = 0,
+        size: Optional[str] = None,
+        no_cache: bool = False,
+        callback_url: Optional[str] = None,
+        timeout: Optional[int] = None,
+        idle_timeout: Optional[int] = None,
+        template: Optional[str] = None,
+    ) -> str:
+        return await self._run(
+            "launch", self.manager.submit_job,
+            prompt, priority, size, no_cache, callback_url, timeout, idle_timeout, template,
+        )
+
+    async def submit_jobs(self, items: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await self._run("launch", self.manager.submit_jobs, items)
+
+    async def cancel_job(self, job_id: str) -> bool:
+        return await self._run("launch", self.manager.cancel_job, job_id)
+
+    async def get_status(self, job_id: str) -> str:
+        return await self._run("status", self.manager.get_status, job_id)
+
+    async def wait_for_status(self, job_id: str, known: Optional[str], timeout: float) -> str:
+        """A job's status once it differs from `known` (default: its status now), or after `timeout` seconds.
+
+        Waits on the transition feed rather than polling, so no thread is held while waiting. A job
+        already in a terminal state, or unknown, is answered at once.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        # Subscribe before reading the status so a transition in between is not missed.
+        events = self.manager.transitions.subscribe(job_id)
+        try:
+            status = await self.get_status(job_id)
+            known = status if known is None else known
+            while status == known and status not in TERMINAL_STATUSES:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    status = (await asyncio.wait_for(events.get(), remaining))["status"]
+                except asyncio.TimeoutError:
+                    break
+            return status
+        finally:
+            self.manager.transitions.unsubscribe(events)
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._run("status", self.manager.get_job, job_id)
+
+    async def list_jobs(
+        self,
+        statuses: Optional[Sequence[str]] = None,
+        created_from: Optional[float] = None,
+        created_to: Optional[float] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        return await self._run(
+            "status", self.manager.list_jobs, statuses, created_from, created_to, cursor, limit, fields
+        )
+
+    async def get_output(self, job_id: str, build: bool = True) -> Optional[str]:
+        lane = "artifacts" if build else "status"
+        return await self._run(lane, self.manager.get_output, job_id, build)
+
+    async def get_output_dir(self, job_id: str) -> Optional[str]:
+        return await self._run("status", self.manager.get_output_dir, job_id)
+
+    async def get_logs(self, job_id: str, log_type: str = "stdout", lines: int = config.LOG_TAIL_LINES) -> Optional[str]:
+        return await self._run("status", self.manager.get_logs, job_id, log_type, lines)
+
+    async def read_log(self, job_id: str, log_type: str, offset: int) -> Optional[Tuple[bytes, int, bool]]:
+        return await self._run("status", self.manager.read_log, job_id, log_type, offset)
+
+    async def get_full_log(self, job_id: str, log_type: str = "stdout") -> Optional[str]:
+        return await self._run("artifacts", self.manager.get_full_log, job_id, log_type)
+
+    async def get_log_file(self, job_id: str, log_type: str = "stdout") -> Optional[str]:
+        return await self._run("status", self.manager.get_log_file, job_id, log_type)
+
+    async def get_timeline(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._run("status", self.manager.get_timeline, job_id)
+
+    async def phase_report(self) -> Dict[str, Any]:
+        return await self._run("status", self.manager.phase_report)
+
+    async def health_report(self) -> Dict[str, Any]:
+        return await self._run("status", self.manager.health_report)
+
+    async def render_metrics(self) -> str:
+        # Scrape-time gauges query the job store, so render off the event loop.
+        return await self._run("status", REGISTRY.render)
+
+    def shutdown(self) -> None:
+        """Stop accepting work and wait for in-flight calls."""
+        for executor in self.executors.values():
+            executor.shutdown(wait=True)
+
+
+async_job_manager = AsyncJobManager(job_manager)
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+logging.basicConfig(level=logging.INFO)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: str) -> str:
+    """sha256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _walk(root: str, exclude: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """Yield (path, relative path) for regular files under `root`, skipping top-level `exclude` entries."""
+    skip = set(exclude)
+    for dirpath, dirnames, filenames in os.walk(root):
+        if dirpath == root:
+            dirnames[:] = [d for d in dirnames if d not in skip]
+        for name in filenames:
+            if dirpath == root and name in skip:
+                continue
+            path = os.path.join(dirpath, name)
+            if os.path.isfile(path) and not os.path.islink(path):
+                yield path, os.path.relpath(path, root)
+
+
+class BlobStore:
+    """Content-addressed store that keeps each distinct file of finished job workspaces once.
+
+    `ingest` hashes a workspace, writes a per-job manifest (`manifests/<job_id>.json`, relative path
+    -> sha256/size/mode) and rebuilds the workspace from that manifest as hardlinks into
+    `objects/<aa>/<sha256>`. Blobs are reference-counted by the manifests that name them and deleted
+    when the last one is released. Workspaces must be on the same filesystem and are treated as
+    read-only once ingested: writing to a linked file would change every job sharing it.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.manifests_dir = os.path.join(root, "manifests")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        self.lock = Lock()
+        self.refs: Dict[str, int] = {}
+        self.sizes: Dict[str, int] = {}
+        self.logical_bytes = 0
+        self.jobs = 0
+        for name in os.listdir(self.manifests_dir):
+            if name.endswith(".json"):
+                self._count(self._read_manifest(os.path.join(self.manifests_dir, name)), 1)
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def manifest_path(self, job_id: str) -> str:
+        return os.path.join(self.manifests_dir, f"{job_id}.json")
+
+    def has_manifest(self, job_id: str) -> bool:
+        return os.path.exists(self.manifest_path(job_id))
+
+    def ingest(self, job_id: str, workspace: str, exclude: Iterable[str] = ()) -> Dict[str, Any]:
+        """Store a finished workspace's files and replace them with hardlinks to the stored blobs."""
+        if self.has_manifest(job_id):
+            return self._read_manifest(self.manifest_path(job_id))
+        files = {}
+        for path, rel in _walk(workspace, exclude):
+            st = os.stat(path)
+            files[rel] = {"sha256": file_digest(path), "size": st.st_size, "mode": st.st_mode & 0o777}
+        manifest = {"job_id": job_id, "files": files}
+        with self.lock:
+            for rel, entry in files.items():
+                blob = self.blob_path(entry["sha256"])
+                if not os.path.exists(blob):
+                    os.makedirs(os.path.dirname(blob), exist_ok=True)
+                    os.link(os.path.join(workspace, rel), blob)
+            self._write_manifest(job_id, manifest)
+            self._count(manifest, 1)
+        self.restore(job_id, workspace)
+        logging.info(f"Deduplicated workspace of job {job_id} ({len(files)} files)")
+        return manifest
+
+    def restore(self, job_id: str, dest: str) -> int:
+        """Rebuild a workspace from its manifest as hardlinks; returns the number of files relinked.
+
+        Files already linked to their blob are left alone. A copy is made when `dest` is on another
+        filesystem.
+        """
+        manifest = self._read_manifest(self.manifest_path(job_id))
+        relinked = 0
+        for rel, entry in manifest["files"].items():
+            blob = self.blob_path(entry["sha256"])
+            target = os.path.join(dest, rel)
+            if os.path.exists(target) and os.path.samefile(blob, target):
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".blob_")
+            os.close(fd)
+            os.remove(tmp)
+            try:
+                os.link(blob, tmp)
+            except OSError:
+                shutil.copy2(blob, tmp)
+                os.chmod(tmp, entry["mode"])
+            os.replace(tmp, target)
+            relinked += 1
+        return relinked
+
+    def release(self, job_id: str) -> int:
+        """Drop a job's manifest and delete blobs no other manifest references; returns bytes freed."""
+        path = self.manifest_path(job_id)
+        if not os.path.exists(path):
+            return 0
+        manifest = self._read_manifest(path)
+        freed = 0
+        with self.lock:
+            os.remove(path)
+            for digest in self._count(manifest, -1):
+                blob = self.blob_path(digest)
+                if os.path.exists(blob):
+                    freed += os.path.getsize(blob)
+                    os.remove(blob)
+        return freed
+
+    def report(self) -> Dict[str, Any]:
+        """Dedup ratio and bytes saved: logical bytes across all manifests vs. bytes actually stored."""
+        with self.lock:
+            stored = sum(self.sizes.values())
+            logical = self.logical_bytes
+            return {
+                "jobs": self.jobs,
+                "blobs": len(self.refs),
+                "logical_bytes": logical,
+                "stored_bytes": stored,
+                "bytes_saved": logical - stored,
+                "dedup_ratio": round(logical / stored, 3) if stored else None,
+            }
+
+    def _count(self, manifest: Dict[str, Any], delta: int) -> List[str]:
+        """Apply a manifest to the refcounts and totals; returns the digests that dropped to zero.
+
+        Caller must hold self.lock (or be the constructor).
+        """
+        unreferenced = []
+        self.jobs += delta
+        for entry in manifest["files"].values():
+            digest = entry["sha256"]
+            self.logical_bytes += delta * entry["size"]
+            self.refs[digest] = self.refs.get(digest, 0) + delta
+            self.sizes[digest] = entry["size"]
+            if self.refs[digest] <= 0:
+                del self.refs[digest]
+                del self.sizes[digest]
+                unreferenced.append(digest)
+        return unreferenced
+
+    def _read_manifest(self, path: str) -> Dict[str, Any]:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, job_id: str, manifest: Dict[str, Any]) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.manifests_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self.manifest_path(job_id))
@@ -0,0 +1,214 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+import docker
+from src.orchestrator.api.metrics import DOCKER_CALL_SECONDS
+from src.orchestrator.api.status_watcher import (
+    REMOVED, ContainerState, ContainerStatusWatcher, StateListener, parse_exit_code,
+)
+from src.orchestrator.config import config
+
+logging.basicConfig(level=logging.INFO)
+
+JOB_ID_LABEL = "agent-orchestrator.job-id"  # set on every agent container; empty on unclaimed warm-pool ones
+
+
+class ExecutionBackend(ABC):
+    """Where agent jobs run.
+
+    JobManager owns the job records, the admission queue, log files and artifacts; a backend starts,
+    watches and removes the workloads. `launch` returns an opaque handle (a container ID for Docker, a
+    Job name for Kubernetes) that JobManager stores as the job's `container_id`. Status flows back
+    through the watcher as Docker-style states: "running", "exited" with an exit code, or REMOVED.
+    """
+
+    name = ""
+    image = ""
+    local = False  # workloads run on this host, so host health sampling and the warm pool apply
+    supports_templates = False  # implements build_template; templated jobs are rejected otherwise
+
+    @abstractmethod
+    def launch(self, job_id: str, prompt: str, output_path: str, size: str) -> str:
+        """Start a job's workload with `output_path` as its workspace and return its handle."""
+
+    def image_id(self) -> str:
+        """Identity of the agent image jobs run with; the configured image reference unless resolvable."""
+        return self.image
+
+    @abstractmethod
+    def watcher(self, on_change: StateListener, resync_interval: float) -> ContainerStatusWatcher:
+        """Status watcher that reports state changes of this backend's workloads to `on_change`."""
+
+    @abstractmethod
+    def inspect(self, handle: str) -> ContainerState:
+        """Current (status, exit code) of a workload, asked directly; REMOVED if it no longer exists."""
+
+    @abstractmethod
+    def list_workloads(self) -> Dict[str, Tuple[str, ContainerState]]:
+        """job ID -> (handle, state) for every workload labelled with a job ID, from one listing."""
+
+    @abstractmethod
+    def log_source(self, handle: str) -> Any:
+        """Object a LogPump can follow (`attach(..., demux=True)` yielding (stdout, stderr) chunks)."""
+
+    def stats_source(self, handle: str) -> Optional[Any]:
+        """Object with a docker-style `stats(stream=True, decode=True)`, or None if usage is not observable."""
+        return None
+
+    @abstractmethod
+    def cancel(self, handle: str) -> None:
+        """Stop and delete a running workload; raises if that fails."""
+
+    @abstractmethod
+    def remove(self, handle: str) -> bool:
+        """Delete a finished workload. Returns False if it was already gone."""
+
+    @abstractmethod
+    def terminate(self, handle: str, grace: float) -> None:
+        """Ask a workload to stop (SIGTERM) so it can clean up; `kill` follows after `grace` seconds."""
+
+    @abstractmethod
+    def kill(self, handle: str) -> None:
+        """Force a workload that ignored `terminate` to stop (SIGKILL)."""
+
+    def build_template(self, command: str, directory: str) -> None:
+        """Run a workspace template's build `command` in the agent image with `directory` as its workspace.
+
+        Blocks until the build finishes and raises if it fails. Only called on backends that set
+        `supports_templates`, i.e. whose workloads share a filesystem with the orchestrator.
+        """
+        raise NotImplementedError(f"The {self.name} backend cannot build workspace templates")
+
+    def collect_artifacts(self, handle: str, output_path: str) -> None:
+        """Make a finished job's workspace available under `output_path` before it is packaged.
+
+        The built-in backends mount the workspace there directly, so there is nothing to copy.
+        """
+
+
+class DockerBackend(ExecutionBackend):
+    """Runs each job as a container on the local Docker daemon, with the workspace bind-mounted."""
+
+    name = "docker"
+    local = True
+    supports_templates = True
+
+    def __init__(self, docker_client: Any, image: str) -> None:
+        self.docker_client = docker_client
+        self.image = image
+
+    def container_kwargs(self, size: str = config.DEFAULT_SIZE_CLASS) -> Dict[str, Any]:
+        """docker `containers.run` options shared by cold-started and pooled agent containers."""
+        size_class = config.SIZE_CLASSES[size]
+        return {
+            "mem_limit": size_class["mem_limit"],
+            "cpu_period": config.CONTAINER_CPU_PERIOD,
+            "cpu_quota": int(size_class["cpus"] * config.CONTAINER_CPU_PERIOD),
+            "stdout": True,
+            "stderr": True,
+            "log_config": docker.types.LogConfig(type=docker.types.LogConfig.types.JSON),
+        }
+
+    def launch(self, job_id: str, prompt: str, output_path: str, size: str) -> str:
+        with DOCKER_CALL_SECONDS.time(op="run"):
+            return self.docker_client.containers.run(
+                self.image,
+                detach=True,
+                environment={"JOB_PROMPT": prompt, "JOB_ID": job_id},
+                volumes={output_path: {"bind": "/workspace", "mode": "rw"}},
+                name=f"agent_job_{job_id[:8]}",
+                labels={JOB_ID_LABEL: job_id},
+                **self.container_kwargs(size),
+            ).id
+
+    def image_id(self) -> str:
+        """Content-addressed ID of the local image the tag currently points at."""
+        with DOCKER_CALL_SECONDS.time(op="image"):
+            return self.docker_client.images.get(self.image).id
+
+    def watcher(self, on_change: StateListener, resync_interval: float) -> ContainerStatusWatcher:
+        return ContainerStatusWatcher(self.docker_client, JOB_ID_LABEL, on_change, resync_interval)
+
+    def inspect(self, handle: str) -> ContainerState:
+        try:
+            container = self._get(handle)
+            with DOCKER_CALL_SECONDS.time(op="reload"):
+                container.reload()
+        except docker.errors.NotFound:
+            return REMOVED, None
+        exit_code = container.attrs.get("State", {}).get("ExitCode") if container.status == "exited" else None
+        return container.status, exit_code
+
+    def list_workloads(self) -> Dict[str, Tuple[str, ContainerState]]:
+        with DOCKER_CALL_SECONDS.time(op="list"):
+            containers = self.docker_client.containers.list(all=True, sparse=True, filters={"label": JOB_ID_LABEL})
+        workloads = {}
+        for container in containers:
+            attrs = container.attrs
+            job_id = (attrs.get("Labels") or {}).get(JOB_ID_LABEL)
+            if job_id:
+                state = attrs.get("State") or "unknown", parse_exit_code(attrs.get("Status", ""))
+                workloads[job_id] = (container.id, state)
+        return workloads
+
+    def log_source(self, handle: str) -> Any:
+        return self._get(handle)
+
+    def stats_source(self, handle: str) -> Optional[Any]:
+        return self._get(handle)
+
+    def cancel(self, handle: str) -> None:
+        container = self._get(handle)
+        with DOCKER_CALL_SECONDS.time(op="remove"):
+            container.remove(force=True)
+
+    def remove(self, handle: str) -> bool:
+        try:
+            self.cancel(handle)
+        except docker.errors.NotFound:
+            return False
+        return True
+
+    def terminate(self, handle: str, grace: float) -> None:
+        container = self._get(handle)
+        with DOCKER_CALL_SECONDS.time(op="kill"):
+            container.kill(signal="SIGTERM")
+
+    def kill(self, handle: str) -> None:
+        container = self._get(handle)
+        with DOCKER_CALL_SECONDS.time(op="kill"):
+            container.kill(signal="SIGKILL")
+
+    def build_template(self, command: str, directory: str) -> None:
+        with DOCKER_CALL_SECONDS.time(op="run"):
+            container = self.docker_client.containers.run(
+                self.image,
+                detach=True,
+                entrypoint=["bash", "-lc"],
+                command=[command],
+                working_dir="/workspace",
+                volumes={directory: {"bind": "/workspace", "mode": "rw"}},
+                **self.container_kwargs(),
+            )
+        try:
+            result = container.wait(timeout=config.TEMPLATE_BUILD_TIMEOUT)
+            if result.get("StatusCode") != 0:
+                tail = container.logs(tail=20).decode("utf-8", errors="replace")
+                raise RuntimeError(f"Template build exited with {result.get('StatusCode')}: {tail}")
+        finally:
+            with DOCKER_CALL_SECONDS.time(op="remove"):
+                container.remove(force=True)
+
+    def _get(self, handle: str) -> Any:
+        with DOCKER_CALL_SECONDS.time(op="get"):
+            return self.docker_client.containers.get(handle)
+
+
+def create_backend(name: str, image: str, docker_client: Any = None) -> ExecutionBackend:
+    """Build the execution backend named by config.EXECUTION_BACKEND."""
+    if name == "docker":
+        return DockerBackend(docker_client if docker_client is not None else docker.from_env(), image)
+    if name == "kubernetes":
+        from src.orchestrator.api.K8Manager import KubernetesBackend
+        return KubernetesBackend.from_config(image)
+    raise ValueError(f"Unknown execution backend: {name}")
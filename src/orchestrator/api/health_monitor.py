@@ -0,0 +1,241 @@
+import logging
+import os
+import shutil
+import time
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+
+UNITS = {"k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+
+
+def parse_bytes(value: Any) -> int:
+    """Docker-style size ("512m", "2g", 1048576) to bytes."""
+    text = str(value).strip().lower().rstrip("b")
+    if text and text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def container_usage(stats: Dict[str, Any]) -> Optional[Tuple[float, int]]:
+    """(CPU cores in use, memory bytes) from one decoded `container.stats()` sample, as `docker stats` computes them."""
+    cpu, precpu = stats.get("cpu_stats") or {}, stats.get("precpu_stats") or {}
+    cpu_delta = cpu.get("cpu_usage", {}).get("total_usage", 0) - precpu.get("cpu_usage", {}).get("total_usage", 0)
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    online = cpu.get("online_cpus") or len(cpu.get("cpu_usage", {}).get("percpu_usage") or []) or 1
+    memory = stats.get("memory_stats") or {}
+    if "usage" not in memory:
+        return None
+    # Page cache is reclaimable; docker stats subtracts it too (inactive_file on cgroup v2, cache on v1).
+    cache = (memory.get("stats") or {}).get("inactive_file", (memory.get("stats") or {}).get("cache", 0))
+    cores = cpu_delta / system_delta * online if system_delta > 0 and cpu_delta > 0 else 0.0
+    return cores, max(0, memory["usage"] - cache)
+
+
+class HostSampler:
+    """Reads host CPU, memory and disk usage from /proc and statvfs; CPU needs two samples."""
+
+    def __init__(self, disk_path: str) -> None:
+        self.disk_path = disk_path
+        self._last_cpu: Optional[Tuple[int, int]] = None
+
+    def sample(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open("/proc/stat", "r", encoding="utf-8") as f:
+                fields = [int(v) for v in f.readline().split()[1:9]]
+            with open("/proc/meminfo", "r", encoding="utf-8") as f:
+                meminfo = {line.split(":")[0]: int(line.split()[1]) * 1024 for line in f if ":" in line}
+        except (OSError, ValueError, IndexError):
+            return None
+        idle, total = fields[3] + fields[4], sum(fields)
+        cpu_count = os.cpu_count() or 1
+        cpu_used = None
+        if self._last_cpu and total > self._last_cpu[1]:
+            busy = 1 - (idle - self._last_cpu[0]) / (total - self._last_cpu[1])
+            cpu_used = max(0.0, busy) * cpu_count
+        self._last_cpu = (idle, total)
+        disk = shutil.disk_usage(self.disk_path)
+        return {
+            "cpu_count": cpu_count,
+            "cpu_used": cpu_used,
+            "memory_total": meminfo.get("MemTotal", 0),
+            "memory_used": meminfo.get("MemTotal", 0) - meminfo.get("MemAvailable", meminfo.get("MemFree", 0)),
+            "disk_total": disk.total,
+            "disk_used": disk.used,
+        }
+
+
+class HealthMonitor:
+    """Samples host usage every `interval` and follows per-container `stats(stream=True)`.
+
+    Admission asks `can_admit` whether starting a job of a given size keeps projected CPU and memory
+    (current usage, plus the full request of jobs the host sample does not reflect yet, plus the new
+    job) and disk under the warning thresholds. A job's request stops counting only once a host
+    sample taken after the job's first container stats sample exists, since the host sample can be
+    up to `interval` seconds old. With no host sample the monitor fails open.
+    Each job's peak CPU/memory is kept and handed back by `unwatch`.
+    """
+
+    def __init__(
+        self,
+        disk_path: str,
+        interval: float,
+        thresholds: Dict[str, Tuple[float, float]],
+        sampler: Optional[Any] = None,
+        on_sample: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.interval = interval
+        self.thresholds = thresholds  # resource -> (warning %, critical %)
+        self.sampler = sampler or HostSampler(disk_path)
+        self.on_sample = on_sample
+        self.lock = Lock()
+        self.host: Optional[Dict[str, Any]] = None
+        self.sampled_at: Optional[float] = None
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.last_refusal: Optional[str] = None
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self.sample_once()
+        self._thread = Thread(target=self._loop, name="health-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self.lock:
+            for entry in self.jobs.values():
+                entry["stopped"] = True
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def sample_once(self) -> None:
+        started = time.time()
+        host = self.sampler.sample()
+        with self.lock:
+            self.host = host
+            self.sampled_at = started
+        if host:
+            for resource, percent in self._percentages(host, 0.0, 0).items():
+                if percent is not None and percent >= self.thresholds[resource][1]:
+                    logging.warning(f"Host {resource} usage at {percent:.1f}% (critical)")
+        if self.on_sample:
+            self.on_sample()
+
+    def watch(self, job_id: str, container: Any, cpus: float, memory: int) -> None:
+        """Follow a job's container stats; the job's request counts as usage until the first sample."""
+        entry = {"cpus": cpus, "memory": memory, "current": None, "peak": None, "first_sample": None, "stopped": False}
+        with self.lock:
+            previous = self.jobs.get(job_id)
+            if previous:
+                previous["stopped"] = True
+            self.jobs[job_id] = entry
+        Thread(target=self._follow, args=(entry, container), name=f"stats-{job_id[:8]}", daemon=True).start()
+
+    def reserve(self, job_id: str, cpus: float, memory: int) -> None:
+        """Count a just-admitted job's request as usage until `watch` starts following its container."""
+        with self.lock:
+            self.jobs.setdefault(
+                job_id,
+                {"cpus": cpus, "memory": memory, "current": None, "peak": None, "first_sample": None, "stopped": True},
+            )
+
+    def unwatch(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Stop following a job and return its peak usage, if any sample arrived."""
+        with self.lock:
+            entry = self.jobs.pop(job_id, None)
+        if not entry:
+            return None
+        entry["stopped"] = True
+        return entry["peak"]
+
+    def can_admit(self, cpus: float, memory: int) -> bool:
+        with self.lock:
+            host, sampled_at = self.host, self.sampled_at
+            # Jobs whose usage the host sample cannot show yet: not sampled, or sampled after the host was.
+            unseen = [e for e in self.jobs.values() if e["first_sample"] is None or sampled_at < e["first_sample"]]
+            pending_cpus = sum(e["cpus"] for e in unseen)
+            pending_memory = sum(e["memory"] for e in unseen)
+        if not host:
+            return True
+        percent = self._percentages(host, pending_cpus + cpus, pending_memory + memory)
+        over = [
+            f"{resource} {value:.1f}% >= {self.thresholds[resource][0]}%"
+            for resource, value in percent.items()
+            if value is not None and value >= self.thresholds[resource][0]
+        ]
+        with self.lock:
+            self.last_refusal = f"projected {', '.join(over)}" if over else None
+        return not over
+
+    def headroom(self) -> Dict[str, Any]:
+        """Capacity, usage, threshold levels and what is left below the warning thresholds."""
+        with self.lock:
+            host = dict(self.host) if self.host else None
+            jobs = {job_id: {"current": e["current"], "peak": e["peak"]} for job_id, e in self.jobs.items()}
+            sampled_at, last_refusal = self.sampled_at, self.last_refusal
+        report: Dict[str, Any] = {
+            "sampled_at": sampled_at,
+            "thresholds": {r: {"warning": w, "critical": c} for r, (w, c) in self.thresholds.items()},
+            "admission_blocked_by": last_refusal,
+            "jobs": jobs,
+        }
+        if not host:
+            return report
+        percent = self._percentages(host, 0.0, 0)
+        report.update({
+            "host": host,
+            "percent": percent,
+            "level": {r: self._level(r, p) for r, p in percent.items()},
+            "headroom": {
+                "cpus": None if host["cpu_used"] is None else
+                host["cpu_count"] * self.thresholds["cpu"][0] / 100 - host["cpu_used"],
+                "memory_bytes": int(host["memory_total"] * self.thresholds["memory"][0] / 100 - host["memory_used"]),
+                "disk_bytes": int(host["disk_total"] * self.thresholds["disk"][0] / 100 - host["disk_used"]),
+            },
+        })
+        return report
+
+    def _percentages(self, host: Dict[str, Any], extra_cpus: float, extra_memory: int) -> Dict[str, Optional[float]]:
+        return {
+            "cpu": None if host["cpu_used"] is None else (host["cpu_used"] + extra_cpus) / host["cpu_count"] * 100,
+            "memory": (host["memory_used"] + extra_memory) / host["memory_total"] * 100 if host["memory_total"] else None,
+            "disk": host["disk_used"] / host["disk_total"] * 100 if host["disk_total"] else None,
+        }
+
+    def _level(self, resource: str, percent: Optional[float]) -> str:
+        if percent is None:
+            return "unknown"
+        warning, critical = self.thresholds[resource]
+        return "critical" if percent >= critical else "warning" if percent >= warning else "ok"
+
+    def _follow(self, entry: Dict[str, Any], container: Any) -> None:
+        try:
+            for stats in container.stats(stream=True, decode=True):
+                if entry["stopped"]:
+                    return
+                usage = container_usage(stats)
+                if usage is None:
+                    continue
+                cores, memory = usage
+                with self.lock:
+                    entry["current"] = {"cpus": round(cores, 3), "memory_bytes": memory}
+                    if entry["first_sample"] is None:
+                        entry["first_sample"] = time.time()
+                    peak = entry["peak"] or {"cpus": 0.0, "memory_bytes": 0}
+                    entry["peak"] = {
+                        "cpus": max(peak["cpus"], round(cores, 3)),
+                        "memory_bytes": max(peak["memory_bytes"], memory),
+                    }
+        except Exception as e:
+            if not entry["stopped"]:
+                logging.warning(f"Stats stream for container {getattr(container, 'id', '?')[:12]} ended: {e}")
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample_once()
+            except Exception as e:
+                logging.error(f"Health sample failed: {e}")
@@ -1,169 +1,1100 @@
 import logging
-import docker
 import uuid
 import os
-import json
 import shutil
+import statistics
 import time
-import tempfile
-from threading import Lock
-from typing import Any, Dict, Optional
-from src.orchestrator.utils import save_json, load_json
+from threading import Event, Thread
+from urllib.parse import urlparse
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from src.orchestrator.api.artifacts import ArtifactPackager
+from src.orchestrator.api.blob_store import BlobStore
+from src.orchestrator.api.execution_backend import ExecutionBackend, create_backend
+from src.orchestrator.api.health_monitor import HealthMonitor, parse_bytes
+from src.orchestrator.api.job_store import JobStore, create_job_store, decode_cursor, encode_cursor
+from src.orchestrator.api.metrics import (
+    CONTAINERS_REMOVED, JOB_DURATION_SECONDS, JOB_PHASE_SECONDS, JOB_STORE_WRITE_SECONDS, LOCK_WAIT_SECONDS, WORKSPACE_SEED_SECONDS,
+    TimedLock,
+)
+from src.orchestrator.api.log_pump import LOG_TYPES, LogPump, read_from_offset, tail_log
+from src.orchestrator.api.notifications import TransitionFeed, WebhookNotifier
+from src.orchestrator.api.phases import PHASES_FILE, build_timeline, phase_percentiles, read_markers, span
+from src.orchestrator.api.reaper import RetentionReaper
+from src.orchestrator.api.result_cache import ResultCache, clone_tree, link_or_copy
+from src.orchestrator.api.scheduler import JobScheduler
+from src.orchestrator.api.status_watcher import REMOVED
+from src.orchestrator.api.templates import TemplateStore
+from src.orchestrator.api.warm_pool import WarmPool
+from src.orchestrator.api.watchdog import JobWatchdog
+from src.orchestrator.config import config
 
 logging.basicConfig(level=logging.INFO)
 
 OUTPUT_DIR = os.getenv("AGENT_OUTPUT_DIR", "/tmp/agent_jobs")
 AGENT_IMAGE = os.getenv("AGENT_IMAGE", "containerized-agent:latest")
 RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "1"))
-JOBS_FILE = os.path.join(OUTPUT_DIR, "jobs.json")
 LOGS_SUBDIR = "logs"
+POOL_SUBDIR = "pool"
+ARTIFACTS_SUBDIR = "artifacts"
+BLOBS_SUBDIR = "blobs"
+TEMPLATES_SUBDIR = "templates"
+FIRST_OUTPUT_FILE = ".agent_first_output"
+TERMINAL_STATUSES = ("complete", "timed_out", "error", "cancelled", "not_found")
+FINISHED_STATUSES = ("complete", "timed_out")  # the container exited, so there is a workspace to download
+LIST_FIELDS = ("status", "created", "started", "completed", "error")  # default /jobs projection
 
 class JobManager:
-    def __init__(self) -> None:
-        """Initialize the JobManager with Docker client and job state."""
-        self.docker_client = docker.from_env()
-        self.lock = Lock()
+    def __init__(
+        self, docker_client: Any = None, store: Optional[JobStore] = None, backend: Optional[ExecutionBackend] = None
+    ) -> None:
+        """Initialize the JobManager with an execution backend (Docker unless configured otherwise) and job state."""
+        self.backend = backend if backend is not None else create_backend(
+            config.EXECUTION_BACKEND, AGENT_IMAGE, docker_client
+        )
+        self.lock = TimedLock(LOCK_WAIT_SECONDS, "job_manager")
         os.makedirs(OUTPUT_DIR, exist_ok=True)
-        self.jobs: Dict[str, Any] = self._load_jobs()
-        self.cleanup_jobs()
+        self.store = store if store is not None else create_job_store(config.JOB_STORE_BACKEND, OUTPUT_DIR)
+        self.jobs: Dict[str, Any] = self.store.load_all()
+        self.packager = ArtifactPackager(
+            os.path.join(OUTPUT_DIR, ARTIFACTS_SUBDIR),
+            config.ARTIFACT_COMPRESSION,
+            config.ARTIFACT_COMPRESSLEVEL,
+            config.ARTIFACT_BUILD_WORKERS,
+        )
+        self.blobs: Optional[BlobStore] = None
+        if config.BLOB_STORE_ENABLED:
+            self.blobs = BlobStore(os.path.join(OUTPUT_DIR, BLOBS_SUBDIR))
+        self.templates: Optional[TemplateStore] = None
+        if config.WORKSPACE_TEMPLATES and not self.backend.supports_templates:
+            logging.warning(f"WORKSPACE_TEMPLATES is ignored: the {self.backend.name} backend cannot build templates")
+        elif config.WORKSPACE_TEMPLATES:
+            self.templates = TemplateStore(
+                os.path.join(OUTPUT_DIR, TEMPLATES_SUBDIR),
+                config.WORKSPACE_TEMPLATES,
+                self.backend.build_template,
+                config.TEMPLATE_REFRESH_INTERVAL,
+            )
+        self.reaper = RetentionReaper(self._reap_jobs, config.REAPER_BATCH_SIZE)
+        self.watchdog = JobWatchdog(self._time_out, self._kill_timed_out, self._last_output, config.JOB_KILL_GRACE)
+        self.transitions = TransitionFeed(config.TRANSITION_LOG_SIZE)
+        self.published: Dict[str, str] = {job_id: job["status"] for job_id, job in self.jobs.items()}
+        self.notifier = WebhookNotifier(
+            self._on_webhook_result,
+            config.WEBHOOK_MAX_ATTEMPTS,
+            config.WEBHOOK_BACKOFF,
+            timeout=config.WEBHOOK_TIMEOUT,
+            workers=config.WEBHOOK_WORKERS,
+        )
+        self.cache: Optional[ResultCache] = None
+        if config.RESULT_CACHE_ENABLED:
+            # Entries never outlive the retention of the job they point at.
+            self.cache = ResultCache(
+                min(config.RESULT_CACHE_TTL, RETENTION_DAYS * 24 * 3600),
+                config.RESULT_CACHE_MAX_BYTES,
+                self.backend.image_id,
+                config.RESULT_CACHE_MODEL_KEY,
+            )
+            for job_id, job in sorted(self.jobs.items(), key=lambda item: item[1].get("completed") or 0):
+                self._cache_result(job_id, job)
+        self.container_jobs: Dict[str, str] = {
+            job["container_id"]: job_id for job_id, job in self.jobs.items() if job.get("container_id")
+        }
+        # Finished jobs -> container to remove once their log pump drains.
+        self.collected: Dict[str, str] = {}
+        self.watcher = self.backend.watcher(self._on_container_state, config.STATUS_RESYNC_INTERVAL)
+        self.monitor: Optional[HealthMonitor] = None
+        if config.HEALTH_MONITOR_ENABLED and self.backend.local:
+            self.monitor = HealthMonitor(
+                OUTPUT_DIR,
+                config.HEALTH_CHECK_INTERVAL,
+                {
+                    "cpu": (config.CPU_WARNING_THRESHOLD, config.CPU_CRITICAL_THRESHOLD),
+                    "memory": (config.MEMORY_WARNING_THRESHOLD, config.MEMORY_CRITICAL_THRESHOLD),
+                    "disk": (config.DISK_WARNING_THRESHOLD, config.DISK_CRITICAL_THRESHOLD),
+                },
+                on_sample=lambda: self.scheduler.poke(),
+            )
+        self.scheduler = JobScheduler(
+            self.launch_job,
+            config.MAX_CONCURRENT_JOBS,
+            self._admit if self.monitor else None,
+            launch_workers=config.LAUNCH_PARALLELISM,
+        )
+        self.log_pumps: Dict[str, LogPump] = {}
+        self.reconciled = Event()
+        self.reconcile_stats: Dict[str, Any] = {}
+        self._stopping = Event()
+        self._reconcile_thread: Optional[Thread] = None
+        self.pool: Optional[WarmPool] = None
+        if config.WARM_POOL_SIZE > 0 and self.backend.local:
+            self.pool = WarmPool(
+                self.backend.docker_client,
+                AGENT_IMAGE,
+                os.path.join(OUTPUT_DIR, POOL_SUBDIR),
+                config.WARM_POOL_SIZE,
+                config.WARM_POOL_MAX_IDLE,
+                config.WARM_POOL_MAX_USES,
+                self.backend.container_kwargs,
+                self._on_pooled_job_exit,
+            )
+        for job_id, job in self.jobs.items():
+            if job.get("status") in TERMINAL_STATUSES:
+                self.reaper.schedule(job_id, self._expires_at(job))
+            elif job.get("status") == "pending":
+                self.scheduler.enqueue(job_id, job.get("priority", 0), job["created"])
+            elif job.get("container_id") and job.get("status") not in TERMINAL_STATUSES:
+                self.watcher.track(job["container_id"], job["status"])
+                self.scheduler.mark_running(job_id)
+
+    def start(self) -> None:
+        """Start background services (status watcher, health monitor, warm pool, scheduler, reaper, webhooks,
+        template refresh)."""
+        self.notifier.start()
+        if self.templates:
+            self.templates.start()
+        with self.lock:
+            # Callbacks whose delivery had not finished when the orchestrator last stopped.
+            unsent = [
+                (job_id, job["callback_url"], self._callback_payload(job_id, job))
+                for job_id, job in self.jobs.items()
+                if job.get("callback_url") and job["status"] in TERMINAL_STATUSES and not job.get("callback")
+            ]
+        for callback in unsent:
+            self.notifier.send(*callback)
+        # Taken before the watcher starts, so reconciliation sees the records as they were loaded.
+        unfinished = self._unfinished_jobs()
+        self.watcher.start()
+        if self.monitor:
+            self.monitor.start()
+        if self.pool:
+            self.pool.start()
+        self.reaper.start()
+        self.watchdog.start()
+        self._stopping.clear()
+        self._reconcile_thread = Thread(
+            target=self._reconcile_then_schedule, args=(unfinished,), name="reconcile", daemon=True
+        )
+        self._reconcile_thread.start()
+
+    def _reconcile_then_schedule(self, unfinished: Dict[str, Tuple[str, Optional[str], Optional[str]]]) -> None:
+        self.reconcile(unfinished)
+        if not self._stopping.is_set():
+            self.scheduler.start()
+
+    def _unfinished_jobs(self) -> Dict[str, Tuple[str, Optional[str], Optional[str]]]:
+        """job ID -> (status, container_id, start_mode) of every job not in a terminal state."""
+        with self.lock:
+            return {
+                job_id: (job["status"], job.get("container_id"), job.get("start_mode"))
+                for job_id, job in self.jobs.items()
+                if job["status"] not in TERMINAL_STATUSES
+            }
+
+    def reconcile(
+        self, unfinished: Optional[Dict[str, Tuple[str, Optional[str], Optional[str]]]] = None
+    ) -> Dict[str, Any]:
+        """Match unfinished job records against the backend's job-labelled workloads, in one listing.
 
-    def _save_jobs(self) -> None:
-        """Atomically save jobs to disk."""
+        A running job whose workload is gone is marked not_found. A workload whose job is still
+        pending (the orchestrator stopped between launch and saving) or has no record at all is
+        adopted as that job. Running jobs get their log pump and usage stats back. `start` runs this
+        in the background and only starts the scheduler afterwards, so no job is launched twice;
+        requests are served meanwhile. Jobs on pooled containers, which carry no job label, are left
+        to the status watcher.
+        """
+        started = time.time()
+        counts = {"checked": 0, "adopted": 0, "orphaned": 0, "errors": 0}
+        candidates = self._unfinished_jobs() if unfinished is None else dict(unfinished)
+        try:
+            workloads = self.backend.list_workloads()
+        except Exception as e:
+            logging.error(f"Could not list workloads to reconcile; leaving it to the status watcher: {e}")
+            workloads, candidates = None, {}
+            counts["errors"] += 1
         with self.lock:
-            tmp_fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(JOBS_FILE), prefix="jobs_", suffix=".json")
+            for job_id in workloads or {}:
+                if job_id not in self.jobs:
+                    _, self.jobs[job_id] = self._new_job("", 0, None, job_id=job_id)
+                    self.jobs[job_id].update({"prompt": None, "adopted": True})
+                    candidates[job_id] = ("pending", None, None)
+        for job_id, (status, container_id, start_mode) in candidates.items():
+            if start_mode == "pooled":
+                continue
+            counts["checked"] += 1
             try:
-                with os.fdopen(tmp_fd, 'w', encoding='utf-8') as f:
-                    json.dump(self.jobs, f, indent=2, ensure_ascii=False)
-                os.replace(tmp_path, JOBS_FILE)
+                if job_id in workloads:
+                    handle, state = workloads[job_id]
+                    if status == "pending" or container_id != handle:
+                        counts["adopted"] += 1
+                        self._adopt(job_id, handle)
+                elif container_id:
+                    # Not labelled (started before labels existed) or gone; only these are asked about.
+                    state = self.backend.inspect(container_id)
+                    if state[0] == REMOVED:
+                        counts["orphaned"] += 1
+                else:
+                    continue
+                self._apply_container_state(job_id, *state)
             except Exception as e:
-                if os.path.exists(tmp_path):
-                    os.remove(tmp_path)
-                logging.error(f"Failed to save jobs: {e}")
-                raise e
-
-    def _load_jobs(self) -> Dict[str, Any]:
-        """Load jobs from disk."""
-        jobs = load_json(JOBS_FILE)
-        return jobs if jobs is not None else {}
-
-    def launch_job(self, prompt: str) -> str:
-        """Launch a new agent job as a Docker container."""
-        job_id = str(uuid.uuid4())
-        output_path = os.path.join(OUTPUT_DIR, job_id)
-        os.makedirs(output_path, exist_ok=True)
-        logs_path = os.path.join(output_path, LOGS_SUBDIR)
-        os.makedirs(logs_path, exist_ok=True)
-        created_time = time.time()
+                counts["errors"] += 1
+                logging.error(f"Failed to reconcile job {job_id}: {e}")
+        with self.lock:
+            running = [(job_id, dict(job)) for job_id, job in self.jobs.items() if job["status"] == "running"]
+        for job_id, job in running:
+            since = job.get("dispatched") if job.get("start_mode") == "pooled" else None
+            self._start_log_pump(job_id, job["container_id"], job["logs_path"], since)
+            self._watch_usage(job_id, job["container_id"], job.get("size", config.DEFAULT_SIZE_CLASS))
+            self._arm_watchdog(job_id)
+        self.reconcile_stats = {
+            **counts,
+            "workloads": None if workloads is None else len(workloads),
+            "started_at": started,
+            "seconds": round(time.time() - started, 6),
+        }
+        self.reconciled.set()
+        logging.info(f"Reconciled job records with workloads: {self.reconcile_stats}")
+        return self.reconcile_stats
+
+    def _adopt(self, job_id: str, handle: str) -> None:
+        """Record a workload found by reconciliation as its job's running container."""
+        self.scheduler.remove(job_id)
+        self.watcher.track(handle)
+        with self.lock:
+            job = self.jobs[job_id]
+            self.container_jobs[handle] = job_id
+            job.update({
+                "container_id": handle,
+                "status": "running",
+                "started": job.get("started") or time.time(),
+                "start_mode": job.get("start_mode") or "cold",
+            })
+            os.makedirs(job["logs_path"], exist_ok=True)
+            self._save_job(job_id)
+        self.scheduler.mark_running(job_id)
+        logging.info(f"Adopted container {handle} as job {job_id}")
+
+    def stop(self) -> None:
+        """Stop background services."""
+        self._stopping.set()
+        if self._reconcile_thread:
+            self._reconcile_thread.join(timeout=30)
+        self.reaper.stop()
+        self.watchdog.stop()
+        self.scheduler.stop()
+        if self.monitor:
+            self.monitor.stop()
+        if self.pool:
+            self.pool.stop()
+        self.watcher.stop()
+        self.notifier.stop()
+        if self.templates:
+            self.templates.stop()
+        self.packager.shutdown()
+
+    def _save_job(self, job_id: str) -> None:
+        """Persist a single job record. Caller must hold self.lock.
+
+        Every status change is persisted through here, so this is also where a job that has just
+        become terminal gets its retention deadline.
+        """
         try:
-            container = self.docker_client.containers.run(
-                AGENT_IMAGE,
-                detach=True,
-                environment={"JOB_PROMPT": prompt, "JOB_ID": job_id},
-                volumes={output_path: {"bind": "/workspace", "mode": "rw"}},
-                name=f"agent_job_{job_id[:8]}",
-                mem_limit="2g",
-                cpu_period=100000,
-                cpu_quota=50000,
-                stdout=True,
-                stderr=True,
-                log_config=docker.types.LogConfig(type=docker.types.LogConfig.types.JSON),
+            with JOB_STORE_WRITE_SECONDS.time(op="upsert"):
+                self.store.upsert(job_id, self.jobs[job_id])
+        except Exception as e:
+            logging.error(f"Failed to save job {job_id}: {e}")
+            raise e
+        if self.jobs[job_id]["status"] in TERMINAL_STATUSES:
+            self.reaper.schedule(job_id, self._expires_at(self.jobs[job_id]))
+            self.watchdog.forget(job_id)
+        self._publish_transition(job_id)
+
+    def _publish_transition(self, job_id: str) -> None:
+        """Announce a status change to long-polls and event streams, and a terminal one to the job's
+        callback URL. Caller must hold self.lock; both only queue work.
+        """
+        job = self.jobs[job_id]
+        previous = self.published.get(job_id)
+        if job["status"] == previous:
+            return
+        self.published[job_id] = job["status"]
+        self.transitions.publish(job_id, job["status"], previous)
+        if job["status"] in TERMINAL_STATUSES and job.get("callback_url"):
+            self.notifier.send(job_id, job["callback_url"], self._callback_payload(job_id, job))
+
+    @staticmethod
+    def _callback_payload(job_id: str, job: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "event": "job.finished",
+            "job_id": job_id,
+            "status": job["status"],
+            "exit_code": job.get("exit_code"),
+            "error": job.get("error"),
+            "created": job.get("created"),
+            "started": job.get("started"),
+            "completed": job.get("completed"),
+            "cancelled": job.get("cancelled"),
+            "cached": job.get("start_mode") == "cached",
+        }
+
+    def _on_webhook_result(self, job_id: str, result: Dict[str, Any]) -> None:
+        """Notifier callback: keep the final delivery outcome in the job record."""
+        with self.lock:
+            if job_id in self.jobs:
+                self.jobs[job_id]["callback"] = result
+                self._save_job(job_id)
+
+    @staticmethod
+    def _expires_at(job: Dict[str, Any]) -> float:
+        """When a finished job's retention runs out, counted from when it stopped."""
+        finished = job.get("completed") or job.get("cancelled") or job.get("started") or job["created"]
+        return finished + RETENTION_DAYS * 24 * 3600
+
+    @staticmethod
+    def _new_job(
+        prompt: str,
+        priority: int,
+        size: Optional[str],
+        metadata: Optional[Dict[str, Any]] = None,
+        callback_url: Optional[str] = None,
+        timeout: Optional[int] = None,
+        idle_timeout: Optional[int] = None,
+        template: Optional[str] = None,
+        job_id: Optional[str] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """(job_id, record) for a new pending job. Raises ValueError for an unknown size class or
+        workspace template, a callback URL that is not absolute http(s) or a negative timeout.
+        """
+        size = size or config.DEFAULT_SIZE_CLASS
+        if size not in config.SIZE_CLASSES:
+            raise ValueError(f"Unknown size class: {size}")
+        if template and template not in config.WORKSPACE_TEMPLATES:
+            raise ValueError(f"Unknown workspace template: {template}")
+        if callback_url:
+            parsed = urlparse(callback_url)
+            if parsed.scheme not in ("http", "https") or not parsed.netloc:
+                raise ValueError(f"Invalid callback_url: {callback_url}")
+        if (timeout is not None and timeout < 0) or (idle_timeout is not None and idle_timeout < 0):
+            raise ValueError("Timeouts must be 0 (disabled) or a positive number of seconds")
+        job_id = job_id or str(uuid.uuid4())
+        output_path = os.path.join(OUTPUT_DIR, job_id)
+        job = {
+            "container_id": None,
+            "status": "pending",
+            "prompt": prompt,
+            "priority": priority,
+            "size": size,
+            "output_path": output_path,
+            "logs_path": os.path.join(output_path, LOGS_SUBDIR),
+            "error": None,
+            "created": time.time(),
+            "started": None,
+            "completed": None,
+            "cancelled": None,
+            "exit_code": None,
+        }
+        if metadata:
+            job["metadata"] = metadata
+        if callback_url:
+            job["callback_url"] = callback_url
+        if timeout is not None:
+            job["timeout_seconds"] = timeout
+        if idle_timeout is not None:
+            job["idle_timeout_seconds"] = idle_timeout
+        if template:
+            job["template"] = template
+        return job_id, job
+
+    def submit_job(
+        self,
+        prompt: str,
+        priority: int = 0,
+        size: Optional[str] = None,
+        no_cache: bool = False,
+        callback_url: Optional[str] = None,
+        timeout: Optional[int] = None,
+        idle_timeout: Optional[int] = None,
+        template: Optional[str] = None,
+    ) -> str:
+        """Record a new job as pending and queue it for admission by the scheduler.
+
+        With the result cache enabled, an identical earlier job answers it instead unless `no_cache`
+        is set; the job then stays pending only until its results are cloned. `size` names one of config.SIZE_CLASSES; raises
+        ValueError for an unknown class. `callback_url` is POSTed the job's outcome once it finishes.
+        `timeout` and `idle_timeout` (seconds, 0 to disable) override JOB_TIMEOUT and JOB_IDLE_TIMEOUT.
+        `template` names one of config.WORKSPACE_TEMPLATES to seed the workspace from.
+        """
+        self._check_template_support(template)
+        job_id, job = self._new_job(
+            prompt, priority, size, callback_url=callback_url, timeout=timeout, idle_timeout=idle_timeout,
+            template=template,
+        )
+        if self._use_cache(job_id, job, no_cache):
+            return job_id
+        with self.lock:
+            self.jobs[job_id] = job
+            self._save_job(job_id)
+        self.scheduler.enqueue(job_id, priority, job["created"])
+        logging.info(f"Queued job {job_id} with priority {priority}")
+        return job_id
+
+    def submit_jobs(self, items: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Record and queue many jobs at once: one store transaction and one queue insertion.
+
+        `items` are dicts with `prompt` and optional `priority`, `size`, `metadata`, `no_cache`,
+        `callback_url`, `timeout`, `idle_timeout` and `template`.
+        Returns one result per item, in order: `job_id`, `cached` and `queue_position`, or `error` for
+        an item that was rejected. Valid items are queued even when others fail.
+        """
+        results: List[Dict[str, Any]] = []
+        new_jobs: Dict[str, Dict[str, Any]] = {}
+        for index, item in enumerate(items):
+            try:
+                self._check_template_support(item.get("template"))
+                job_id, job = self._new_job(
+                    item["prompt"], item.get("priority", 0), item.get("size"), item.get("metadata"),
+                    item.get("callback_url"), item.get("timeout"), item.get("idle_timeout"), item.get("template"),
+                )
+            except (KeyError, ValueError) as e:
+                results.append({"index": index, "job_id": None, "error": str(e)})
+                continue
+            if self._use_cache(job_id, job, item.get("no_cache", False)):
+                results.append({"index": index, "job_id": job_id, "error": None, "cached": True, "queue_position": None})
+                continue
+            new_jobs[job_id] = job
+            results.append({"index": index, "job_id": job_id, "error": None, "cached": False})
+        if new_jobs:
+            try:
+                with self.lock:
+                    with JOB_STORE_WRITE_SECONDS.time(op="upsert_many"):
+                        self.store.upsert_many(new_jobs)
+                    self.jobs.update(new_jobs)
+                    for job_id in new_jobs:
+                        self._publish_transition(job_id)
+            except Exception as e:
+                logging.error(f"Failed to save a batch of {len(new_jobs)} jobs: {e}")
+                for result in results:
+                    if result["job_id"] in new_jobs:
+                        result.update({"job_id": None, "error": f"Failed to save job: {e}"})
+                return results
+            positions = self.scheduler.enqueue_many(
+                (job_id, job["priority"], job["created"]) for job_id, job in new_jobs.items()
             )
+            for result in results:
+                if result["job_id"]:
+                    result["queue_position"] = positions.get(result["job_id"])
+        logging.info(f"Queued a batch of {len(new_jobs)} jobs ({len(results) - len(new_jobs)} rejected)")
+        return results
+
+    def launch_job(self, job_id: str) -> None:
+        """Start the agent container for a pending job. Called by the scheduler once a slot is free.
+
+        A warm-pool container is used when one is idle and the job wants the default size class and
+        no template; otherwise the backend cold-starts one, on a workspace seeded from the template.
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not job or job["status"] != "pending":
+                self.scheduler.release(job_id)
+                if self.monitor:
+                    self.monitor.unwatch(job_id)
+                return
+            prompt, output_path, logs_path = job["prompt"], job["output_path"], job["logs_path"]
+            size = job.get("size", config.DEFAULT_SIZE_CLASS)
+            template = job.get("template")
+        dispatched = time.time()
+        try:
+            use_pool = self.pool and size == config.DEFAULT_SIZE_CLASS and not template
+            claimed = self.pool.claim(job_id, prompt) if use_pool else None
+            if claimed:
+                container_id, output_path = claimed
+                logs_path = os.path.join(output_path, LOGS_SUBDIR)
+                start_mode = "pooled"
+            else:
+                if template:
+                    self._seed_workspace(job_id, template, output_path)
+                container_id = self.backend.launch(job_id, prompt, output_path, size)
+                start_mode = "cold"
+            os.makedirs(logs_path, exist_ok=True)
+            self.watcher.track(container_id)
             with self.lock:
-                self.jobs[job_id] = {
-                    "container_id": container.id,
+                self.container_jobs[container_id] = job_id
+                self.jobs[job_id].update({
+                    "container_id": container_id,
                     "status": "running",
                     "output_path": output_path,
                     "logs_path": logs_path,
-                    "error": None,
-                    "created": created_time,
+                    "start_mode": start_mode,
+                    "dispatched": dispatched,
                     "started": time.time(),
-                    "completed": None,
-                    "cancelled": None,
-                    "exit_code": None,
-                }
-                self._save_jobs()
-            logging.info(f"Launched job {job_id} with container {container.id}")
+                })
+                self._save_job(job_id)
+                # A container that exits before the mapping above exists has its event dropped by
+                # _on_container_state; the watcher has already cached that state, so fold it in here.
+                early_state = self.watcher.get(container_id)
+            self._start_log_pump(job_id, container_id, logs_path, dispatched if start_mode == "pooled" else None)
+            self._watch_usage(job_id, container_id, size)
+            self._arm_watchdog(job_id)
+            logging.info(f"Launched job {job_id} ({start_mode}) with container {container_id}")
+            if early_state and early_state[0] != "running":
+                self._apply_container_state(job_id, *early_state)
         except Exception as e:
             with self.lock:
-                self.jobs[job_id] = {
-                    "container_id": None,
-                    "status": "error",
-                    "output_path": output_path,
-                    "logs_path": logs_path,
-                    "error": str(e),
-                    "created": created_time,
-                    "started": None,
-                    "completed": None,
-                    "cancelled": None,
-                    "exit_code": None,
-                }
-                self._save_jobs()
+                self.jobs[job_id].update({"status": "error", "error": str(e)})
+                self._save_job(job_id)
+            self.scheduler.release(job_id)
+            self._record_peak_usage(job_id)
             logging.error(f"Failed to launch job {job_id}: {e}")
-        return job_id
+
+    def _seed_workspace(self, job_id: str, template: str, output_path: str) -> None:
+        """Materialize a workspace template at a job's workspace and record what it cost."""
+        if not self.templates:
+            raise RuntimeError(f"Workspace template {template} is no longer configured")
+        seed = self.templates.seed(template, output_path)
+        WORKSPACE_SEED_SECONDS.observe(seed["seconds"], template=template)
+        with self.lock:
+            self.jobs[job_id]["seed"] = seed
+        logging.info(
+            f"Seeded job {job_id} from template {template} ({seed['mode']}, {seed['files']} files, "
+            f"{seed['bytes_written']} bytes written) in {seed['seconds'] * 1000:.1f} ms"
+        )
+
+    def _check_template_support(self, template: Optional[str]) -> None:
+        """Reject a templated job up front on a backend that cannot build workspace templates."""
+        if template and not self.backend.supports_templates:
+            raise ValueError(f"The {self.backend.name} backend does not support workspace templates")
+
+    def template_report(self) -> Dict[str, Any]:
+        """Workspace templates: current version, build time and size, seeds and bytes they wrote."""
+        if not self.templates:
+            return {"enabled": False}
+        return {"enabled": True, **self.templates.stats()}
+
+    def _use_cache(self, job_id: str, job: Dict[str, Any], no_cache: bool) -> bool:
+        """Tag a new job with its result-cache key and, on a hit, answer it from the cached job.
+
+        On a hit the job is recorded as pending with start_mode "cached" and its results are cloned on
+        the artifacts executor, off the submit path; `_complete_from_cache` then completes it. The
+        clone is of hardlinks, so the new job is independent of the earlier job's retention. Returns
+        False when the job still has to run.
+        """
+        if not self.cache:
+            return False
+        try:
+            key = self.cache.key_for(job["prompt"], job.get("template"))
+        except Exception as e:
+            logging.warning(f"No result cache key for job {job_id}: {e}")
+            return False
+        job["cache_key"] = key
+        source_id = None if no_cache else self.cache.get(key)
+        if not source_id:
+            return False
+        with self.lock:
+            source = dict(self.jobs[source_id]) if source_id in self.jobs else None
+        if not source or source["status"] != "complete" or not os.path.isdir(source["output_path"]):
+            self.cache.forget_job(source_id)
+            return False
+        job["start_mode"] = "cached"
+        with self.lock:
+            self.jobs[job_id] = job
+            self._save_job(job_id)
+        self.packager.executor.submit(self._complete_from_cache, job_id, source_id, source)
+        logging.info(f"Job {job_id} will be answered from the result cache (job {source_id})")
+        return True
+
+    def _complete_from_cache(self, job_id: str, source_id: str, source: Dict[str, Any]) -> None:
+        """Clone a cache hit's workspace and archive from its source job and complete it.
+
+        Runs on the artifacts executor. If the clone fails the job is queued to run normally.
+        """
+        with self.lock:
+            job = dict(self.jobs[job_id])
+        try:
+            clone_tree(source["output_path"], job["output_path"])
+            artifact = source.get("artifact")
+            if artifact and os.path.exists(artifact):
+                if os.path.dirname(artifact) == self.packager.artifacts_dir:
+                    job["artifact"] = self.packager.artifact_path(job_id)
+                    link_or_copy(artifact, job["artifact"])
+                else:  # the entrypoint's own zip, cloned along with the workspace
+                    job["artifact"] = os.path.join(job["output_path"], os.path.relpath(artifact, source["output_path"]))
+        except Exception as e:
+            logging.warning(f"Could not clone cached results of job {source_id}, running job {job_id}: {e}")
+            shutil.rmtree(job["output_path"], ignore_errors=True)
+            with self.lock:
+                self.jobs[job_id].pop("start_mode", None)
+                self._save_job(job_id)
+            self.scheduler.enqueue(job_id, job["priority"], job["created"])
+            return
+        now = time.time()
+        with self.lock:
+            self.jobs[job_id].update({
+                "status": "complete",
+                "started": now,
+                "completed": now,
+                "exit_code": 0,
+                "cache_hit_of": source_id,
+                **({"artifact": job["artifact"]} if job.get("artifact") else {}),
+            })
+            self._save_job(job_id)
+        if not job.get("artifact"):
+            self.packager.submit(job_id, job["output_path"], self._on_artifact_built)
+        logging.info(f"Job {job_id} answered from the result cache (job {source_id})")
+
+    def _cache_result(self, job_id: str, job: Dict[str, Any]) -> None:
+        """Offer a finished job to the result cache: only real runs that exited 0 and have an archive."""
+        if not self.cache or not job.get("cache_key") or job.get("cache_hit_of"):
+            return
+        artifact = job.get("artifact")
+        if job.get("status") != "complete" or job.get("exit_code") != 0 or not artifact or not os.path.exists(artifact):
+            return
+        self.cache.put(job["cache_key"], job_id, os.path.getsize(artifact), job.get("completed"))
+
+    def cache_report(self) -> Dict[str, Any]:
+        """Result cache size and hit rate."""
+        if not self.cache:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
+
+    def _admit(self, job_id: str) -> bool:
+        """Scheduler admission check: would this job's size class keep the host under its warning thresholds?"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            size = job.get("size", config.DEFAULT_SIZE_CLASS) if job else config.DEFAULT_SIZE_CLASS
+        size_class = config.SIZE_CLASSES[size]
+        cpus, memory = size_class["cpus"], parse_bytes(size_class["mem_limit"])
+        if not self.monitor.can_admit(cpus, memory):
+            return False
+        # Launches run in parallel, so hold the job's share until its stats stream takes over.
+        self.monitor.reserve(job_id, cpus, memory)
+        return True
+
+    def _watch_usage(self, job_id: str, container_id: str, size: str) -> None:
+        """Follow a running job's container stats in the health monitor."""
+        if not self.monitor:
+            return
+        try:
+            container = self.backend.stats_source(container_id)
+        except Exception as e:
+            logging.warning(f"No usage stats for job {job_id}: {e}")
+            return
+        if container is None:
+            return
+        size_class = config.SIZE_CLASSES[size]
+        self.monitor.watch(job_id, container, size_class["cpus"], parse_bytes(size_class["mem_limit"]))
+
+    def _record_peak_usage(self, job_id: str) -> None:
+        """Stop following a finished job's stats and keep its peak CPU/memory in the job record."""
+        peak = self.monitor.unwatch(job_id) if self.monitor else None
+        if not peak:
+            return
+        with self.lock:
+            if job_id in self.jobs:
+                self.jobs[job_id]["peak_usage"] = peak
+                self._save_job(job_id)
+
+    def _arm_watchdog(self, job_id: str) -> None:
+        """Start enforcing a running job's wall-clock deadline and idle timeout."""
+        with self.lock:
+            job = self.jobs[job_id]
+            started = job.get("started") or time.time()
+            timeout = job.get("timeout_seconds", config.JOB_TIMEOUT)
+            idle_timeout = job.get("idle_timeout_seconds", config.JOB_IDLE_TIMEOUT)
+        self.watchdog.watch(job_id, started, timeout, idle_timeout)
+
+    def _last_output(self, job_id: str) -> Optional[float]:
+        """Watchdog callback: when a job's container last wrote to stdout or stderr."""
+        with self.lock:
+            pump = self.log_pumps.get(job_id)
+        return pump.last_output if pump else None
+
+    def _time_out(self, job_id: str, reason: str) -> None:
+        """Watchdog callback: SIGTERM a job past its deadline or idle timeout.
+
+        The entrypoint's cleanup trap still archives the workspace; the job becomes timed_out once
+        its container stops, and the watchdog escalates to `_kill_timed_out` after JOB_KILL_GRACE.
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not job or job["status"] != "running":
+                return
+            job.setdefault("timeout", {"reason": reason, "signalled": time.time()})
+            self._save_job(job_id)
+            handle = job["container_id"]
+        logging.warning(f"Job {job_id} hit its {reason} timeout; sending SIGTERM")
+        self.backend.terminate(handle, config.JOB_KILL_GRACE)
+
+    def _kill_timed_out(self, job_id: str) -> None:
+        """Watchdog callback: SIGKILL a timed-out job that is still running after the grace period."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not job or job["status"] != "running":
+                return
+            handle = job["container_id"]
+        logging.warning(f"Job {job_id} did not stop within {config.JOB_KILL_GRACE}s of SIGTERM; sending SIGKILL")
+        self.backend.kill(handle)
+
+    def health_report(self) -> Dict[str, Any]:
+        """Host headroom, threshold levels and current/peak usage of running jobs."""
+        if not self.monitor:
+            return {"enabled": False}
+        report = self.monitor.headroom()
+        with self.lock:
+            sizes = {job_id: self.jobs[job_id].get("size") for job_id in report["jobs"] if job_id in self.jobs}
+        for job_id, usage in report["jobs"].items():
+            usage["size"] = sizes.get(job_id)
+        return {"enabled": True, "size_classes": config.SIZE_CLASSES, **report}
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """1-based position of a pending job in the admission queue."""
+        return self.scheduler.position(job_id)
+
+    def _on_container_state(self, container_id: str, container_status: str, exit_code: Optional[int]) -> None:
+        """Status watcher callback: fold a container state change into its job record."""
+        with self.lock:
+            job_id = self.container_jobs.get(container_id)
+        if job_id:
+            self._apply_container_state(job_id, container_status, exit_code)
+        if self.pool and container_status in ("exited", REMOVED):
+            # After the job's workspace has been moved out: forgetting a slot removes its directory.
+            self.pool.forget(container_id)
+
+    def _on_pooled_job_exit(self, job_id: str, exit_code: int) -> None:
+        """Warm pool callback for a job finished by a container that stays alive for reuse."""
+        self._apply_container_state(job_id, "exited", exit_code)
+
+    def _apply_container_state(self, job_id: str, container_status: str, exit_code: Optional[int]) -> str:
+        """Map a Docker container state onto the job record, persisting only if something changed."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not job:
+                return "not_found"
+            previous = job["status"]
+            if job["status"] == "cancelled":
+                return job["status"]
+            if job["status"] in FINISHED_STATUSES and container_status != "exited":
+                # A reused pool container keeps running after its job is done.
+                return job["status"]
+            # A job the watchdog signalled ends as timed_out however its container stops.
+            finished = "timed_out" if job.get("timeout") else "complete"
+            if container_status == "exited":
+                updates = {"status": finished, "exit_code": exit_code}
+                if not job["completed"]:
+                    updates["completed"] = time.time()
+            elif container_status == REMOVED:
+                if job["status"] in FINISHED_STATUSES:
+                    return job["status"]
+                if job.get("timeout"):
+                    updates = {"status": "timed_out", "completed": job["completed"] or time.time()}
+                else:
+                    updates = {"status": "not_found", "error": "Container not found."}
+            else:
+                updates = {"status": container_status, "exit_code": None}
+            if any(job.get(key) != value for key, value in updates.items()):
+                job.update(updates)
+                self._save_job(job_id)
+            status = job["status"]
+            just_completed = status in FINISHED_STATUSES and previous not in FINISHED_STATUSES
+            output_path = job["output_path"]
+            pooled = job.get("start_mode") == "pooled"
+            # Pooled containers share their slot directory with the host; nothing to collect.
+            handle = job.get("container_id") if not pooled else None
+            duration = job["completed"] - job["started"] if just_completed and job.get("started") else None
+        if duration is not None:
+            JOB_DURATION_SECONDS.observe(duration, exit_code="unknown" if exit_code is None else exit_code)
+        if pooled and status in TERMINAL_STATUSES and previous not in TERMINAL_STATUSES:
+            output_path = self._take_pooled_output(job_id)
+        if just_completed:
+            if handle:
+                try:
+                    self.backend.collect_artifacts(handle, output_path)
+                except Exception as e:
+                    logging.error(f"Failed to collect artifacts of job {job_id}: {e}")
+                with self.lock:
+                    self.collected[job_id] = handle
+                self._remove_finished_container(job_id)
+            self._record_agent_timing(job_id)
+            self.packager.submit(job_id, output_path, self._on_artifact_built)
+        if status in TERMINAL_STATUSES:
+            self.scheduler.release(job_id)
+            self._stop_shared_log_pump(job_id)
+            self._record_peak_usage(job_id)
+        return status
+
+    def _remove_finished_container(self, job_id: str) -> None:
+        """Remove a finished job's container once its artifacts are collected and its log pump has drained.
+
+        Called after collection and again when the pump drains; whichever comes last removes it.
+        """
+        with self.lock:
+            pump = self.log_pumps.get(job_id)
+            if job_id not in self.collected or (pump and not pump.drained):
+                return
+            handle = self.collected.pop(job_id)
+        try:
+            self.backend.remove(handle)
+        except Exception as e:
+            logging.warning(f"Failed to remove container of finished job {job_id}: {e}")
+            return
+        CONTAINERS_REMOVED.inc()
+        with self.lock:
+            self.container_jobs.pop(handle, None)
+        self.watcher.forget(handle)
+
+    def _take_pooled_output(self, job_id: str) -> str:
+        """Move a pooled job's workspace out of its warm-pool slot into the job's own output directory.
+
+        The slot is mounted into a container that may run later jobs, which must not see this one's
+        files. Returns the job's output path after the move.
+        """
+        self._stop_shared_log_pump(job_id)
+        with self.lock:
+            job = self.jobs[job_id]
+            source = job["output_path"]
+        dest = os.path.join(OUTPUT_DIR, job_id)
+        if source == dest or not os.path.isdir(source):
+            return source
+        try:
+            os.replace(source, dest)  # the pool lives under OUTPUT_DIR, so this is a rename
+        except OSError as e:
+            logging.error(f"Failed to move workspace of pooled job {job_id} out of its slot: {e}")
+            return source
+        with self.lock:
+            job.update({"output_path": dest, "logs_path": os.path.join(dest, LOGS_SUBDIR)})
+            self._save_job(job_id)
+        return dest
+
+    def _record_agent_timing(self, job_id: str) -> None:
+        """Copy the entrypoint's first-output timestamp and phase markers into the job record."""
+        with self.lock:
+            job = self.jobs[job_id]
+            output_path = job["output_path"]
+            created, dispatched, exited = job["created"], job.get("dispatched"), job.get("completed")
+        first_output = None
+        try:
+            with open(os.path.join(output_path, FIRST_OUTPUT_FILE), "r", encoding="utf-8") as f:
+                first_output = float(f.read().strip())
+        except (OSError, ValueError):
+            pass
+        markers = read_markers(os.path.join(output_path, PHASES_FILE))
+        timeline = build_timeline(markers, created, dispatched, exited) if markers or dispatched else []
+        for phase in timeline:
+            JOB_PHASE_SECONDS.observe(phase["seconds"], phase=phase["phase"])
+        if first_output is None and not timeline:
+            return
+        with self.lock:
+            if first_output is not None:
+                self.jobs[job_id]["first_output"] = first_output
+            if timeline:
+                self.jobs[job_id]["phases"] = timeline
+            self._save_job(job_id)
+
+    def get_timeline(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job's phase spans, from queueing through packaging, or None for an unknown job."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not job:
+                return None
+            finished = job.get("completed") or job.get("cancelled")
+            return {
+                "job_id": job_id,
+                "status": job["status"],
+                "wall_seconds": round(finished - job["created"], 6) if finished else None,
+                "phases": list(job.get("phases", [])),
+            }
+
+    def phase_report(self) -> Dict[str, Any]:
+        """Duration percentiles of each phase across finished jobs, and the phase taking the most time."""
+        with self.lock:
+            timelines = [job["phases"] for job in self.jobs.values() if job.get("phases")]
+        return phase_percentiles(timelines)
+
+    def start_latency_stats(self) -> Dict[str, Any]:
+        """Time from dispatch to first agent output, summarised separately for pooled and cold starts."""
+        samples: Dict[str, List[float]] = {"pooled": [], "cold": []}
+        with self.lock:
+            for job in self.jobs.values():
+                if job.get("first_output") and job.get("dispatched") and job.get("start_mode") in samples:
+                    samples[job["start_mode"]].append(job["first_output"] - job["dispatched"])
+        stats = {}
+        for mode, values in samples.items():
+            values.sort()
+            stats[mode] = {
+                "jobs": len(values),
+                "p50_seconds": statistics.median(values) if values else None,
+                "p95_seconds": values[min(len(values) - 1, int(len(values) * 0.95))] if values else None,
+            }
+        return stats
 
     def get_status(self, job_id: str) -> str:
-        """Get the status of a job."""
+        """Get the status of a job.
+
+        While the status watcher is healthy the answer comes from the job record, which the watcher
+        keeps current, so no backend call is made. Otherwise the container is inspected directly.
+        """
         with self.lock:
             job = self.jobs.get(job_id)
+            status = job.get("status") if job else None
         if not job:
             return "not_found"
-        if job.get("status") == "error":
-            return "error"
-        try:
-            container = self.docker_client.containers.get(job["container_id"])
-            container.reload()
-            exit_code = None
-            if container.status == "exited":
-                status = "complete"
-                exit_code = container.attrs.get("State", {}).get("ExitCode")
-                completed_time = time.time()
-            elif container.status == "running":
-                status = "running"
-                completed_time = None
-            else:
-                status = container.status
-                completed_time = None
-            with self.lock:
-                self.jobs[job_id]["status"] = status
-                self.jobs[job_id]["exit_code"] = exit_code
-                if completed_time and not self.jobs[job_id]["completed"]:
-                    self.jobs[job_id]["completed"] = completed_time
-                self._save_jobs()
+        if status in ("pending", "error", "cancelled") or self.watcher.healthy:
             return status
-        except docker.errors.NotFound:
-            with self.lock:
-                self.jobs[job_id]["status"] = "not_found"
-                self.jobs[job_id]["error"] = "Container not found."
-                self._save_jobs()
-            logging.warning(f"Container not found for job {job_id}")
-            return "not_found"
+        try:
+            container_status, exit_code = self.backend.inspect(job["container_id"])
+            if container_status == REMOVED:
+                logging.warning(f"Container not found for job {job_id}")
+            return self._apply_container_state(job_id, container_status, exit_code)
         except Exception as e:
             with self.lock:
                 self.jobs[job_id]["status"] = "error"
                 self.jobs[job_id]["error"] = str(e)
-                self._save_jobs()
+                self._save_job(job_id)
+            self.scheduler.release(job_id)
             logging.error(f"Error getting status for job {job_id}: {e}")
             return "error"
 
-    def get_output(self, job_id: str) -> Optional[str]:
-        """Get the output zip file for a completed job."""
+    def _on_artifact_built(self, job_id: str, artifact_path: str) -> None:
+        """Packager callback: remember where a job's archive lives, then deduplicate the workspace."""
         with self.lock:
             job = self.jobs.get(job_id)
-        if not job:
+            if not job:
+                return
+            job["artifact"] = artifact_path
+            if job.get("phases") and job.get("completed"):
+                packaging = span("packaging", job["completed"], max(job["completed"], time.time()))
+                job["phases"] = job["phases"] + [packaging]
+                JOB_PHASE_SECONDS.observe(packaging["seconds"], phase="packaging")
+            self._save_job(job_id)
+            output_path = job["output_path"]
+            self._cache_result(job_id, job)
+        if self.blobs and os.path.isdir(output_path):
+            # After packaging, so the archive is never built from half-relinked files. Logs are
+            # excluded: a log pump may still hold them open.
+            try:
+                self.blobs.ingest(job_id, output_path, exclude=[LOGS_SUBDIR])
+            except Exception as e:
+                logging.error(f"Failed to deduplicate workspace of job {job_id}: {e}")
+
+    def storage_report(self) -> Dict[str, Any]:
+        """Blob store dedup statistics."""
+        if not self.blobs:
+            return {"enabled": False}
+        return {"enabled": True, **self.blobs.report()}
+
+    def get_output(self, job_id: str, build: bool = True) -> Optional[str]:
+        """Get the output zip file for a completed job.
+
+        Archives are normally built in the background as soon as a job completes. With `build`, a
+        caller that arrives first waits for that build (or starts it) instead of returning None.
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not job or job.get("status") not in FINISHED_STATUSES:
+                return None
+            artifact, output_dir = job.get("artifact"), job["output_path"]
+        if artifact and os.path.exists(artifact):
+            return artifact
+        if not build or not os.path.exists(output_dir):
+            return None
+        try:
+            return self.packager.submit(job_id, output_dir, self._on_artifact_built).result()
+        except Exception as e:
+            logging.error(f"Error packaging output for job {job_id}: {e}")
+            return None
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Copy of a job record, taken under the lock."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list_jobs(
+        self,
+        statuses: Optional[Sequence[str]] = None,
+        created_from: Optional[float] = None,
+        created_to: Optional[float] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """One page of jobs, newest first, read from the store's (status, created) index.
+
+        Every status change is persisted, so the store is as current as `self.jobs` and no lock is
+        needed. `fields` projects each job onto those record keys (job_id is always included).
+        Raises ValueError for a malformed cursor.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        rows = self.store.query(statuses, created_from, created_to, after, limit + 1)
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last_id, last_job = page[-1]
+            next_cursor = encode_cursor((last_job.get("created") or 0.0, last_id))
+        fields = fields or LIST_FIELDS
+        return {
+            "jobs": [{"job_id": job_id, **{field: job.get(field) for field in fields}} for job_id, job in page],
+            "next_cursor": next_cursor,
+        }
+
+    def get_output_dir(self, job_id: str) -> Optional[str]:
+        """Workspace directory of a completed job, for streaming a zip on the fly."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not job or job.get("status") not in FINISHED_STATUSES:
+                return None
+            output_dir = job["output_path"]
+        return output_dir if os.path.exists(output_dir) else None
+
+    def _start_log_pump(self, job_id: str, container_id: str, logs_path: str, since: Optional[float] = None) -> None:
+        """Start copying a container's stdout/stderr into the job's rotated log files.
+
+        `since` is set for warm-pool containers, which are shared across jobs: only output written
+        after the job was dispatched is copied.
+        """
+        try:
+            container = self.backend.log_source(container_id)
+        except Exception as e:
+            logging.warning(f"No log pump for job {job_id}: {e}")
+            return
+        on_drained = (lambda: self._remove_finished_container(job_id)) if since is None else None
+        pump = LogPump(container, logs_path, config.LOG_MAX_BYTES, config.LOG_BACKUP_COUNT, since, on_drained)
+        with self.lock:
+            # Drained pumps of finished jobs are no longer needed to tell readers more output may come.
+            for done_id in [jid for jid, p in self.log_pumps.items() if p.drained]:
+                if self.jobs.get(done_id, {}).get("status") in TERMINAL_STATUSES:
+                    del self.log_pumps[done_id]
+            # Registered before it starts, so the container is not removed while the pump still reads it.
+            self.log_pumps[job_id] = pump
+        pump.start()
+
+    def _stop_shared_log_pump(self, job_id: str) -> None:
+        """Stop following a finished job's pooled container, which keeps running for the next job."""
+        with self.lock:
+            pump = self.log_pumps.get(job_id)
+        if pump and pump.since is not None:
+            pump.stop()
+
+    def get_logs(self, job_id: str, log_type: str = "stdout", lines: int = config.LOG_TAIL_LINES) -> Optional[str]:
+        """Get the last `lines` lines of a job's log, read backwards from EOF with bounded memory."""
+        log_file = self.get_log_file(job_id, log_type)
+        if not log_file:
+            return None
+        return tail_log(log_file, lines)
+
+    def read_log(self, job_id: str, log_type: str, offset: int, max_bytes: int = 65536) -> Optional[Tuple[bytes, int, bool]]:
+        """Read log bytes from an absolute offset for streaming.
+
+        Returns (data, next offset, finished), where finished means the job has stopped and its log
+        pump has drained, so no more output will appear. None if the job or log is unknown.
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            pump = self.log_pumps.get(job_id)
+        if not job or log_type not in LOG_TYPES:
             return None
-        output_dir = job["output_path"]
-        zip_path = os.path.join(output_dir, "output.zip")
-        if job.get("status") == "complete" and os.path.exists(output_dir):
-            if not os.path.exists(zip_path):
-                base_name = os.path.splitext(zip_path)[0]
-                shutil.make_archive(base_name, 'zip', output_dir)
-            if os.path.exists(zip_path):
-                return zip_path
-        return None
-
-    def get_logs(self, job_id: str) -> Optional[str]:
-        """Get the last 1000 lines of stdout logs for a job."""
-        return self.get_full_log(job_id, "stdout")
+        log_file = os.path.join(job["logs_path"], f"{log_type}.log")
+        data, next_offset = read_from_offset(log_file, offset, max_bytes) if os.path.exists(log_file) else (b"", offset)
+        finished = job["status"] not in ("pending", "running") and not (pump and not pump.drained)
+        return data, next_offset, finished and not data
 
     def get_log_file(self, job_id: str, log_type: str = "stdout") -> Optional[str]:
         """Return the path to the log file (stdout or stderr) for the job, if available."""
@@ -192,45 +1123,93 @@ class JobManager:
             return f"Error reading log file: {e}"
 
     def cancel_job(self, job_id: str) -> bool:
-        """Cancel a running job by removing its container."""
+        """Cancel a job: drop it from the pending queue, or remove its container if running."""
+        if self.scheduler.remove(job_id):
+            with self.lock:
+                self.jobs[job_id]["status"] = "cancelled"
+                self.jobs[job_id]["cancelled"] = time.time()
+                self._save_job(job_id)
+            self._record_peak_usage(job_id)
+            logging.info(f"Cancelled pending job {job_id}")
+            return True
         with self.lock:
             job = self.jobs.get(job_id)
         if not job or not job.get("container_id"):
             return False
         try:
-            container = self.docker_client.containers.get(job["container_id"])
-            container.remove(force=True)
+            self.backend.cancel(job["container_id"])
             with self.lock:
                 self.jobs[job_id]["status"] = "cancelled"
                 self.jobs[job_id]["cancelled"] = time.time()
-                self._save_jobs()
+                self._save_job(job_id)
+            self.scheduler.release(job_id)
+            self._record_peak_usage(job_id)
             logging.info(f"Cancelled job {job_id}")
             return True
         except Exception as e:
             logging.error(f"Failed to cancel job {job_id}: {e}")
             return False
 
-    def cleanup_jobs(self) -> None:
-        """Clean up old jobs and containers based on retention policy."""
-        with self.lock:
-            to_remove = []
-            for job_id, job in self.jobs.items():
-                if job.get("container_id") and job.get("status") in ("complete", "error", "exited", "cancelled"):
-                    try:
-                        container = self.docker_client.containers.get(job["container_id"])
-                        container.remove(force=True)
-                    except Exception:
-                        pass
-                if os.path.exists(job["output_path"]):
-                    try:
-                        mtime = os.path.getmtime(job["output_path"])
-                        if time.time() - mtime > RETENTION_DAYS * 24 * 3600:
-                            shutil.rmtree(job["output_path"])
-                            to_remove.append(job_id)
-                    except Exception:
-                        pass
-            for job_id in to_remove:
+    def cleanup_jobs(self) -> int:
+        """Reap every job whose retention has already expired, synchronously. Returns how many were due."""
+        return self.reaper.run_once()
+
+    def _delete_job_files(self, job_id: str, output_path: str) -> int:
+        """Delete a job's workspace, archive and blobs. Returns the bytes actually freed on disk."""
+        freed = 0
+        if os.path.exists(output_path):
+            for root, _, files in os.walk(output_path):
+                for name in files:
+                    st = os.lstat(os.path.join(root, name))
+                    if st.st_nlink == 1:  # files linked to a blob are freed, if at all, by blobs.release
+                        freed += st.st_size
+            shutil.rmtree(output_path)
+        artifact = self.packager.artifact_path(job_id)
+        if os.path.exists(artifact):
+            freed += os.path.getsize(artifact)
+            self.packager.remove(job_id)
+        if self.blobs:
+            freed += self.blobs.release(job_id)
+        return freed
+
+    def _reap_jobs(self, job_ids: List[str]) -> Dict[str, int]:
+        """Reaper callback: delete the files and records of a batch of expired jobs.
+
+        Containers are already gone: they are removed when their job finishes. The lock is only held
+        to pick the records and to drop them; disk cleanup runs without it.
+        """
+        now = time.time()
+        with self.lock:
+            due = [
+                (job_id, dict(self.jobs[job_id]))
+                for job_id in job_ids
+                if job_id in self.jobs
+                and self.jobs[job_id]["status"] in TERMINAL_STATUSES
+                and self._expires_at(self.jobs[job_id]) <= now
+            ]
+        counts = {"jobs_reaped": 0, "bytes_freed": 0, "errors": 0}
+        for job_id, job in due:
+            try:
+                counts["bytes_freed"] += self._delete_job_files(job_id, job["output_path"])
+            except Exception as e:
+                counts["errors"] += 1
+                logging.warning(f"Failed to remove files of expired job {job_id}: {e}")
+        reaped = [job_id for job_id, _ in due]
+        with self.lock:
+            for job_id, job in due:
                 self.jobs.pop(job_id, None)
-            self._save_jobs()
+                self.published.pop(job_id, None)
+                self.log_pumps.pop(job_id, None)
+                if job.get("container_id") and job.get("start_mode") != "pooled":
+                    self.container_jobs.pop(job["container_id"], None)
+                    self.watcher.forget(job["container_id"])
+                if self.cache:
+                    self.cache.forget_job(job_id)
+        if reaped:
+            with JOB_STORE_WRITE_SECONDS.time(op="delete"):
+                self.store.delete_many(reaped)
+            logging.info(f"Reaped {len(reaped)} expired jobs")
+        counts["jobs_reaped"] = len(reaped)
+        return counts
 
 job_manager = JobManager() 
\ No newline at end of file
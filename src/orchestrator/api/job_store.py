@@ -0,0 +1,294 @@
+import base64
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from src.orchestrator.utils import load_json
+
+logging.basicConfig(level=logging.INFO)
+
+PageKey = Tuple[float, str]  # (created, job_id): listing order, newest first
+
+
+def encode_cursor(key: PageKey) -> str:
+    """Opaque pagination cursor for the last job on a page."""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> PageKey:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce."""
+    try:
+        created, job_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return float(created), str(job_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class JobStore(ABC):
+    """Persistence interface for job records, keyed by job_id."""
+
+    @abstractmethod
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        """Return every stored job."""
+
+    def upsert(self, job_id: str, job: Dict[str, Any]) -> None:
+        """Insert or replace a single job record."""
+        self.upsert_many({job_id: job})
+
+    @abstractmethod
+    def upsert_many(self, jobs: Dict[str, Dict[str, Any]]) -> None:
+        """Insert or replace several job records in one write."""
+
+    def delete(self, job_id: str) -> None:
+        """Remove a single job record."""
+        self.delete_many([job_id])
+
+    @abstractmethod
+    def delete_many(self, job_ids: Iterable[str]) -> None:
+        """Remove several job records in one write."""
+
+    def count(self) -> int:
+        """Return the number of stored jobs."""
+        return len(self.load_all())
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Return {status: number of jobs}."""
+        counts: Dict[str, int] = {}
+        for job in self.load_all().values():
+            counts[job.get("status")] = counts.get(job.get("status"), 0) + 1
+        return counts
+
+    def query(
+        self,
+        statuses: Optional[Sequence[str]] = None,
+        created_from: Optional[float] = None,
+        created_to: Optional[float] = None,
+        after: Optional[PageKey] = None,
+        limit: int = 100,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Jobs newest first (by created, then job_id), filtered, starting after the `after` key.
+
+        This default scans every record; stores with an index override it.
+        """
+        rows = []
+        for job_id, job in self.load_all().items():
+            key = (job.get("created") or 0.0, job_id)
+            if statuses and job.get("status") not in statuses:
+                continue
+            if created_from is not None and key[0] < created_from:
+                continue
+            if created_to is not None and key[0] >= created_to:
+                continue
+            if after is not None and key >= after:
+                continue
+            rows.append((key, job_id, job))
+        rows.sort(key=lambda row: row[0], reverse=True)
+        return [(job_id, job) for _, job_id, job in rows[:limit]]
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class JsonJobStore(JobStore):
+    """Legacy store: the whole job dict is atomically rewritten to one JSON file on every change."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock = Lock()
+        jobs = load_json(path)
+        self.jobs: Dict[str, Dict[str, Any]] = jobs if jobs is not None else {}
+
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            return {job_id: dict(job) for job_id, job in self.jobs.items()}
+
+    def upsert_many(self, jobs: Dict[str, Dict[str, Any]]) -> None:
+        with self.lock:
+            for job_id, job in jobs.items():
+                self.jobs[job_id] = dict(job)
+            self._flush()
+
+    def delete_many(self, job_ids: Iterable[str]) -> None:
+        with self.lock:
+            for job_id in job_ids:
+                self.jobs.pop(job_id, None)
+            self._flush()
+
+    def count(self) -> int:
+        with self.lock:
+            return len(self.jobs)
+
+    def _flush(self) -> None:
+        """Atomically save jobs to disk. Caller must hold self.lock."""
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix="jobs_", suffix=".json")
+        try:
+            with os.fdopen(tmp_fd, 'w', encoding='utf-8') as f:
+                json.dump(self.jobs, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            logging.error(f"Failed to save jobs: {e}")
+            raise e
+
+
+# Schema version N is reached by running migration N-1; SQLite's `user_version` records the current
+# version. Databases created before versioning report 0, and migration 1 is a no-op for them.
+SCHEMA_MIGRATIONS: List[List[str]] = [
+    [
+        "CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, status TEXT, created REAL, data TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created)",
+    ],
+    # Keyset pagination: (status, created, job_id) serves filtered pages, (created, job_id) unfiltered
+    # ones; both match the listing order, so a page never sorts or scans past `limit` rows.
+    [
+        "DROP INDEX IF EXISTS idx_jobs_status",
+        "DROP INDEX IF EXISTS idx_jobs_created",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created, job_id)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_created_id ON jobs(created, job_id)",
+    ],
+]
+
+
+class SqliteJobStore(JobStore):
+    """SQLite store in WAL mode: one row per job, so a write costs the same regardless of history size."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock = Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """Apply the SCHEMA_MIGRATIONS newer than the database's `user_version`, each in one transaction."""
+        with self.lock:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            for number, statements in enumerate(SCHEMA_MIGRATIONS[version:], start=version + 1):
+                with self._transaction():
+                    for statement in statements:
+                        self.conn.execute(statement)
+                    self.conn.execute(f"PRAGMA user_version = {number}")
+                logging.info(f"Migrated job store {self.path} to schema version {number}")
+
+    def load_all(self) -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            rows = self.conn.execute("SELECT job_id, data FROM jobs").fetchall()
+        return {job_id: json.loads(data) for job_id, data in rows}
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a single job record, or None."""
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def upsert_many(self, jobs: Dict[str, Dict[str, Any]]) -> None:
+        rows = [
+            (job_id, job.get("status"), job.get("created"), json.dumps(job, ensure_ascii=False))
+            for job_id, job in jobs.items()
+        ]
+        with self.lock:
+            with self._transaction():
+                self.conn.executemany(
+                    "INSERT INTO jobs (job_id, status, created, data) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(job_id) DO UPDATE SET "
+                    "status = excluded.status, created = excluded.created, data = excluded.data",
+                    rows,
+                )
+
+    def delete_many(self, job_ids: Iterable[str]) -> None:
+        rows = [(job_id,) for job_id in job_ids]
+        with self.lock:
+            with self._transaction():
+                self.conn.executemany("DELETE FROM jobs WHERE job_id = ?", rows)
+
+    def count(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def count_by_status(self) -> Dict[str, int]:
+        with self.lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def query(
+        self,
+        statuses: Optional[Sequence[str]] = None,
+        created_from: Optional[float] = None,
+        created_to: Optional[float] = None,
+        after: Optional[PageKey] = None,
+        limit: int = 100,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if statuses:
+            clauses.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(statuses)
+        if created_from is not None:
+            clauses.append("created >= ?")
+            params.append(created_from)
+        if created_to is not None:
+            clauses.append("created < ?")
+            params.append(created_to)
+        if after is not None:
+            clauses.append("(created < ? OR (created = ? AND job_id < ?))")
+            params.extend([after[0], after[0], after[1]])
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        sql = f"SELECT job_id, data FROM jobs {where}ORDER BY created DESC, job_id DESC LIMIT ?"
+        with self.lock:
+            rows = self.conn.execute(sql, params + [limit]).fetchall()
+        return [(job_id, json.loads(data)) for job_id, data in rows]
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self.conn)
+
+
+class _Transaction:
+    """Explicit BEGIN/COMMIT for an autocommit sqlite3 connection."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+
+
+def import_json_jobs(json_path: str, store: JobStore) -> int:
+    """One-shot import of a legacy jobs.json into `store`; the file is renamed so it is not imported twice."""
+    jobs = load_json(json_path)
+    if not jobs:
+        return 0
+    store.upsert_many(jobs)
+    os.replace(json_path, json_path + ".imported")
+    logging.info(f"Imported {len(jobs)} jobs from {json_path}")
+    return len(jobs)
+
+
+def create_job_store(backend: str, output_dir: str) -> JobStore:
+    """Build the configured job store backend ("sqlite" or "json") inside `output_dir`."""
+    json_path = os.path.join(output_dir, "jobs.json")
+    if backend == "json":
+        return JsonJobStore(json_path)
+    if backend == "sqlite":
+        store = SqliteJobStore(os.path.join(output_dir, "jobs.db"))
+        if store.count() == 0 and os.path.exists(json_path):
+            import_json_jobs(json_path, store)
+        return store
+    raise ValueError(f"Unknown job store backend: {backend}")
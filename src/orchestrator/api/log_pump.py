@@ -0,0 +1,221 @@
+import logging
+import os
+import time
+from functools import partial
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from src.orchestrator.utils import tail_lines
+
+logging.basicConfig(level=logging.INFO)
+
+LOG_TYPES = ("stdout", "stderr")
+
+
+class RotatingLogWriter:
+    """Append-only log file rotated by size into `<path>.1 .. <path>.N` (newest first).
+
+    Offsets handed to readers are absolute byte positions in the whole stream. The start offset of
+    the live file is kept in `<path>.base`, so the position of every surviving segment can be
+    recovered from file sizes alone.
+    """
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        for old in [f"{path}.{i}" for i in range(1, backup_count + 1)] + [f"{path}.base"]:
+            if os.path.exists(old):
+                os.remove(old)
+        self.f = open(path, "wb")
+        self.size = 0
+        self.base = 0
+
+    def write(self, data: bytes) -> None:
+        if self.size and self.size + len(data) > self.max_bytes:
+            self._rotate()
+        self.f.write(data)
+        self.f.flush()
+        self.size += len(data)
+
+    def close(self) -> None:
+        self.f.close()
+
+    def _rotate(self) -> None:
+        self.f.close()
+        if self.backup_count > 0:
+            oldest = f"{self.path}.{self.backup_count}"
+            if os.path.exists(oldest):
+                os.remove(oldest)
+            for i in range(self.backup_count - 1, 0, -1):
+                if os.path.exists(f"{self.path}.{i}"):
+                    os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self.base += self.size
+        with open(f"{self.path}.base", "w", encoding="utf-8") as f:
+            f.write(str(self.base))
+        self.f = open(self.path, "wb")
+        self.size = 0
+
+
+def log_segments(path: str) -> List[Tuple[str, int]]:
+    """Return the (file, start offset) pairs that make up a rotated log, oldest first."""
+    base = 0
+    if os.path.exists(f"{path}.base"):
+        with open(f"{path}.base", "r", encoding="utf-8") as f:
+            base = int(f.read().strip() or 0)
+    segments = [(path, base)]
+    start, i = base, 1
+    while os.path.exists(f"{path}.{i}"):
+        start -= os.path.getsize(f"{path}.{i}")
+        segments.insert(0, (f"{path}.{i}", start))
+        i += 1
+    return segments
+
+
+def read_from_offset(path: str, offset: int, max_bytes: int) -> Tuple[bytes, int]:
+    """Read up to `max_bytes` starting at absolute `offset`. Returns (data, next offset).
+
+    An offset that points into data already rotated away resumes at the oldest surviving byte.
+    """
+    segments = log_segments(path)
+    offset = max(offset, segments[0][1])
+    for segment, start in segments:
+        size = os.path.getsize(segment) if os.path.exists(segment) else 0
+        if start <= offset < start + size:
+            with open(segment, "rb") as f:
+                f.seek(offset - start)
+                data = f.read(max_bytes)
+            return data, offset + len(data)
+    return b"", offset
+
+
+def tail_log(path: str, n: int) -> str:
+    """Last `n` lines of a rotated log, reading backwards from EOF through as many segments as needed."""
+    lines: List[str] = []
+    for segment, _ in reversed(log_segments(path)):
+        if len(lines) >= n or not os.path.exists(segment):
+            break
+        lines = tail_lines(segment, n - len(lines)) + lines
+    return "\n".join(lines)
+
+
+class LogPump:
+    """Copies one container's output into size-rotated `stdout.log` / `stderr.log` files.
+
+    A single `attach(logs=True, stream=True, demux=True)` call replays everything the container has
+    written so far and then follows it, yielding (stdout, stderr) chunk pairs until it exits.
+
+    A warm-pool container outlives the job it runs and may already hold a previous job's output, so
+    with `since` each stream is instead followed through `logs(since=..., follow=True)` from the
+    dispatch time, and the pump runs until `stop()` is called.
+
+    `on_drained` is called once every stream has ended, i.e. all output has been written to disk.
+    """
+
+    def __init__(
+        self,
+        container: Any,
+        logs_path: str,
+        max_bytes: int,
+        backup_count: int,
+        since: Optional[float] = None,
+        on_drained: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.container = container
+        self.logs_path = logs_path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.since = since
+        self.on_drained = on_drained
+        self.bytes_written = {log_type: 0 for log_type in LOG_TYPES}
+        self.last_output: Optional[float] = None  # when the container last wrote anything
+        self._threads: List[Thread] = []
+        self._streams: List[Any] = []
+        self._stopped = Event()
+        self._lock = Lock()
+        self._running = 0
+        self._drained = Event()
+
+    @property
+    def alive(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    @property
+    def drained(self) -> bool:
+        """True once every stream has ended and its output is on disk."""
+        return self._drained.is_set()
+
+    def start(self) -> None:
+        os.makedirs(self.logs_path, exist_ok=True)
+        writers = {
+            log_type: RotatingLogWriter(
+                os.path.join(self.logs_path, f"{log_type}.log"), self.max_bytes, self.backup_count
+            )
+            for log_type in LOG_TYPES
+        }
+        if self.since is None:
+            targets = [(self._attach, writers)]
+        else:
+            targets = [(partial(self._follow, log_type), {log_type: writers[log_type]}) for log_type in LOG_TYPES]
+        self._threads = [
+            Thread(target=self._run, args=target, name=f"log-pump-{self.container.id[:12]}", daemon=True)
+            for target in targets
+        ]
+        self._running = len(self._threads)
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Stop following output; used for containers that keep running after their job ends."""
+        self._stopped.set()
+        for stream in list(self._streams):
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait until the pump has drained."""
+        self._drained.wait(timeout)
+
+    def _attach(self) -> Iterator[Tuple[Optional[bytes], Optional[bytes]]]:
+        return self.container.attach(stdout=True, stderr=True, stream=True, logs=True, demux=True)
+
+    def _follow(self, log_type: str) -> Iterator[Tuple[Optional[bytes], Optional[bytes]]]:
+        stream = self.container.logs(
+            stdout=log_type == "stdout", stderr=log_type == "stderr", stream=True, follow=True, since=self.since
+        )
+        self._streams.append(stream)
+        for chunk in stream:
+            yield (chunk, None) if log_type == "stdout" else (None, chunk)
+
+    def _run(
+        self,
+        open_stream: Callable[[], Iterator[Tuple[Optional[bytes], Optional[bytes]]]],
+        writers: Dict[str, RotatingLogWriter],
+    ) -> None:
+        try:
+            for stdout, stderr in open_stream():
+                if self._stopped.is_set():
+                    break
+                for log_type, chunk in (("stdout", stdout), ("stderr", stderr)):
+                    if chunk:
+                        writers[log_type].write(chunk)
+                        self.bytes_written[log_type] += len(chunk)
+                        self.last_output = time.time()
+        except Exception as e:
+            if not self._stopped.is_set():
+                logging.warning(f"Log pump for container {self.container.id[:12]} stopped: {e}")
+        finally:
+            for writer in writers.values():
+                writer.close()
+            with self._lock:
+                self._running -= 1
+                last = self._running == 0
+            if last:
+                self._drained.set()
+            if last and self.on_drained:
+                try:
+                    self.on_drained()
+                except Exception as e:
+                    logging.error(f"Log pump drain callback failed for container {self.container.id[:12]}: {e}")
@@ -0,0 +1,241 @@
+"""Minimal in-process metrics with Prometheus text exposition, cheap enough to leave on.
+
+Each observation is a bisect plus a few additions under a per-metric lock; label sets are kept
+small (route templates, Docker operation names, exit codes), so memory stays bounded.
+"""
+import bisect
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+JOB_DURATION_BUCKETS = (10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0, 7200.0)
+PHASE_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Histogram:
+    def __init__(
+        self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.lock = Lock()
+        # label values -> [per-bucket counts (last one is +Inf), sum, count]
+        self.series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall time of the block, including when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self, **labels: str) -> Tuple[int, float]:
+        """(count, sum) for one label set; mostly for tests."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self.lock:
+            series = self.series.get(key)
+            return (series[2], series[1]) if series else (0, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            series = [(key, list(counts), total, count) for key, (counts, total, count) in sorted(self.series.items())]
+        for key, counts, total, count in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                labels = _format_labels(self.labelnames, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Counter:
+    """Monotonic count, incremented by the code doing the work."""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.lock = Lock()
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self.lock:
+            return self.values.get(key, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            values = sorted(self.values.items())
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose values are read from `collect` at scrape time: {label values: value}."""
+
+    def __init__(
+        self, name: str, help_text: str, labelnames: Sequence[str], collect: Callable[[], Dict[LabelValues, float]]
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        for key, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        """Add a metric; registering a name again replaces it (e.g. a gauge rebound to a new manager)."""
+        with self.lock:
+            self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self.lock:
+            metrics = list(self.metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class TimedLock:
+    """threading.Lock that records how long each acquire waited in `histogram`."""
+
+    def __init__(self, histogram: Histogram, name: str) -> None:
+        self._lock = Lock()
+        self.histogram = histogram
+        self.name = name
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if self._lock.acquire(False):
+            self.histogram.observe(0.0, lock=self.name)
+            return True
+        if not blocking:
+            return False
+        start = time.perf_counter()
+        acquired = self._lock.acquire(True, timeout)
+        self.histogram.observe(time.perf_counter() - start, lock=self.name)
+        return acquired
+
+    def release(self) -> None:
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+REGISTRY = Registry()
+DOCKER_CALL_SECONDS = REGISTRY.register(
+    Histogram("orchestrator_docker_call_seconds", "Latency of Docker API calls.", ["op"])
+)
+KUBE_CALL_SECONDS = REGISTRY.register(
+    Histogram("orchestrator_kube_call_seconds", "Latency of Kubernetes API calls.", ["op"])
+)
+JOB_STORE_WRITE_SECONDS = REGISTRY.register(
+    Histogram("orchestrator_job_store_write_seconds", "Latency of job store writes.", ["op"])
+)
+ARCHIVE_BUILD_SECONDS = REGISTRY.register(
+    Histogram("orchestrator_archive_build_seconds", "Time to package a job workspace into a zip.")
+)
+HTTP_REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "orchestrator_http_request_seconds",
+        "HTTP request latency by route template (time to response headers).",
+        ["method", "route", "status"],
+    )
+)
+LOCK_WAIT_SECONDS = REGISTRY.register(
+    Histogram("orchestrator_lock_wait_seconds", "Time spent waiting to acquire a lock.", ["lock"])
+)
+JOB_DURATION_SECONDS = REGISTRY.register(
+    Histogram(
+        "orchestrator_job_duration_seconds",
+        "Wall time of finished jobs, from container start to exit.",
+        ["exit_code"],
+        buckets=JOB_DURATION_BUCKETS,
+    )
+)
+JOB_PHASE_SECONDS = REGISTRY.register(
+    Histogram(
+        "orchestrator_job_phase_seconds",
+        "Time finished jobs spent in each phase (container boot, time to first output, agent work, archive, ...).",
+        ["phase"],
+        buckets=PHASE_BUCKETS,
+    )
+)
+CONTAINERS_REMOVED = REGISTRY.register(
+    Counter("orchestrator_containers_removed_total", "Containers of finished jobs removed once their logs drained.")
+)
+REAPED_JOBS = REGISTRY.register(
+    Counter("orchestrator_reaper_jobs_total", "Expired jobs deleted by the retention reaper.")
+)
+REAPER_FREED_BYTES = REGISTRY.register(
+    Counter("orchestrator_reaper_freed_bytes_total", "Disk space freed by the retention reaper.")
+)
+REAPER_ERRORS = REGISTRY.register(
+    Counter("orchestrator_reaper_errors_total", "Errors while deleting expired jobs.")
+)
+WORKSPACE_SEED_SECONDS = REGISTRY.register(
+    Histogram("orchestrator_workspace_seed_seconds", "Time to seed a job workspace from a template.", ["template"])
+)
@@ -0,0 +1,183 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition, Lock, Thread
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+import requests
+
+logging.basicConfig(level=logging.INFO)
+
+
+class TransitionFeed:
+    """Job status transitions, numbered and kept in a bounded ring buffer, fanned out to asyncio subscribers.
+
+    `publish` may be called from any thread (JobManager calls it with its lock held), so it only
+    appends and hands the event to each subscriber's loop with `call_soon_threadsafe`. A subscriber
+    gets an asyncio.Queue, optionally filtered to one job, pre-filled with the buffered events after
+    `after` so a client resuming with Last-Event-ID misses nothing still in the buffer.
+    """
+
+    def __init__(self, maxlen: int = 1000, queue_size: int = 1000) -> None:
+        self.lock = Lock()
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
+        self.seq = 0
+        self.queue_size = queue_size
+        self.subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue, Optional[str]]] = []
+
+    def publish(self, job_id: str, status: str, previous: Optional[str]) -> Dict[str, Any]:
+        with self.lock:
+            self.seq += 1
+            event = {"id": self.seq, "job_id": job_id, "status": status, "previous": previous, "at": time.time()}
+            self.events.append(event)
+            subscribers = list(self.subscribers)
+        for loop, queue, only in subscribers:
+            if only is None or only == job_id:
+                try:
+                    loop.call_soon_threadsafe(_offer, queue, event)
+                except RuntimeError:  # the subscriber's loop has closed
+                    self.unsubscribe(queue)
+        return event
+
+    def subscribe(self, job_id: Optional[str] = None, after: Optional[int] = None) -> asyncio.Queue:
+        """Queue of future events (and buffered ones after `after`). Must be called on the subscriber's loop."""
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        with self.lock:
+            backlog = [
+                event for event in self.events
+                if after is not None and event["id"] > after and (job_id is None or event["job_id"] == job_id)
+            ]
+            self.subscribers.append((asyncio.get_running_loop(), queue, job_id))
+        for event in backlog:
+            _offer(queue, event)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self.lock:
+            self.subscribers = [entry for entry in self.subscribers if entry[1] is not queue]
+
+    def last_id(self) -> int:
+        with self.lock:
+            return self.seq
+
+
+def _offer(queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+    """Deliver to a subscriber, dropping the event if it is too far behind."""
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        pass
+
+
+class WebhookNotifier:
+    """POSTs job completion payloads to callback URLs, retrying failed deliveries with exponential backoff.
+
+    Deliveries wait in a due-time heap; a dispatcher thread hands due ones to a small pool of sender
+    threads, so one slow endpoint cannot hold up the others. A delivery is retried after a
+    connection error, a timeout, 408, 429 or a 5xx, up to `max_attempts` in total, waiting
+    `backoff * 2 ** (attempt - 1)` seconds (at most `max_backoff`) in between. The final outcome
+    (`delivered`, `attempts`, `status_code`, `error`) is passed to `on_result`.
+    """
+
+    def __init__(
+        self,
+        on_result: Callable[[str, Dict[str, Any]], None],
+        max_attempts: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        timeout: float = 10.0,
+        workers: int = 4,
+    ) -> None:
+        self.on_result = on_result
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.workers = workers
+        self.cond = Condition()
+        self.heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._order = itertools.count()
+        self.counters = {"delivered": 0, "failed": 0, "retries": 0}
+        self.session = requests.Session()
+        self._stopped = True
+        self._thread: Optional[Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def send(self, job_id: str, url: str, payload: Dict[str, Any]) -> None:
+        """Queue a delivery; returns at once."""
+        self._push(time.time(), {"job_id": job_id, "url": url, "payload": payload, "attempts": 0})
+
+    def stats(self) -> Dict[str, Any]:
+        with self.cond:
+            return {"queued": len(self.heap), **self.counters}
+
+    def start(self) -> None:
+        with self.cond:
+            self._stopped = False
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="webhook")
+        self._thread = Thread(target=self._loop, name="webhook-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self.cond:
+            self._stopped = True
+            self.cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _push(self, due: float, delivery: Dict[str, Any]) -> None:
+        with self.cond:
+            heapq.heappush(self.heap, (due, next(self._order), delivery))
+            self.cond.notify_all()
+
+    def _loop(self) -> None:
+        while True:
+            with self.cond:
+                while not self._stopped and (not self.heap or self.heap[0][0] > time.time()):
+                    self.cond.wait(self.heap[0][0] - time.time() if self.heap else None)
+                if self._stopped:
+                    return
+                _, _, delivery = heapq.heappop(self.heap)
+            self._executor.submit(self._deliver, delivery)
+
+    def _deliver(self, delivery: Dict[str, Any]) -> None:
+        delivery["attempts"] += 1
+        status_code, error = None, None
+        try:
+            response = self.session.post(delivery["url"], json=delivery["payload"], timeout=self.timeout)
+            status_code = response.status_code
+            if 200 <= status_code < 300:
+                self._finish(delivery, True, status_code, None)
+                return
+            error = f"HTTP {status_code}"
+            retryable = status_code in (408, 429) or status_code >= 500
+        except requests.RequestException as e:
+            error, retryable = str(e), True
+        if retryable and delivery["attempts"] < self.max_attempts:
+            delay = min(self.max_backoff, self.backoff * 2 ** (delivery["attempts"] - 1))
+            logging.info(f"Webhook for job {delivery['job_id']} failed ({error}); retrying in {delay:.1f}s")
+            with self.cond:
+                self.counters["retries"] += 1
+            self._push(time.time() + delay, delivery)
+            return
+        logging.warning(f"Webhook for job {delivery['job_id']} failed after {delivery['attempts']} attempts: {error}")
+        self._finish(delivery, False, status_code, error)
+
+    def _finish(self, delivery: Dict[str, Any], delivered: bool, status_code: Optional[int], error: Optional[str]) -> None:
+        with self.cond:
+            self.counters["delivered" if delivered else "failed"] += 1
+        try:
+            self.on_result(delivery["job_id"], {
+                "delivered": delivered,
+                "attempts": delivery["attempts"],
+                "status_code": status_code,
+                "error": error,
+                "at": time.time(),
+            })
+        except Exception as e:
+            logging.error(f"Failed to record webhook outcome for job {delivery['job_id']}: {e}")
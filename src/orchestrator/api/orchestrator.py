@@ -1,15 +1,65 @@
+import asyncio
+import hashlib
+import json
 import logging
 import os
+import time
 import uuid
-from typing import Any, Dict
-from fastapi import FastAPI, BackgroundTasks, Request, Query, Depends, HTTPException, status
-from fastapi.responses import JSONResponse, FileResponse
-from src.orchestrator.api.job_manager import job_manager
-from schema import ScheduleRequest
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+from fastapi import FastAPI, BackgroundTasks, Request, Query, Depends, Header, HTTPException, status
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse, Response, StreamingResponse
+from src.orchestrator.api.artifacts import etag_for, stream_zip
+from src.orchestrator.api.job_manager import FINISHED_STATUSES, TERMINAL_STATUSES, job_manager
+from src.orchestrator.api.async_job_manager import async_job_manager
+from src.orchestrator.api.metrics import HTTP_REQUEST_SECONDS, REGISTRY, Gauge
+from src.orchestrator.api.schema import BatchScheduleRequest, ScheduleRequest
+from src.orchestrator.config import config
 
 logging.basicConfig(level=logging.INFO)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start JobManager background services for the lifetime of the app."""
+    job_manager.start()
+    yield
+    job_manager.stop()
+    async_job_manager.shutdown()
+
+app = FastAPI(lifespan=lifespan)
+
+REGISTRY.register(Gauge(
+    "orchestrator_jobs", "Jobs in the job store by status.", ["status"],
+    lambda: {(status,): count for status, count in job_manager.store.count_by_status().items()},
+))
+REGISTRY.register(Gauge(
+    "orchestrator_result_cache_lookups", "Result cache lookups by outcome.", ["result"],
+    lambda: {
+        (result,): job_manager.cache.counters[f"{result}s"] for result in ("hit", "miss")
+    } if job_manager.cache else {},
+))
+REGISTRY.register(Gauge(
+    "orchestrator_job_timeouts", "Jobs stopped by the watchdog, by the limit they hit.", ["reason"],
+    lambda: {(reason,): count for reason, count in job_manager.watchdog.stats()["timed_out"].items()},
+))
+REGISTRY.register(Gauge(
+    "orchestrator_scheduler_jobs", "Jobs holding a run slot (running) or waiting for one (pending).", ["state"],
+    lambda: {("running",): job_manager.scheduler.running_count(), ("pending",): job_manager.scheduler.depth()},
+))
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next: Any) -> Any:
+    """Time every request, labelled by route template so job ids do not create new series."""
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    HTTP_REQUEST_SECONDS.observe(
+        time.perf_counter() - start,
+        method=request.method,
+        route=route.path if route else "unmatched",
+        status=response.status_code,
+    )
+    return response
 
 def is_valid_job_id(job_id: str) -> bool:
     try:
@@ -30,53 +80,208 @@ async def validate_job_id(job_id: str) -> str:
         )
     return job_id
 
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Weak If-None-Match comparison against `etag`."""
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
 @app.post("/schedule")
-async def schedule_job(req: ScheduleRequest, background_tasks: BackgroundTasks) -> Dict[str, Any]:
-    """Launch a new job as a Docker container using JobManager."""
-    job_id = job_manager.launch_job(req.prompt)
-    logging.info(f"Scheduled job {job_id} for prompt: {req.prompt}")
-    return {"job_id": job_id, "status": "scheduled"}
+async def schedule_job(req: ScheduleRequest, background_tasks: BackgroundTasks) -> Any:
+    """Queue a new job; the scheduler starts its container once a concurrency slot is free and the host has room."""
+    try:
+        job_id = await async_job_manager.submit_job(
+            req.prompt, req.priority, req.size, req.no_cache, req.callback_url, req.timeout, req.idle_timeout,
+            req.template,
+        )
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    job = await async_job_manager.get_job(job_id)
+    cached = job is not None and job.get("start_mode") == "cached"
+    logging.info(f"Scheduled job {job_id} for prompt: {req.prompt}{' (cached)' if cached else ''}")
+    return {
+        "job_id": job_id,
+        "status": "complete" if cached and job["status"] == "complete" else "scheduled",
+        "queue_position": job_manager.queue_position(job_id),
+        "cached": cached,
+    }
+
+@app.post("/schedule/batch")
+async def schedule_batch(req: BatchScheduleRequest) -> Dict[str, Any]:
+    """Queue many jobs in one request; each item gets a job ID or its own error."""
+    results = await async_job_manager.submit_jobs([item.model_dump() for item in req.items])
+    failed = sum(1 for result in results if result["error"])
+    logging.info(f"Scheduled batch of {len(results)} jobs ({failed} failed)")
+    return {"jobs": results, "scheduled": len(results) - failed, "failed": failed}
 
 @app.get("/status/{job_id}")
-async def get_status(request: Request, job_id: str = Depends(validate_job_id)) -> Dict[str, Any]:
-    """Get the status and output path for a job. If complete, include download and logs links."""
-    status = job_manager.get_status(job_id)
-    output = job_manager.get_output(job_id) if status == "complete" else None
+async def get_status(
+    request: Request,
+    job_id: str = Depends(validate_job_id),
+    wait: float = Query(0, ge=0, description="Long-poll: hold the request up to this many seconds for a status change"),
+    last_status: Optional[str] = Query(None, description="With `wait`: the status the client already has"),
+) -> Dict[str, Any]:
+    """Get the status and output path for a job. If complete, include download and logs links.
+
+    With `wait`, the response is held until the status differs from `last_status` (or from the
+    status at request time), at most LONG_POLL_MAX_WAIT seconds, so a client needs one request per
+    state change instead of a polling loop.
+    """
+    if wait > 0:
+        status = await async_job_manager.wait_for_status(job_id, last_status, min(wait, config.LONG_POLL_MAX_WAIT))
+    else:
+        status = await async_job_manager.get_status(job_id)
+    # Never build the archive on the status path; /download does that on the artifacts lane.
+    output = await async_job_manager.get_output(job_id, False) if status in FINISHED_STATUSES else None
     base_url = str(request.base_url).rstrip("/")
-    download_link = f"{base_url}/download/{job_id}" if output else None
+    download_link = f"{base_url}/download/{job_id}" if status in FINISHED_STATUSES else None
     logs_link = f"{base_url}/logs/{job_id}"
     logging.info(f"Status for job {job_id}: {status}")
     return {
         "job_id": job_id,
         "status": status,
+        "queue_position": job_manager.queue_position(job_id) if status == "pending" else None,
         "output": output,
         "download_link": download_link,
         "logs_link": logs_link
     }
 
+@app.get("/events")
+async def stream_job_events(
+    job_id: Optional[str] = Query(None, description="Only this job's transitions"),
+    last_event_id: Optional[str] = Header(None),
+) -> Any:
+    """Job status transitions as Server-Sent Events.
+
+    Each `transition` event carries `job_id`, `status`, `previous` and `at`; its `id` increases
+    across all jobs, and a reconnecting client sending `Last-Event-ID` is replayed what it missed
+    while that is still among the last TRANSITION_LOG_SIZE transitions. With `job_id`, the stream
+    opens with the job's current status and ends after its terminal transition.
+    """
+    if job_id is not None:
+        await validate_job_id(job_id)
+        if await async_job_manager.get_job(job_id) is None:
+            return JSONResponse(status_code=404, content={"error": "Job not found"})
+    after = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
+    def frame(event: Dict[str, Any]) -> str:
+        return f"event: transition\nid: {event['id']}\ndata: {json.dumps(event)}\n\n"
+
+    async def stream() -> AsyncIterator[str]:
+        events = job_manager.transitions.subscribe(job_id, after)
+        try:
+            if job_id is not None:
+                current = await async_job_manager.get_status(job_id)
+                # A resuming client already has the current status unless it missed the end.
+                if after is None or (events.empty() and current in TERMINAL_STATUSES):
+                    yield frame({"id": job_manager.transitions.last_id(), "job_id": job_id, "status": current,
+                                 "previous": None, "at": time.time()})
+                    if current in TERMINAL_STATUSES:
+                        return
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.get(), 15)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield frame(event)
+                if job_id is not None and event["status"] in TERMINAL_STATUSES:
+                    return
+        finally:
+            job_manager.transitions.unsubscribe(events)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 @app.post("/cancel/{job_id}")
 async def cancel_job(job_id: str = Depends(validate_job_id)) -> Dict[str, Any]:
     """Cancel a running job. Returns success/failure and updated status."""
-    success = job_manager.cancel_job(job_id)
-    status = job_manager.get_status(job_id)
+    success = await async_job_manager.cancel_job(job_id)
+    status = await async_job_manager.get_status(job_id)
     logging.info(f"Cancelled job {job_id}: {success}")
     return {"job_id": job_id, "cancelled": success, "status": status}
 
 @app.get("/jobs")
-async def list_jobs() -> Dict[str, Any]:
-    """List all jobs and their statuses."""
-    jobs = []
-    for job_id, job in job_manager.jobs.items():
-        jobs.append({
-            "job_id": job_id,
-            "status": job.get("status"),
-            "created": job.get("created"),
-            "started": job.get("started"),
-            "completed": job.get("completed"),
-            "error": job.get("error"),
-        })
-    logging.info(f"Listing {len(jobs)} jobs.")
-    return {"jobs": jobs}
+async def list_jobs(
+    request: Request,
+    status: Optional[List[str]] = Query(None),
+    created_after: Optional[float] = Query(None, description="Only jobs created at or after this epoch time"),
+    created_before: Optional[float] = Query(None, description="Only jobs created before this epoch time"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = Query(None, description="Comma-separated job fields to return"),
+) -> Any:
+    """List jobs newest first, one page at a time.
+
+    Pass the returned `next_cursor` as `cursor` for the next page. The page carries an ETag; an
+    unchanged page is answered with 304 when the client sends it back in If-None-Match.
+    """
+    projection = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        page = await async_job_manager.list_jobs(status, created_after, created_before, cursor, limit, projection)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    etag = 'W/"' + hashlib.sha1(json.dumps(page, sort_keys=True, default=str).encode("utf-8")).hexdigest() + '"'
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    logging.info(f"Listing {len(page['jobs'])} jobs.")
+    return JSONResponse(
+        content={
+            **page,
+            "queue_depth": job_manager.scheduler.depth(),
+            "running": job_manager.scheduler.running_count(),
+            "max_concurrent_jobs": job_manager.scheduler.max_concurrent,
+        },
+        headers={"ETag": etag},
+    )
+
+@app.get("/pool")
+async def get_pool() -> Dict[str, Any]:
+    """Warm pool state and time-to-first-agent-output for pooled vs. cold starts."""
+    return {
+        "enabled": job_manager.pool is not None,
+        "pool": job_manager.pool.stats() if job_manager.pool else None,
+        "time_to_first_output": job_manager.start_latency_stats(),
+    }
+
+@app.get("/reaper")
+async def get_reaper() -> Dict[str, Any]:
+    """Retention reaper metrics: tracked jobs, next deadline, jobs reaped, bytes freed, pass timings."""
+    return {"retention_days": config.RETENTION_DAYS, **job_manager.reaper.stats()}
+
+@app.get("/reconcile")
+async def get_reconcile() -> Dict[str, Any]:
+    """Startup reconciliation of job records against labelled containers: done yet, adopted and orphaned jobs."""
+    return {"done": job_manager.reconciled.is_set(), **job_manager.reconcile_stats}
+
+@app.get("/templates")
+async def get_templates() -> Any:
+    """Workspace templates: current version and size, last build, seeds and bytes written by seeding."""
+    if not job_manager.backend.supports_templates:
+        return JSONResponse(
+            status_code=400, content={"error": f"The {job_manager.backend.name} backend does not support workspace templates"}
+        )
+    return job_manager.template_report()
+
+@app.get("/storage")
+async def get_storage() -> Dict[str, Any]:
+    """Deduplicated blob store report: jobs, blobs, logical vs. stored bytes, dedup ratio."""
+    return job_manager.storage_report()
+
+@app.get("/health")
+async def get_health() -> Dict[str, Any]:
+    """Host headroom against the warning thresholds, plus current and peak usage of running jobs."""
+    return await async_job_manager.health_report()
+
+@app.get("/cache")
+async def get_cache() -> Dict[str, Any]:
+    """Result cache entries, bytes, hits, misses, evictions and hit rate."""
+    return job_manager.cache_report()
+
+@app.get("/metrics")
+async def get_metrics() -> PlainTextResponse:
+    """Prometheus text exposition of orchestrator metrics."""
+    return PlainTextResponse(await async_job_manager.render_metrics(), media_type="text/plain; version=0.0.4")
 
 @app.get("/")
 async def root() -> JSONResponse:
@@ -86,24 +291,86 @@ async def root() -> JSONResponse:
 @app.get("/job/{job_id}")
 async def get_job_details(job_id: str = Depends(validate_job_id)) -> Any:
     """Get the full job state/details for a job."""
-    job = job_manager.jobs.get(job_id)
+    job = await async_job_manager.get_job(job_id)
     if not job:
         logging.warning(f"Job not found: {job_id}")
         return JSONResponse(status_code=404, content={"error": "Job not found"})
     return job
 
+@app.get("/job/{job_id}/timeline")
+async def get_job_timeline(job_id: str = Depends(validate_job_id)) -> Any:
+    """Where a job's wall time went: queueing, container boot, time to first agent output, agent work, archive, packaging."""
+    timeline = await async_job_manager.get_timeline(job_id)
+    if not timeline:
+        return JSONResponse(status_code=404, content={"error": "Job not found"})
+    return timeline
+
+@app.get("/phases")
+async def get_phases() -> Dict[str, Any]:
+    """Per-phase duration percentiles across finished jobs, and the slowest phase overall."""
+    return await async_job_manager.phase_report()
+
 @app.get("/logs/{job_id}")
-async def get_job_logs(job_id: str = Depends(validate_job_id), log_type: str = Query("stdout", enum=["stdout", "stderr"])) -> Any:
-    """Get the last 1000 lines and full log for a job (stdout or stderr)."""
+async def get_job_logs(
+    job_id: str = Depends(validate_job_id),
+    log_type: str = Query("stdout", enum=["stdout", "stderr"]),
+    lines: int = Query(config.LOG_TAIL_LINES, ge=1, le=100000),
+    full: bool = True,
+) -> Any:
+    """Get the last `lines` lines of a job's log (stdout or stderr) and, unless `full=false`, the whole live log file."""
     if log_type not in ("stdout", "stderr"):
         logging.warning(f"Invalid log_type: {log_type}")
         return JSONResponse(status_code=400, content={"error": "log_type must be 'stdout' or 'stderr'"})
-    logs = job_manager.get_logs(job_id) if log_type == "stdout" else None
-    full_log = job_manager.get_full_log(job_id, log_type)
-    if logs is None and full_log is None:
+    logs = await async_job_manager.get_logs(job_id, log_type, lines)
+    if logs is None:
         logging.warning(f"Logs not found for job {job_id}")
         return JSONResponse(status_code=404, content={"error": "Logs not found or job does not exist"})
-    return {"job_id": job_id, "log_type": log_type, "last_1000_lines": logs, "full_log": full_log}
+    full_log = await async_job_manager.get_full_log(job_id, log_type) if full else None
+    # `last_1000_lines` is kept for existing clients; it holds the last `lines` lines.
+    return {
+        "job_id": job_id,
+        "log_type": log_type,
+        "lines": lines,
+        "last_lines": logs,
+        "last_1000_lines": logs,
+        "full_log": full_log,
+    }
+
+@app.get("/logs/{job_id}/stream")
+async def stream_job_logs(
+    job_id: str = Depends(validate_job_id),
+    log_type: str = Query("stdout", enum=["stdout", "stderr"]),
+    offset: int = Query(0, ge=0),
+    last_event_id: Optional[str] = Header(None),
+) -> Any:
+    """Follow a job's log as Server-Sent Events.
+
+    Each event's `id` is the absolute byte offset after its data, so a client resumes with
+    `?offset=<id>` or the standard `Last-Event-ID` header. An `end` event is sent once the job has
+    stopped and all of its output has been delivered.
+    """
+    if await async_job_manager.get_job(job_id) is None:
+        return JSONResponse(status_code=404, content={"error": "Job not found"})
+    if last_event_id and last_event_id.isdigit():
+        offset = int(last_event_id)
+
+    async def events() -> AsyncIterator[str]:
+        position = offset
+        while True:
+            result = await async_job_manager.read_log(job_id, log_type, position)
+            if result is None:
+                return
+            data, position, finished = result
+            if data:
+                text = data.decode("utf-8", errors="replace")
+                yield f"id: {position}\n" + "".join(f"data: {line}\n" for line in text.split("\n")) + "\n"
+            elif finished:
+                yield f"event: end\nid: {position}\ndata: {await async_job_manager.get_status(job_id)}\n\n"
+                return
+            else:
+                await asyncio.sleep(0.25)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 @app.get("/logs/{job_id}/{log_type}")
 async def download_log_file(log_type: str, job_id: str = Depends(validate_job_id)) -> Any:
@@ -111,17 +378,42 @@ async def download_log_file(log_type: str, job_id: str = Depends(validate_job_id
     if log_type not in ("stdout", "stderr"):
         logging.warning(f"Invalid log_type for download: {log_type}")
         return JSONResponse(status_code=400, content={"error": "log_type must be 'stdout' or 'stderr'"})
-    log_file = job_manager.get_log_file(job_id, log_type)
+    log_file = await async_job_manager.get_log_file(job_id, log_type)
     if not log_file:
         logging.warning(f"Log file not found for job {job_id}, type {log_type}")
         return JSONResponse(status_code=404, content={"error": f"{log_type} log file not found"})
     return FileResponse(log_file, filename=os.path.basename(log_file), media_type="text/plain")
 
 @app.get("/download/{job_id}")
-async def download_job_output(job_id: str = Depends(validate_job_id)) -> Any:
-    """Download the zipped output file for a completed job."""
-    output = job_manager.get_output(job_id)
+async def download_job_output(
+    request: Request,
+    job_id: str = Depends(validate_job_id),
+    stream: bool = False,
+    compression: Optional[str] = Query(None, enum=["deflate", "store"]),
+) -> Any:
+    """Download the zipped output file for a completed job.
+
+    The cached archive is served with ETag/If-None-Match and HTTP Range support. With `stream=true`
+    a zip is instead generated on the fly from the workspace, without waiting for the cached
+    archive or writing a temp file.
+    """
+    if stream:
+        output_dir = await async_job_manager.get_output_dir(job_id)
+        if not output_dir:
+            return JSONResponse(status_code=404, content={"error": "Output not found or job not complete"})
+        zip_stream = stream_zip(
+            output_dir, compression or config.ARTIFACT_COMPRESSION, config.ARTIFACT_COMPRESSLEVEL, job_id
+        )
+        return StreamingResponse(
+            zip_stream,
+            media_type="application/zip",
+            headers={"Content-Disposition": f'attachment; filename="{job_id}.zip"'},
+        )
+    output = await async_job_manager.get_output(job_id)
     if not output or not output.endswith(".zip") or not os.path.exists(output):
         logging.warning(f"Output zip not found for job {job_id}")
         return JSONResponse(status_code=404, content={"error": "Output zip not found or job not complete"})
-    return FileResponse(output, filename=os.path.basename(output), media_type="application/zip")
+    etag = etag_for(output)
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return FileResponse(output, filename=os.path.basename(output), media_type="application/zip", headers={"etag": etag})
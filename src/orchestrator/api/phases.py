@@ -0,0 +1,112 @@
+import json
+import logging
+import math
+from typing import Any, Dict, Iterable, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+
+PHASES_FILE = ".agent_phases.jsonl"  # written by the agent entrypoint into the job's workspace
+
+
+def read_markers(path: str) -> List[Dict[str, Any]]:
+    """Phase markers from a timing file, one JSON object per line; unreadable lines are skipped."""
+    markers = []
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    marker = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(marker, dict) and marker.get("phase") and isinstance(marker.get("at"), (int, float)):
+                    markers.append(marker)
+    except OSError:
+        pass
+    return markers
+
+
+def span(phase: str, start: float, end: float, **extra: Any) -> Dict[str, Any]:
+    return {"phase": phase, "start": start, "end": end, "seconds": round(max(0.0, end - start), 6), **extra}
+
+
+def build_timeline(
+    markers: Iterable[Dict[str, Any]],
+    created: Optional[float] = None,
+    dispatched: Optional[float] = None,
+    exited: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Turn entrypoint markers and the orchestrator's own timestamps into phase spans, ordered by start.
+
+    Markers are `{"phase", "event": "start"|"end", "at"}` pairs, `{"phase", "duration", "at"}` for
+    a span reported when it ended (e.g. one model call), or `{"phase", "event": "mark", "at"}`
+    instants. A phase that started but never ended (the container was killed) ends at `exited` and
+    is flagged `open`. The entrypoint's `agent` phase is split at its `first_output` mark into
+    `time_to_first_output` and `agent_work`. The first output comes after the agent CLI has booted
+    and answered its first model call, so that span is not CLI startup alone. `queued` (created to
+    dispatched) and `container_boot` (dispatched to the first marker) come from the job record.
+    """
+    markers = sorted(markers, key=lambda marker: marker["at"])
+    spans: List[Dict[str, Any]] = []
+    started: Dict[str, List[Dict[str, Any]]] = {}
+    marks: Dict[str, float] = {}
+    for marker in markers:
+        phase, at, event = str(marker["phase"]), float(marker["at"]), marker.get("event")
+        if isinstance(marker.get("duration"), (int, float)):
+            spans.append(span(phase, at - marker["duration"], at))
+        elif event == "start":
+            started.setdefault(phase, []).append(marker)
+        elif event == "end" and started.get(phase):
+            begin = started[phase].pop()
+            extra = {"exit_code": marker["exit_code"]} if "exit_code" in marker else {}
+            spans.append(span(phase, float(begin["at"]), at, **extra))
+        elif event == "mark":
+            marks.setdefault(phase, at)
+    end_of_job = exited if exited is not None else (markers[-1]["at"] if markers else None)
+    for phase, pending in started.items():
+        for begin in pending:
+            if end_of_job is not None:
+                spans.append(span(phase, float(begin["at"]), max(float(begin["at"]), end_of_job), open=True))
+    first_output = marks.get("first_output")
+    for agent in [item for item in spans if item["phase"] == "agent"]:
+        if first_output is not None and agent["start"] <= first_output <= agent["end"]:
+            spans.append(span("time_to_first_output", agent["start"], first_output))
+            spans.append(span("agent_work", first_output, agent["end"]))
+    if created is not None and dispatched is not None:
+        spans.append(span("queued", created, dispatched))
+    if dispatched is not None and markers:
+        spans.append(span("container_boot", dispatched, max(dispatched, float(markers[0]["at"]))))
+    return sorted(spans, key=lambda item: (item["start"], item["phase"]))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted, non-empty `values`."""
+    return values[max(0, math.ceil(len(values) * pct / 100) - 1)]
+
+
+def phase_percentiles(timelines: Iterable[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Per-phase duration percentiles across jobs; a phase seen several times in one job counts its total."""
+    samples: Dict[str, List[float]] = {}
+    jobs = 0
+    for timeline in timelines:
+        jobs += 1
+        per_job: Dict[str, float] = {}
+        for item in timeline:
+            per_job[item["phase"]] = per_job.get(item["phase"], 0.0) + item["seconds"]
+        for phase, seconds in per_job.items():
+            samples.setdefault(phase, []).append(seconds)
+    phases = {}
+    for phase, values in samples.items():
+        values.sort()
+        phases[phase] = {
+            "jobs": len(values),
+            "mean_seconds": round(sum(values) / len(values), 6),
+            "p50_seconds": percentile(values, 50),
+            "p95_seconds": percentile(values, 95),
+            "p99_seconds": percentile(values, 99),
+            "max_seconds": values[-1],
+            "total_seconds": round(sum(values), 6),
+        }
+    # `agent` overlaps its own split, and `queued` is not time spent running the job.
+    ranked = [phase for phase in phases if phase not in ("agent", "queued")]
+    slowest = max(ranked, key=lambda phase: phases[phase]["total_seconds"], default=None)
+    return {"jobs": jobs, "phases": phases, "slowest_phase": slowest}
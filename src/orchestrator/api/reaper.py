@@ -0,0 +1,127 @@
+import heapq
+import logging
+import time
+from threading import Condition, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.orchestrator.api.metrics import REAPED_JOBS, REAPER_ERRORS, REAPER_FREED_BYTES
+
+logging.basicConfig(level=logging.INFO)
+
+REAP_COUNTERS = {"jobs_reaped": REAPED_JOBS, "bytes_freed": REAPER_FREED_BYTES, "errors": REAPER_ERRORS}
+
+
+class RetentionReaper:
+    """Deletes finished jobs once their retention expires, driven by an expiry-time heap.
+
+    `schedule` records when a job becomes due. A background thread sleeps until the earliest
+    deadline, pops up to `batch_size` due jobs at a time and hands them to `reap`, which does the
+    actual removal and returns counts for the REAP_COUNTERS. Only jobs that are due are ever looked at.
+    Re-scheduling a job simply replaces its deadline; stale heap entries are skipped when popped.
+    """
+
+    def __init__(
+        self, reap: Callable[[List[str]], Dict[str, int]], batch_size: int, max_sleep: float = 60.0
+    ) -> None:
+        self.reap = reap
+        self.batch_size = batch_size
+        self.max_sleep = max_sleep
+        self.cond = Condition()
+        self.heap: List[Tuple[float, str]] = []
+        self.deadlines: Dict[str, float] = {}
+        self.counters: Dict[str, Any] = {name: 0 for name in REAP_COUNTERS}
+        self.counters.update({"passes": 0, "last_pass_seconds": None, "last_pass_at": None})
+        self._stopped = True
+        self._thread: Optional[Thread] = None
+
+    def schedule(self, job_id: str, due: float) -> None:
+        """Set (or move) the time at which a job's retention expires."""
+        with self.cond:
+            if self.deadlines.get(job_id) == due:
+                return
+            self.deadlines[job_id] = due
+            heapq.heappush(self.heap, (due, job_id))
+            self.cond.notify_all()
+
+    def forget(self, job_id: str) -> None:
+        """Stop tracking a job (e.g. it was deleted some other way)."""
+        with self.cond:
+            self.deadlines.pop(job_id, None)
+
+    def pop_due(self, now: Optional[float] = None) -> List[str]:
+        """Remove and return up to `batch_size` jobs whose deadline has passed."""
+        now = time.time() if now is None else now
+        due: List[str] = []
+        with self.cond:
+            while self.heap and self.heap[0][0] <= now and len(due) < self.batch_size:
+                deadline, job_id = heapq.heappop(self.heap)
+                if self.deadlines.get(job_id) == deadline:
+                    del self.deadlines[job_id]
+                    due.append(job_id)
+        return due
+
+    def run_once(self) -> int:
+        """Reap every job that is due now, batch by batch. Returns the number of jobs handed to `reap`."""
+        started = time.time()
+        handled = 0
+        while True:
+            batch = self.pop_due(started)
+            if not batch:
+                break
+            handled += len(batch)
+            try:
+                counts = self.reap(batch)
+            except Exception as e:
+                logging.error(f"Retention reaper failed on a batch of {len(batch)} jobs: {e}")
+                counts = {"errors": len(batch)}
+            with self.cond:
+                for name, metric in REAP_COUNTERS.items():
+                    self.counters[name] += counts.get(name, 0)
+                    metric.inc(counts.get(name, 0))
+        with self.cond:
+            self.counters["passes"] += 1
+            self.counters["last_pass_seconds"] = round(time.time() - started, 6)
+            self.counters["last_pass_at"] = started
+        return handled
+
+    def stats(self) -> Dict[str, Any]:
+        with self.cond:
+            next_due = min(self.deadlines.values(), default=None)
+            return {
+                "tracked_jobs": len(self.deadlines),
+                "next_due_in_seconds": round(next_due - time.time(), 3) if next_due is not None else None,
+                "batch_size": self.batch_size,
+                **self.counters,
+            }
+
+    def start(self) -> None:
+        with self.cond:
+            self._stopped = False
+        self._thread = Thread(target=self._loop, name="retention-reaper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self.cond:
+            self._stopped = True
+            self.cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _wait_until_due(self) -> bool:
+        """Sleep until the earliest deadline (at most `max_sleep`). Returns False once stopped."""
+        with self.cond:
+            if not self._stopped:
+                timeout = self.max_sleep
+                if self.heap:
+                    timeout = min(timeout, max(0.0, self.heap[0][0] - time.time()))
+                if timeout > 0:
+                    self.cond.wait(timeout)
+            return not self._stopped
+
+    def _has_due(self) -> bool:
+        with self.cond:
+            return bool(self.heap) and self.heap[0][0] <= time.time()
+
+    def _loop(self) -> None:
+        while self._wait_until_due():
+            if self._has_due():
+                self.run_once()
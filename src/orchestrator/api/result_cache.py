@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Prompts that differ only in surrounding or repeated whitespace share a cache entry."""
+    return " ".join(prompt.split())
+
+
+def link_or_copy(src: str, dest: str) -> None:
+    """Hardlink a file, or copy it when `dest` is on another filesystem."""
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
+def clone_tree(src: str, dest: str) -> None:
+    """Copy a finished workspace as hardlinks; files of finished jobs are never written again."""
+    shutil.copytree(src, dest, copy_function=link_or_copy, symlinks=True)
+
+
+class ResultCache:
+    """Maps (normalized prompt, agent image ID, model/config key, workspace template) to a successful job's results.
+
+    Entries point at the job that produced them; JobManager clones that job's workspace for a hit.
+    An entry expires `ttl` seconds after its job completed and is evicted least-recently-used first
+    once the artifacts it points at exceed `max_bytes`. Only the index lives here: it is rebuilt
+    from the job records at startup and entries are dropped when the retention reaper deletes their
+    job. The image ID is looked up at most once per `image_ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_bytes: int,
+        image_id: Callable[[], str],
+        model_key: str = "",
+        image_ttl: float = 60.0,
+    ) -> None:
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.image_id = image_id
+        self.model_key = model_key
+        self.image_ttl = image_ttl
+        self.lock = Lock()
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # least recently used first
+        self.keys_by_job: Dict[str, str] = {}
+        self.bytes = 0
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        self._image: Optional[str] = None
+        self._image_checked = 0.0
+
+    def key_for(self, prompt: str, template: Optional[str] = None) -> str:
+        now = time.time()
+        if self._image is None or now - self._image_checked >= self.image_ttl:
+            self._image, self._image_checked = self.image_id(), now
+        material = [normalize_prompt(prompt), self._image, self.model_key]
+        if template:
+            material.append(template)  # keys of jobs without a template stay what they were
+        return hashlib.sha256(json.dumps(material).encode("utf-8")).hexdigest()
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[str]:
+        """Job ID whose results answer `key`, or None; counts a hit or a miss."""
+        now = time.time() if now is None else now
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and now - entry["stored"] > self.ttl:
+                self._drop(key)
+                self.counters["expirations"] += 1
+                entry = None
+            if not entry:
+                self.counters["misses"] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return entry["job_id"]
+
+    def put(self, key: str, job_id: str, size: int, stored: Optional[float] = None) -> None:
+        """Record a successful job's results, evicting least recently used entries beyond `max_bytes`."""
+        with self.lock:
+            if key in self.entries:
+                self._drop(key)
+            self.entries[key] = {"job_id": job_id, "stored": time.time() if stored is None else stored, "bytes": size}
+            self.keys_by_job[job_id] = key
+            self.bytes += size
+            while self.bytes > self.max_bytes and len(self.entries) > 1:
+                self._drop(next(iter(self.entries)))
+                self.counters["evictions"] += 1
+
+    def forget_job(self, job_id: str) -> None:
+        """Drop the entry backed by a job, e.g. because retention deleted it."""
+        with self.lock:
+            key = self.keys_by_job.get(job_id)
+            if key is not None:
+                self._drop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                **self.counters,
+                "hit_rate": round(self.counters["hits"] / lookups, 4) if lookups else None,
+            }
+
+    def _drop(self, key: str) -> None:
+        """Caller must hold self.lock."""
+        entry = self.entries.pop(key)
+        self.keys_by_job.pop(entry["job_id"], None)
+        self.bytes -= entry["bytes"]
@@ -0,0 +1,167 @@
+import bisect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition, Thread
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logging.basicConfig(level=logging.INFO)
+
+QueueKey = Tuple[int, float, str]  # (-priority, created, job_id): higher priority first, then FIFO
+
+
+class JobScheduler:
+    """Admission queue that caps how many agent containers run at once.
+
+    Jobs wait in a priority-ordered pending queue. A single dispatcher thread hands the head of the
+    queue to `launch` whenever fewer than `max_concurrent` jobs hold a slot, and `release` frees a
+    slot when a job reaches a terminal state. The queue itself is not persisted here: pending jobs
+    are job records with status `pending`, and JobManager re-enqueues them on startup.
+
+    An optional `admit(job_id)` predicate can hold the head of the queue back even when a slot is
+    free (e.g. the host is short on memory); it is re-asked on `poke` or every `retry_interval`.
+
+    With `launch_workers > 1`, promoted jobs are launched on a bounded thread pool, so a burst of
+    admissions (e.g. a batch submission) creates containers in parallel rather than one by one.
+    """
+
+    def __init__(
+        self,
+        launch: Callable[[str], None],
+        max_concurrent: int,
+        admit: Optional[Callable[[str], bool]] = None,
+        retry_interval: float = 5.0,
+        launch_workers: int = 1,
+    ) -> None:
+        self.launch = launch
+        self.max_concurrent = max_concurrent
+        self.admit = admit
+        self.retry_interval = retry_interval
+        self.launch_workers = launch_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.cond = Condition()
+        self.pending: List[QueueKey] = []
+        self.keys: Dict[str, QueueKey] = {}
+        self.running: Set[str] = set()
+        self._stopped = True
+        self._thread: Optional[Thread] = None
+
+    def enqueue(self, job_id: str, priority: int = 0, created: float = 0.0) -> int:
+        """Add a job to the pending queue and return its 1-based queue position."""
+        key = (-priority, created, job_id)
+        with self.cond:
+            bisect.insort(self.pending, key)
+            self.keys[job_id] = key
+            self.cond.notify_all()
+            return bisect.bisect_left(self.pending, key) + 1
+
+    def enqueue_many(self, entries: Iterable[Tuple[str, int, float]]) -> Dict[str, int]:
+        """Add several (job_id, priority, created) entries at once; returns {job_id: queue position}."""
+        keys = [(-priority, created, job_id) for job_id, priority, created in entries]
+        with self.cond:
+            for key in keys:
+                bisect.insort(self.pending, key)
+                self.keys[key[2]] = key
+            self.cond.notify_all()
+            return {key[2]: bisect.bisect_left(self.pending, key) + 1 for key in keys}
+
+    def remove(self, job_id: str) -> bool:
+        """Drop a job from the pending queue. Returns False if it was not pending."""
+        with self.cond:
+            key = self.keys.pop(job_id, None)
+            if key is None:
+                return False
+            self.pending.pop(bisect.bisect_left(self.pending, key))
+            return True
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based position of a pending job, or None if it is not queued."""
+        with self.cond:
+            key = self.keys.get(job_id)
+            return bisect.bisect_left(self.pending, key) + 1 if key else None
+
+    def depth(self) -> int:
+        with self.cond:
+            return len(self.pending)
+
+    def running_count(self) -> int:
+        with self.cond:
+            return len(self.running)
+
+    def mark_running(self, job_id: str) -> None:
+        """Account for a job that already holds a slot (e.g. still running from before a restart)."""
+        with self.cond:
+            self.running.add(job_id)
+
+    def release(self, job_id: str) -> None:
+        """Free the slot held by a job so the next pending job can be promoted."""
+        with self.cond:
+            if job_id in self.running:
+                self.running.discard(job_id)
+                self.cond.notify_all()
+
+    def poke(self) -> None:
+        """Wake the dispatcher so it re-checks admission (e.g. after a fresh resource sample)."""
+        with self.cond:
+            self.cond.notify_all()
+
+    def start(self) -> None:
+        """Start the dispatcher thread."""
+        with self.cond:
+            self._stopped = False
+        if self.launch_workers > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self.launch_workers, thread_name_prefix="job-launch")
+        self._thread = Thread(target=self._dispatch_loop, name="job-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self.cond:
+            self._stopped = True
+            self.cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self._executor:
+            # Launches already under way finish recording their container before the caller tears
+            # down the watcher and job store; queued ones are dropped and stay pending.
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _next(self) -> Optional[str]:
+        """Block until a slot and an admissible pending job are both available, then claim the slot."""
+        while True:
+            with self.cond:
+                while not self._stopped and (not self.pending or len(self.running) >= self.max_concurrent):
+                    self.cond.wait()
+                if self._stopped:
+                    return None
+                head = self.pending[0]
+            # Asked outside the condition: callers hold their own locks while calling release().
+            if self.admit and not self.admit(head[2]):
+                with self.cond:
+                    if not self._stopped:
+                        self.cond.wait(self.retry_interval)
+                continue
+            with self.cond:
+                if self._stopped or not self.pending or self.pending[0] != head:
+                    continue
+                if len(self.running) >= self.max_concurrent:
+                    continue
+                self.pending.pop(0)
+                del self.keys[head[2]]
+                self.running.add(head[2])
+                return head[2]
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            job_id = self._next()
+            if job_id is None:
+                return
+            if self._executor:
+                self._executor.submit(self._launch, job_id)
+            else:
+                self._launch(job_id)
+
+    def _launch(self, job_id: str) -> None:
+        try:
+            self.launch(job_id)
+        except Exception as e:
+            logging.error(f"Scheduler failed to launch job {job_id}: {e}")
+            self.release(job_id)
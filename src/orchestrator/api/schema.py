@@ -1,4 +1,27 @@
-from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from src.orchestrator.config import config
 
 class ScheduleRequest(BaseModel):
     prompt: str
+    priority: int = 0  # higher runs first; equal priorities are first-come, first-served
+    size: Optional[str] = None  # resource size class from config.SIZE_CLASSES; defaults to config.DEFAULT_SIZE_CLASS
+    no_cache: bool = False  # always run, even if the result cache holds an identical job
+    callback_url: Optional[str] = None  # http(s) URL POSTed the job's outcome once it finishes, with retries
+    timeout: Optional[int] = Field(None, ge=0)  # wall-clock seconds before the job is stopped; 0 disables
+    idle_timeout: Optional[int] = Field(None, ge=0)  # seconds without log output before the job is stopped
+    template: Optional[str] = None  # workspace template from config.WORKSPACE_TEMPLATES to start from
+
+class BatchItem(BaseModel):
+    prompt: str
+    priority: int = 0
+    size: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None  # stored on the job record as-is
+    no_cache: bool = False
+    callback_url: Optional[str] = None
+    timeout: Optional[int] = Field(None, ge=0)
+    idle_timeout: Optional[int] = Field(None, ge=0)
+    template: Optional[str] = None
+
+class BatchScheduleRequest(BaseModel):
+    items: List[BatchItem] = Field(..., min_length=1, max_length=config.MAX_BATCH_SIZE)
@@ -0,0 +1,169 @@
+import logging
+import re
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, Optional, Tuple
+from src.orchestrator.api.metrics import DOCKER_CALL_SECONDS
+
+logging.basicConfig(level=logging.INFO)
+
+ContainerState = Tuple[str, Optional[int]]  # (docker status, exit code)
+StateListener = Callable[[str, str, Optional[int]], None]
+
+WATCHED_EVENTS = ["start", "die", "oom", "destroy"]
+REMOVED = "removed"
+_EXIT_CODE_RE = re.compile(r"Exited \((-?\d+)\)")
+
+
+class ContainerStatusWatcher:
+    """Keeps an in-memory status/exit-code cache of agent containers current from the Docker events stream.
+
+    A single subscription to `docker_client.events()` replaces per-request `containers.get` + `reload`
+    calls. Because an events stream can silently drop, the cache is also resynced against one sparse
+    `containers.list` call every `resync_interval` seconds and after every reconnect. Both select
+    containers by the orchestrator's `label` rather than by image, so containers started from an
+    image tag that has since been rebuilt are still watched.
+    """
+
+    def __init__(
+        self,
+        docker_client: Any,
+        label: str,
+        on_change: StateListener,
+        resync_interval: float = 60.0,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self.docker_client = docker_client
+        self.label = label
+        self.on_change = on_change
+        self.resync_interval = resync_interval
+        self.reconnect_delay = reconnect_delay
+        self.lock = Lock()
+        self.states: Dict[str, ContainerState] = {}
+        self._stop = Event()
+        self._connected = Event()
+        self._synced = Event()
+        self._stream: Any = None
+        self._threads: list = []
+
+    @property
+    def healthy(self) -> bool:
+        """True while the events stream is connected and the cache has been resynced since connecting."""
+        return self._connected.is_set() and self._synced.is_set()
+
+    def get(self, container_id: str) -> Optional[ContainerState]:
+        """Return the cached (status, exit_code) for a container, if known."""
+        with self.lock:
+            return self.states.get(container_id)
+
+    def track(self, container_id: str, status: str = "running") -> None:
+        """Register a container the caller expects to exist, so a later resync notices if it vanishes."""
+        with self.lock:
+            self.states.setdefault(container_id, (status, None))
+
+    def forget(self, container_id: str) -> None:
+        """Stop caching a container that has been deliberately removed."""
+        with self.lock:
+            self.states.pop(container_id, None)
+
+    def start(self) -> None:
+        """Start the event and resync threads."""
+        self._stop.clear()
+        self._threads = [
+            Thread(target=self._event_loop, name="status-watcher-events", daemon=True),
+            Thread(target=self._resync_loop, name="status-watcher-resync", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Stop watching and close the events stream."""
+        self._stop.set()
+        stream = self._stream
+        if stream is not None and hasattr(stream, "close"):
+            try:
+                stream.close()
+            except Exception:
+                pass
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+    def resync(self) -> None:
+        """Reconcile the cache against a single sparse container listing."""
+        with DOCKER_CALL_SECONDS.time(op="list"):
+            containers = self.docker_client.containers.list(all=True, sparse=True, filters={"label": self.label})
+        seen: Dict[str, ContainerState] = {}
+        for container in containers:
+            attrs = container.attrs
+            status = attrs.get("State") or getattr(container, "status", None) or "unknown"
+            seen[container.id] = (status, parse_exit_code(attrs.get("Status", "")))
+        with self.lock:
+            missing = [cid for cid, state in self.states.items() if cid not in seen and state[0] != REMOVED]
+        for container_id, (status, exit_code) in seen.items():
+            self._set(container_id, status, exit_code)
+        for container_id in missing:
+            self._set(container_id, REMOVED, None)
+        self._synced.set()
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """Apply one decoded Docker event to the cache."""
+        action = event.get("Action") or event.get("status")
+        actor = event.get("Actor") or {}
+        container_id = actor.get("ID") or event.get("id")
+        if not container_id:
+            return
+        if action == "start":
+            self._set(container_id, "running", None)
+        elif action == "die":
+            exit_code = actor.get("Attributes", {}).get("exitCode")
+            self._set(container_id, "exited", int(exit_code) if exit_code is not None else None)
+        elif action == "oom":
+            logging.warning(f"Container {container_id[:12]} was OOM-killed")
+        elif action == "destroy":
+            with self.lock:
+                known = container_id in self.states
+            if known:  # not for containers already forgotten, e.g. removed by the retention reaper
+                self._set(container_id, REMOVED, None)
+
+    def _set(self, container_id: str, status: str, exit_code: Optional[int]) -> None:
+        with self.lock:
+            previous = self.states.get(container_id)
+            self.states[container_id] = (status, exit_code)
+        if previous != (status, exit_code):
+            try:
+                self.on_change(container_id, status, exit_code)
+            except Exception as e:
+                logging.error(f"Status listener failed for container {container_id[:12]}: {e}")
+
+    def _event_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._stream = self.docker_client.events(
+                    decode=True,
+                    filters={"type": "container", "label": self.label, "event": WATCHED_EVENTS},
+                )
+                self._connected.set()
+                # Anything that happened while disconnected is only visible through a list call.
+                self._synced.clear()
+                self.resync()
+                for event in self._stream:
+                    if self._stop.is_set():
+                        break
+                    self.handle_event(event)
+            except Exception as e:
+                if not self._stop.is_set():
+                    logging.warning(f"Docker events stream failed: {e}")
+            self._connected.clear()
+            self._stop.wait(self.reconnect_delay)
+
+    def _resync_loop(self) -> None:
+        while not self._stop.wait(self.resync_interval):
+            try:
+                self.resync()
+            except Exception as e:
+                logging.warning(f"Container resync failed: {e}")
+
+
+def parse_exit_code(status_text: str) -> Optional[int]:
+    match = _EXIT_CODE_RE.search(status_text or "")
+    return int(match.group(1)) if match else None
+
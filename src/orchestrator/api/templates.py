@@ -0,0 +1,220 @@
+import errno
+import fcntl
+import json
+import logging
+import os
+import shutil
+import time
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, Optional
+
+logging.basicConfig(level=logging.INFO)
+
+FICLONE = 0x40049409  # ioctl(dest_fd, FICLONE, src_fd): share extents copy-on-write (btrfs, XFS, bcachefs)
+CURRENT_FILE = "CURRENT"
+_NO_REFLINK = (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS)
+
+
+def reflink(src: str, dest: str) -> None:
+    """Copy-on-write clone of one file; raises OSError where the filesystem cannot do it."""
+    with open(src, "rb") as s, open(dest, "wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            os.remove(dest)
+            raise
+    shutil.copystat(src, dest)
+
+
+def materialize(src: str, dest: str) -> Dict[str, Any]:
+    """Recreate the tree `src` at `dest` as a private copy, as cheaply as the filesystem allows.
+
+    Files are reflinked where supported, sharing blocks with `src` until written. Otherwise they
+    are copied: a job workspace is writable and chown'd by the agent, so it must never share inodes
+    with the template. Returns counts of files, bytes physically written and bytes shared with `src`.
+    """
+    stats = {"files": 0, "bytes_written": 0, "bytes_shared": 0, "mode": "reflink"}
+    can_reflink = True
+    os.makedirs(dest, exist_ok=True)
+    for root, dirs, files in os.walk(src):
+        rel = os.path.relpath(root, src)
+        target_root = dest if rel == "." else os.path.join(dest, rel)
+        for name in list(dirs):
+            if os.path.islink(os.path.join(root, name)):
+                dirs.remove(name)  # os.walk would not descend into it anyway; recreate it as a link
+                files.append(name)
+            else:
+                os.makedirs(os.path.join(target_root, name), exist_ok=True)
+        for name in files:
+            source, target = os.path.join(root, name), os.path.join(target_root, name)
+            stats["files"] += 1
+            if os.path.islink(source):
+                os.symlink(os.readlink(source), target)
+                continue
+            size = os.path.getsize(source)
+            if can_reflink:
+                try:
+                    reflink(source, target)
+                    stats["bytes_shared"] += size
+                    continue
+                except OSError as e:
+                    if e.errno not in _NO_REFLINK:
+                        raise
+                    can_reflink = False
+                    stats["mode"] = "copy"
+            shutil.copy2(source, target)
+            stats["bytes_written"] += size
+    return stats
+
+
+def tree_size(path: str) -> Dict[str, int]:
+    """Files (symlinks included, as `materialize` counts them) and bytes of regular files under `path`."""
+    files = size = 0
+    for root, dirs, names in os.walk(path):
+        for name in dirs + names:
+            full = os.path.join(root, name)
+            if os.path.islink(full):
+                files += 1
+            elif name in names:
+                files += 1
+                size += os.path.getsize(full)
+    return {"files": files, "bytes": size}
+
+
+class TemplateStore:
+    """Prebuilt project templates that seed new job workspaces, e.g. a React/Vite app with node_modules.
+
+    Each template is built by `build(command, directory)` into `<root>/<name>/<version>`, with build
+    info in `<version>.json` next to it, and the version new jobs get is recorded in
+    `<root>/<name>/CURRENT`, so a restart reuses the last build.
+    A background thread builds missing templates at start and rebuilds all of them every
+    `refresh_interval` seconds; a build only replaces the current version once it succeeds. Versions
+    are never modified after they are built, and the one before the current one is kept so a seed
+    that started just before a switch still has its source.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        templates: Dict[str, str],
+        build: Callable[[str, str], None],
+        refresh_interval: float,
+    ) -> None:
+        self.root = root
+        self.templates = templates  # name -> build command
+        self.build = build
+        self.refresh_interval = refresh_interval
+        self.lock = Lock()
+        self.state: Dict[str, Dict[str, Any]] = {
+            name: {"seeds": 0, "bytes_written": 0, "bytes_shared": 0, "last_error": None} for name in templates
+        }
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+        for name in templates:
+            version = self._read_current(name)
+            if version:
+                self.state[name].update({"version": version, **self._read_info(name, version)})
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = Thread(target=self._refresh_loop, name="template-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def ready(self, name: str) -> bool:
+        with self.lock:
+            return bool(self.state.get(name, {}).get("version"))
+
+    def seed(self, name: str, dest: str) -> Dict[str, Any]:
+        """Materialize the current version of a template at `dest`. Raises if it has not been built yet."""
+        with self.lock:
+            version = self.state[name].get("version")
+        if not version:
+            raise RuntimeError(f"Workspace template {name} is not built yet")
+        start = time.perf_counter()
+        stats = materialize(os.path.join(self.root, name, version), dest)
+        stats.update({"template": name, "version": version, "seconds": round(time.perf_counter() - start, 6)})
+        with self.lock:
+            state = self.state[name]
+            state["seeds"] += 1
+            state["bytes_written"] += stats["bytes_written"]
+            state["bytes_shared"] += stats["bytes_shared"]
+        return stats
+
+    def refresh(self, name: str) -> bool:
+        """Build a new version of a template and make it current. Returns False if the build failed."""
+        stamp = int(time.time() * 1000)
+        while os.path.exists(os.path.join(self.root, name, str(stamp))):
+            stamp += 1
+        version = str(stamp)
+        path = os.path.join(self.root, name, version)
+        staging = path + ".building"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        start = time.perf_counter()
+        try:
+            self.build(self.templates[name], staging)
+        except Exception as e:
+            shutil.rmtree(staging, ignore_errors=True)
+            with self.lock:
+                self.state[name]["last_error"] = str(e)
+            logging.error(f"Failed to build workspace template {name}: {e}")
+            return False
+        info = {"built_at": time.time(), "build_seconds": round(time.perf_counter() - start, 3), **tree_size(staging)}
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump(info, f)
+        os.replace(staging, path)
+        current = os.path.join(self.root, name, CURRENT_FILE)
+        with open(current + ".tmp", "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(current + ".tmp", current)
+        with self.lock:
+            previous = self.state[name].get("version")
+            self.state[name].update({"version": version, "last_error": None, **info})
+        keep = {CURRENT_FILE} | {kept + suffix for kept in (version, previous) if kept for suffix in ("", ".json")}
+        for old in os.listdir(os.path.join(self.root, name)):
+            if old not in keep:
+                old_path = os.path.join(self.root, name, old)
+                if os.path.isdir(old_path):
+                    shutil.rmtree(old_path, ignore_errors=True)
+                else:
+                    os.remove(old_path)
+        logging.info(f"Built workspace template {name} version {version} ({info['files']} files)")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "refresh_interval_seconds": self.refresh_interval,
+                "templates": {name: dict(state) for name, state in self.state.items()},
+            }
+
+    def _refresh_loop(self) -> None:
+        for name in self.templates:
+            if not self.ready(name) and not self._stop.is_set():
+                self.refresh(name)
+        while not self._stop.wait(self.refresh_interval):
+            for name in self.templates:
+                if self._stop.is_set():
+                    return
+                self.refresh(name)
+
+    def _read_current(self, name: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self.root, name, CURRENT_FILE), "r", encoding="utf-8") as f:
+                version = f.read().strip()
+        except OSError:
+            return None
+        return version if os.path.isdir(os.path.join(self.root, name, version)) else None
+
+    def _read_info(self, name: str, version: str) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.root, name, version + ".json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
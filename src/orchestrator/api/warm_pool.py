@@ -0,0 +1,239 @@
+import logging
+import os
+import shutil
+import time
+import uuid
+from collections import deque
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from src.orchestrator.api.execution_backend import JOB_ID_LABEL
+from src.orchestrator.api.metrics import DOCKER_CALL_SECONDS
+
+logging.basicConfig(level=logging.INFO)
+
+POOL_MOUNT = "/pool"
+HANDOFF_DIR = "next"
+EXIT_FILE = ".agent_exit_code"
+
+
+class WarmPool:
+    """Pre-started agent containers blocked waiting for a prompt.
+
+    Each pooled container bind-mounts its own slot directory at `/pool`. `claim` hands a job to an
+    idle container by writing the prompt and job ID into `/pool/next/` (the `ready` marker is written
+    last), and the entrypoint runs the agent in `/pool/<job_id>`. The job's owner moves that
+    directory out of the slot when the job ends, and `claim` wipes anything still left in the slot,
+    so a container reused across jobs never sees an earlier job's workspace. A maintenance thread
+    refills the pool, retires containers idle for longer than `max_idle` seconds, and, for
+    containers reused across jobs (`max_uses > 1`), reports job completion from the exit-code file
+    the entrypoint writes. Slot directories are removed with their containers.
+    """
+
+    def __init__(
+        self,
+        docker_client: Any,
+        image: str,
+        root_dir: str,
+        size: int,
+        max_idle: float,
+        max_uses: int,
+        run_kwargs: Callable[[], Dict[str, Any]],
+        on_job_exit: Callable[[str, int], None],
+        interval: float = 1.0,
+    ) -> None:
+        self.docker_client = docker_client
+        self.image = image
+        self.root_dir = root_dir
+        self.size = size
+        self.max_idle = max_idle
+        self.max_uses = max_uses
+        self.run_kwargs = run_kwargs
+        self.on_job_exit = on_job_exit
+        self.interval = interval
+        self.lock = Lock()
+        self.slots: Dict[str, Dict[str, Any]] = {}
+        self.idle: Deque[str] = deque()
+        self.counters = {"created": 0, "claimed": 0, "misses": 0, "retired": 0}
+        self._stop = Event()
+        self._wake = Event()
+        self._thread: Optional[Thread] = None
+
+    def start(self) -> None:
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._remove_leftovers()
+        self._stop.clear()
+        self._thread = Thread(target=self._maintain_loop, name="warm-pool", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop refilling and remove idle containers; claimed ones keep running their jobs."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+        with self.lock:
+            idle = [self.slots.pop(slot_id) for slot_id in self.idle]
+            self.idle.clear()
+        for slot in idle:
+            self._retire(slot)
+
+    def claim(self, job_id: str, prompt: str) -> Optional[Tuple[str, str]]:
+        """Hand a job to an idle container. Returns (container_id, host output path) or None on a miss."""
+        with self.lock:
+            if not self.idle:
+                self.counters["misses"] += 1
+                return None
+            slot = self.slots[self.idle.popleft()]
+            slot["job_id"] = job_id
+            slot["uses"] += 1
+            self.counters["claimed"] += 1
+        self._clear_slot(slot["path"])
+        output_path = os.path.join(slot["path"], job_id)
+        handoff = os.path.join(slot["path"], HANDOFF_DIR)
+        os.makedirs(handoff, exist_ok=True)
+        with open(os.path.join(handoff, "job_id"), "w", encoding="utf-8") as f:
+            f.write(job_id)
+        with open(os.path.join(handoff, "prompt"), "w", encoding="utf-8") as f:
+            f.write(prompt)
+        with open(os.path.join(handoff, "ready"), "w", encoding="utf-8") as f:
+            f.write(str(time.time()))
+        self._wake.set()
+        logging.info(f"Job {job_id} claimed pooled container {slot['container_id'][:12]}")
+        return slot["container_id"], output_path
+
+    def forget(self, container_id: str) -> None:
+        """Drop a container from the pool once it has exited or been removed."""
+        with self.lock:
+            slot_id = next((sid for sid, s in self.slots.items() if s["container_id"] == container_id), None)
+            if slot_id is None:
+                return
+            slot = self.slots.pop(slot_id)
+            if slot_id in self.idle:
+                self.idle.remove(slot_id)
+        shutil.rmtree(slot["path"], ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "size": self.size,
+                "idle": len(self.idle),
+                "busy": len(self.slots) - len(self.idle),
+                "max_idle_seconds": self.max_idle,
+                "max_uses": self.max_uses,
+                **self.counters,
+            }
+
+    def _clear_slot(self, path: str) -> None:
+        """Remove earlier jobs' directories from a slot before handing it to the next job."""
+        try:
+            leftovers = [name for name in os.listdir(path) if name != HANDOFF_DIR]
+        except OSError:
+            return
+        for name in leftovers:
+            logging.warning(f"Removing leftover {name} from pool slot {os.path.basename(path)[:8]}")
+            target = os.path.join(path, name)
+            if os.path.isdir(target) and not os.path.islink(target):
+                shutil.rmtree(target, ignore_errors=True)
+            else:
+                os.remove(target)
+
+    def _remove_leftovers(self) -> None:
+        """Remove idle pool containers left behind by a previous orchestrator process."""
+        try:
+            leftovers = self.docker_client.containers.list(all=True, filters={"name": "agent_pool_"})
+        except Exception as e:
+            logging.warning(f"Could not list leftover pool containers: {e}")
+            return
+        for container in leftovers:
+            try:
+                container.remove(force=True)
+            except Exception:
+                pass
+
+    def _spawn(self) -> None:
+        slot_id = uuid.uuid4().hex
+        path = os.path.join(self.root_dir, slot_id)
+        os.makedirs(path, exist_ok=True)
+        with DOCKER_CALL_SECONDS.time(op="run"):
+            container = self.docker_client.containers.run(
+                self.image,
+                detach=True,
+                environment={"AGENT_WARM_POOL": "1", "AGENT_POOL_MAX_USES": str(self.max_uses)},
+                volumes={path: {"bind": POOL_MOUNT, "mode": "rw"}},
+                name=f"agent_pool_{slot_id[:8]}",
+                # Labelled so the status watcher sees it; the job is only known at claim time.
+                labels={JOB_ID_LABEL: ""},
+                **self.run_kwargs(),
+            )
+        with self.lock:
+            self.slots[slot_id] = {
+                "container_id": container.id,
+                "path": path,
+                "idle_since": time.time(),
+                "uses": 0,
+                "job_id": None,
+            }
+            self.idle.append(slot_id)
+            self.counters["created"] += 1
+
+    def _retire(self, slot: Dict[str, Any]) -> None:
+        try:
+            with DOCKER_CALL_SECONDS.time(op="remove"):
+                self.docker_client.containers.get(slot["container_id"]).remove(force=True)
+        except Exception as e:
+            logging.warning(f"Failed to remove pooled container {slot['container_id'][:12]}: {e}")
+        shutil.rmtree(slot["path"], ignore_errors=True)
+        with self.lock:
+            self.counters["retired"] += 1
+
+    def _collect_finished(self) -> None:
+        """Report jobs finished by reusable containers and put those containers back in the pool."""
+        with self.lock:
+            busy = [(sid, s) for sid, s in self.slots.items() if s["job_id"] and sid not in self.idle]
+        for slot_id, slot in busy:
+            exit_code = _read_exit_code(os.path.join(slot["path"], slot["job_id"], EXIT_FILE))
+            if exit_code is None:
+                continue
+            job_id = slot["job_id"]
+            # Report first, so the job's workspace is moved out before the slot can be claimed again.
+            self.on_job_exit(job_id, exit_code)
+            with self.lock:
+                slot["job_id"] = None
+                slot["idle_since"] = time.time()
+                if slot["uses"] < self.max_uses:
+                    self.idle.append(slot_id)
+
+    def _maintain_once(self) -> None:
+        now = time.time()
+        if self.max_uses > 1:
+            self._collect_finished()
+        with self.lock:
+            stale = [sid for sid in self.idle if now - self.slots[sid]["idle_since"] > self.max_idle]
+            for slot_id in stale:
+                self.idle.remove(slot_id)
+            stale_slots = [self.slots.pop(sid) for sid in stale]
+            missing = self.size - len(self.idle)
+        for slot in stale_slots:
+            self._retire(slot)
+        for _ in range(max(0, missing)):
+            if self._stop.is_set():
+                return
+            self._spawn()
+
+    def _maintain_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._maintain_once()
+            except Exception as e:
+                logging.error(f"Warm pool maintenance failed: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+def _read_exit_code(path: str) -> Optional[int]:
+    """Exit code the entrypoint recorded for a pooled job, or None if it is not (fully) written yet."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,131 @@
+import heapq
+import logging
+import time
+from threading import Condition, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+
+DEADLINE, IDLE, KILL = "deadline", "idle", "kill"
+
+
+class JobWatchdog:
+    """Enforces per-job wall-clock deadlines and no-output idle timeouts from a single due-time heap.
+
+    `watch` arms a running job. One background thread sleeps until the earliest due entry. An idle
+    entry re-checks `last_activity` when it comes due and is simply pushed back if the job has
+    written output since, so log traffic never touches the heap. An expired job is handed to
+    `terminate` (SIGTERM, so the entrypoint can still archive its workspace) and, if it is still
+    being watched `grace` seconds later, to `kill`. `forget` disarms a job that has stopped; stale
+    heap entries are skipped when popped.
+    """
+
+    def __init__(
+        self,
+        terminate: Callable[[str, str], None],
+        kill: Callable[[str], None],
+        last_activity: Callable[[str], Optional[float]],
+        grace: float,
+        max_sleep: float = 60.0,
+    ) -> None:
+        self.terminate = terminate
+        self.kill = kill
+        self.last_activity = last_activity
+        self.grace = grace
+        self.max_sleep = max_sleep
+        self.cond = Condition()
+        self.heap: List[Tuple[float, str, str]] = []
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.counters = {DEADLINE: 0, IDLE: 0, KILL: 0}
+        self._stopped = True
+        self._thread: Optional[Thread] = None
+
+    def watch(self, job_id: str, started: float, timeout: Optional[float], idle_timeout: Optional[float]) -> None:
+        """Arm a running job's deadline (`started + timeout`) and idle timeout; falsy values disable either."""
+        with self.cond:
+            self.jobs[job_id] = {"started": started, "idle_timeout": idle_timeout or None, "expired": None}
+            if timeout:
+                heapq.heappush(self.heap, (started + timeout, job_id, DEADLINE))
+            if idle_timeout:
+                heapq.heappush(self.heap, (started + idle_timeout, job_id, IDLE))
+            self.cond.notify_all()
+
+    def forget(self, job_id: str) -> None:
+        with self.cond:
+            self.jobs.pop(job_id, None)
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """Handle every entry due by `now`. Returns how many jobs were terminated or killed."""
+        now = time.time() if now is None else now
+        due: List[Tuple[str, str, Dict[str, Any]]] = []
+        with self.cond:
+            while self.heap and self.heap[0][0] <= now:
+                _, job_id, kind = heapq.heappop(self.heap)
+                entry = self.jobs.get(job_id)
+                if entry is not None and (kind == KILL or not entry["expired"]):
+                    due.append((job_id, kind, entry))
+        # Asked without holding self.cond: the callback may take the caller's own lock.
+        activity = {job_id: self.last_activity(job_id) for job_id, kind, _ in due if kind == IDLE}
+        actions: List[Tuple[str, str]] = []
+        with self.cond:
+            for job_id, kind, entry in due:
+                if self.jobs.get(job_id) is not entry:
+                    continue  # forgotten or re-armed meanwhile
+                if kind == KILL:
+                    del self.jobs[job_id]
+                else:
+                    if entry["expired"]:
+                        continue
+                    if kind == IDLE:
+                        last = max(entry["started"], activity[job_id] or 0.0)
+                        if now - last < entry["idle_timeout"]:
+                            heapq.heappush(self.heap, (last + entry["idle_timeout"], job_id, IDLE))
+                            continue
+                    entry["expired"] = kind
+                    heapq.heappush(self.heap, (now + self.grace, job_id, KILL))
+                self.counters[kind] += 1
+                actions.append((job_id, kind))
+        for job_id, kind in actions:
+            try:
+                if kind == KILL:
+                    self.kill(job_id)
+                else:
+                    self.terminate(job_id, kind)
+            except Exception as e:
+                logging.error(f"Watchdog failed to {'kill' if kind == KILL else 'terminate'} job {job_id}: {e}")
+        return len(actions)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.cond:
+            return {
+                "watched_jobs": len(self.jobs),
+                "timed_out": {DEADLINE: self.counters[DEADLINE], IDLE: self.counters[IDLE]},
+                "killed": self.counters[KILL],
+            }
+
+    def start(self) -> None:
+        with self.cond:
+            self._stopped = False
+        self._thread = Thread(target=self._loop, name="job-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self.cond:
+            self._stopped = True
+            self.cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _loop(self) -> None:
+        while True:
+            with self.cond:
+                if self._stopped:
+                    return
+                timeout = self.max_sleep
+                if self.heap:
+                    timeout = min(timeout, max(0.0, self.heap[0][0] - time.time()))
+                if timeout > 0:
+                    self.cond.wait(timeout)
+                if self._stopped:
+                    return
+            self.run_due()
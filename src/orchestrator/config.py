@@ -1,4 +1,5 @@
 
+import json
 import os
 
 class Config:
@@ -7,13 +8,69 @@ class Config:
     AGENT_IMAGE = os.getenv("AGENT_IMAGE", "containerized-agent:latest")
     RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "1"))
     JOBS_FILE = os.path.join(AGENT_OUTPUT_DIR, "jobs.json")
+    REAPER_BATCH_SIZE = int(os.getenv("REAPER_BATCH_SIZE", "100"))  # expired jobs deleted per reaper batch
+    JOB_STORE_BACKEND = os.getenv("JOB_STORE_BACKEND", "sqlite")  # "sqlite" or "json"
     LOGS_SUBDIR = "logs"
     CONTAINER_MEM_LIMIT = "2g"
     CONTAINER_CPU_PERIOD = 100000
     CONTAINER_CPU_QUOTA = 50000
+    # Resource size classes a job can request: memory limit and CPUs (cpu_quota = cpus * CONTAINER_CPU_PERIOD)
+    SIZE_CLASSES = {
+        "small": {"mem_limit": "1g", "cpus": 0.25},
+        "medium": {"mem_limit": CONTAINER_MEM_LIMIT, "cpus": CONTAINER_CPU_QUOTA / CONTAINER_CPU_PERIOD},
+        "large": {"mem_limit": "4g", "cpus": 1.0},
+    }
+    DEFAULT_SIZE_CLASS = "medium"
+    MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", "4"))
+    LAUNCH_PARALLELISM = int(os.getenv("LAUNCH_PARALLELISM", "8"))  # containers created concurrently by the scheduler
+    MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "1000"))  # items per POST /schedule/batch
+    WARM_POOL_SIZE = int(os.getenv("WARM_POOL_SIZE", "0"))  # 0 disables the warm pool
+    WARM_POOL_MAX_IDLE = int(os.getenv("WARM_POOL_MAX_IDLE", "900"))  # seconds before an idle container is recycled
+    WARM_POOL_MAX_USES = int(os.getenv("WARM_POOL_MAX_USES", "1"))  # jobs per pooled container before it is recycled
+    LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))  # rotate stdout.log/stderr.log at this size
+    LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "3"))
+    LOG_TAIL_LINES = 1000
+    ARTIFACT_COMPRESSION = os.getenv("ARTIFACT_COMPRESSION", "deflate")  # "deflate" or "store"
+    ARTIFACT_COMPRESSLEVEL = int(os.getenv("ARTIFACT_COMPRESSLEVEL", "6"))  # 0-9, deflate only
+    ARTIFACT_BUILD_WORKERS = int(os.getenv("ARTIFACT_BUILD_WORKERS", "2"))
+    BLOB_STORE_ENABLED = os.getenv("BLOB_STORE_ENABLED", "0") == "1"  # dedup finished workspaces via hardlinks
+    RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "0") == "1"  # reuse results of identical prompts
+    RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", str(24 * 3600)))  # seconds; also capped by RETENTION_DAYS
+    RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(10 * 1024 ** 3)))  # artifact bytes indexed
+    RESULT_CACHE_MODEL_KEY = os.getenv("RESULT_CACHE_MODEL_KEY", "")  # model/config identifier; change to invalidate
+    # Workspace templates a job can start from: name -> shell command that builds the project in /workspace,
+    # e.g. {"react-vite": "npm create vite@latest . -- --template react && npm install"}
+    WORKSPACE_TEMPLATES = json.loads(os.getenv("WORKSPACE_TEMPLATES", "{}"))
+    TEMPLATE_REFRESH_INTERVAL = int(os.getenv("TEMPLATE_REFRESH_INTERVAL", str(6 * 3600)))  # seconds between rebuilds
+    TEMPLATE_BUILD_TIMEOUT = int(os.getenv("TEMPLATE_BUILD_TIMEOUT", "1800"))  # seconds per template build
+    EXECUTION_BACKEND = os.getenv("EXECUTION_BACKEND", "docker")  # "docker" or "kubernetes"
+    STATUS_RESYNC_INTERVAL = int(os.getenv("STATUS_RESYNC_INTERVAL", "60"))  # seconds
+    JOB_TIMEOUT = int(os.getenv("JOB_TIMEOUT", "3600"))  # wall-clock seconds per job; 0 disables; per-request `timeout`
+    JOB_IDLE_TIMEOUT = int(os.getenv("JOB_IDLE_TIMEOUT", "0"))  # seconds without log output; 0 (default) disables
+    JOB_KILL_GRACE = int(os.getenv("JOB_KILL_GRACE", "30"))  # seconds from SIGTERM to SIGKILL for a timed-out job
+    LONG_POLL_MAX_WAIT = int(os.getenv("LONG_POLL_MAX_WAIT", "60"))  # seconds a GET /status?wait= may hold
+    TRANSITION_LOG_SIZE = int(os.getenv("TRANSITION_LOG_SIZE", "1000"))  # transitions kept for /events resume
+    WEBHOOK_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "5"))  # callback_url deliveries, first try included
+    WEBHOOK_BACKOFF = float(os.getenv("WEBHOOK_BACKOFF", "1.0"))  # seconds before the first retry; doubles per retry
+    WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", "10"))  # seconds per delivery attempt
+    WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "4"))
+
+    # Kubernetes backend settings (EXECUTION_BACKEND=kubernetes); defaults to the in-cluster service account
+    K8S_API_URL = os.getenv("K8S_API_URL", "")
+    K8S_NAMESPACE = os.getenv("K8S_NAMESPACE", "default")
+    K8S_TOKEN_FILE = os.getenv("K8S_TOKEN_FILE", "/var/run/secrets/kubernetes.io/serviceaccount/token")
+    K8S_CA_FILE = os.getenv("K8S_CA_FILE", "/var/run/secrets/kubernetes.io/serviceaccount/ca.crt")
+    K8S_WORKSPACE_CLAIM = os.getenv("K8S_WORKSPACE_CLAIM", "agent-workspaces")  # RWX claim also mounted at AGENT_OUTPUT_DIR
+    K8S_WATCH_TIMEOUT = int(os.getenv("K8S_WATCH_TIMEOUT", "300"))  # seconds before a pod watch is renewed
+
+    # Async API settings: thread pool sizes for blocking JobManager calls
+    LAUNCH_WORKERS = int(os.getenv("LAUNCH_WORKERS", "8"))
+    ARTIFACT_WORKERS = int(os.getenv("ARTIFACT_WORKERS", "4"))
+    STATUS_WORKERS = int(os.getenv("STATUS_WORKERS", "8"))
 
     # Health Monitor settings
-    HEALTH_CHECK_INTERVAL = 30  # seconds
+    HEALTH_MONITOR_ENABLED = os.getenv("HEALTH_MONITOR_ENABLED", "1") == "1"  # gate admission on host headroom
+    HEALTH_CHECK_INTERVAL = int(os.getenv("HEALTH_CHECK_INTERVAL", "30"))  # seconds
     CPU_WARNING_THRESHOLD = 80.0
     CPU_CRITICAL_THRESHOLD = 95.0
     MEMORY_WARNING_THRESHOLD = 80.0
@@ -1,2 +1,2 @@
 # Orchestrator utils package initialization
-from .utils import save_json, load_json 
\ No newline at end of file
+from .utils import save_json, load_json, tail_lines 
\ No newline at end of file
@@ -12,4 +12,19 @@ def load_json(path):
         return None 
     with open(path,'r',encoding='utf-8') as f:
         return  json.load(f)
-    
\ No newline at end of file
+    
+def tail_lines(path, n, block_size=8192):
+    """Return the last n lines of a file, reading backwards from EOF so memory stays bounded."""
+    if n <= 0:
+        return []
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b''
+        # n complete lines need n+1 newlines in view (the first may belong to a partial line).
+        while pos > 0 and data.count(b'\n') <= n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    return [line.decode('utf-8', errors='replace') for line in data.splitlines()[-n:]]
@@ -0,0 +1,46 @@
+import importlib
+import os
+import time
+import docker
+import pytest
+from src.orchestrator.api.job_store import SqliteJobStore
+from src.orchestrator.config import config
+from benchmarks.fake_docker import FakeDockerClient
+
+def wait_for(predicate, timeout=2.0):
+    """Poll `predicate` until it is true or `timeout` seconds pass; returns the last result."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+def wait_for_pump(manager, job_id, timeout=2.0):
+    """Wait for a job's log pump to be registered and to finish copying output."""
+    wait_for(lambda: job_id in manager.log_pumps, timeout)
+    manager.log_pumps[job_id].join(timeout=timeout)
+
+@pytest.fixture
+def fake_docker():
+    return FakeDockerClient()
+
+@pytest.fixture
+def job_manager_module(tmp_path_factory, monkeypatch):
+    """Import api.job_manager against a fake daemon; its module-level singleton would otherwise connect to Docker."""
+    output_dir = str(tmp_path_factory.mktemp("agent_jobs"))
+    monkeypatch.setenv("AGENT_OUTPUT_DIR", output_dir)
+    monkeypatch.setattr(docker, "from_env", FakeDockerClient)
+    # Admission would otherwise depend on how busy the machine running the tests is.
+    monkeypatch.setattr(config, "HEALTH_MONITOR_ENABLED", False)
+    module = importlib.import_module("src.orchestrator.api.job_manager")
+    monkeypatch.setattr(module, "OUTPUT_DIR", output_dir)
+    return module
+
+@pytest.fixture
+def manager(job_manager_module, fake_docker):
+    store = SqliteJobStore(os.path.join(job_manager_module.OUTPUT_DIR, "test_jobs.db"))
+    jm = job_manager_module.JobManager(docker_client=fake_docker, store=store)
+    yield jm
+    jm.stop()
+    store.close()
@@ -0,0 +1,198 @@
+"""In-process stand-in for the Kubernetes API server: Jobs create one pod each, pods can be listed,
+watched (with resourceVersion replay and timeoutSeconds) and have their logs followed."""
+import json
+import queue
+import re
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+JOBS_RE = re.compile(r"^/apis/batch/v1/namespaces/([^/]+)/jobs(?:/([^/]+))?$")
+PODS_RE = re.compile(r"^/api/v1/namespaces/([^/]+)/pods(?:/([^/]+)/log)?$")
+
+
+def _matches(labels: Dict[str, str], selector: str) -> bool:
+    return all(labels.get(k) == v for k, v in (term.split("=", 1) for term in selector.split(",") if term))
+
+
+class FakeKubeServer:
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.pods: Dict[str, Dict[str, Any]] = {}
+        self.logs: Dict[str, List[bytes]] = {}
+        self.history: List[Tuple[int, Dict[str, Any]]] = []
+        self.watchers: List["queue.Queue[Tuple[int, Dict[str, Any]]]"] = []
+        self.version = 0
+        self.calls: List[Tuple[str, str]] = []
+        self.stopping = False
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                server._handle(self, "GET")
+
+            def do_POST(self) -> None:
+                server._handle(self, "POST")
+
+            def do_DELETE(self) -> None:
+                server._handle(self, "DELETE")
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.stopping = True
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # Test helpers
+
+    def pod_for(self, job_name: str) -> Dict[str, Any]:
+        with self.lock:
+            return next(p for p in self.pods.values() if p["metadata"]["labels"].get("job-name") == job_name)
+
+    def write(self, job_name: str, data: bytes) -> None:
+        pod = self.pod_for(job_name)
+        with self.lock:
+            self.logs[pod["metadata"]["name"]].append(data)
+
+    def finish(self, job_name: str, exit_code: int = 0) -> None:
+        pod = self.pod_for(job_name)
+        with self.lock:
+            pod["status"] = {
+                "phase": "Succeeded" if exit_code == 0 else "Failed",
+                "containerStatuses": [{"name": "agent", "state": {"terminated": {"exitCode": exit_code}}}],
+            }
+            self._emit("MODIFIED", pod)
+
+    # Request handling
+
+    def _emit(self, kind: str, pod: Dict[str, Any]) -> None:
+        """Record a pod event at a new resourceVersion. Caller holds self.lock."""
+        self.version += 1
+        pod["metadata"]["resourceVersion"] = str(self.version)
+        event = {"type": kind, "object": json.loads(json.dumps(pod))}
+        self.history.append((self.version, event))
+        for watcher in self.watchers:
+            watcher.put((self.version, event))
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        url = urlparse(handler.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self.calls.append((method, handler.path))
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = json.loads(handler.rfile.read(length)) if length else None
+        jobs, pods = JOBS_RE.match(url.path), PODS_RE.match(url.path)
+        if jobs and method == "POST":
+            self._send(handler, 201, self._create_job(body))
+        elif jobs and method == "DELETE":
+            self._send(handler, 200 if self._delete_job(jobs.group(2)) else 404, {"kind": "Status"})
+        elif pods and pods.group(2):
+            self._stream_log(handler, pods.group(2))
+        elif pods and params.get("watch") == "true":
+            self._watch(handler, params)
+        elif pods:
+            selector = params.get("labelSelector", "")
+            with self.lock:
+                items = [p for p in self.pods.values() if _matches(p["metadata"]["labels"], selector)]
+                version = str(self.version)
+            self._send(handler, 200, {"kind": "PodList", "metadata": {"resourceVersion": version}, "items": items})
+        else:
+            self._send(handler, 404, {"kind": "Status"})
+
+    def _create_job(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        name = manifest["metadata"]["name"]
+        pod_name = f"{name}-{uuid.uuid4().hex[:5]}"
+        labels = {**manifest["spec"]["template"]["metadata"]["labels"], "job-name": name}
+        pod = {"metadata": {"name": pod_name, "labels": labels}, "spec": manifest["spec"]["template"]["spec"],
+               "status": {"phase": "Running"}}
+        with self.lock:
+            self.jobs[name] = manifest
+            self.pods[pod_name] = pod
+            self.logs[pod_name] = []
+            self._emit("ADDED", pod)
+        return manifest
+
+    def _delete_job(self, name: str) -> bool:
+        with self.lock:
+            if self.jobs.pop(name, None) is None:
+                return False
+            for pod_name in [n for n, p in self.pods.items() if p["metadata"]["labels"].get("job-name") == name]:
+                self._emit("DELETED", self.pods.pop(pod_name))
+            return True
+
+    def _send(self, handler: BaseHTTPRequestHandler, code: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        handler.send_response(code)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _start_chunked(self, handler: BaseHTTPRequestHandler) -> None:
+        handler.send_response(200)
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+
+    def _chunk(self, handler: BaseHTTPRequestHandler, data: bytes) -> None:
+        handler.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        handler.wfile.flush()
+
+    def _watch(self, handler: BaseHTTPRequestHandler, params: Dict[str, str]) -> None:
+        since = int(params.get("resourceVersion") or 0)
+        deadline = time.time() + int(params.get("timeoutSeconds", "60"))
+        selector = params.get("labelSelector", "")
+        events: "queue.Queue[Tuple[int, Dict[str, Any]]]" = queue.Queue()
+        with self.lock:
+            for item in self.history:
+                events.put(item)
+            self.watchers.append(events)
+        self._start_chunked(handler)
+        try:
+            while not self.stopping and time.time() < deadline:
+                try:
+                    version, event = events.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                if version > since and _matches(event["object"]["metadata"]["labels"], selector):
+                    self._chunk(handler, json.dumps(event).encode("utf-8") + b"\n")
+            self._chunk(handler, b"")
+        except OSError:
+            pass
+        finally:
+            with self.lock:
+                self.watchers.remove(events)
+
+    def _stream_log(self, handler: BaseHTTPRequestHandler, pod_name: str) -> None:
+        with self.lock:
+            pod = self.pods.get(pod_name)
+        if pod is None:
+            self._send(handler, 404, {"kind": "Status"})
+            return
+        self._start_chunked(handler)
+        sent = 0
+        try:
+            while not self.stopping:
+                with self.lock:
+                    chunks = self.logs.get(pod_name, [])[sent:]
+                    done = pod["status"]["phase"] in ("Succeeded", "Failed") or pod_name not in self.pods
+                for chunk in chunks:
+                    self._chunk(handler, chunk)
+                sent += len(chunks)
+                if done and not chunks:
+                    break
+                time.sleep(0.01)
+            self._chunk(handler, b"")
+        except OSError:
+            pass
@@ -0,0 +1,85 @@
+import asyncio
+import io
+import os
+import threading
+import time
+import zipfile
+import httpx
+import pytest
+from src.orchestrator.api.artifacts import ArtifactPackager, stream_zip
+
+def _workspace(tmp_path):
+    root = tmp_path / "ws"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "app.js").write_text("console.log('hi')\n" * 1000)
+    (root / "README.md").write_text("readme")
+    (root / "assets.zip").write_bytes(b"project file")
+    (root / "agent_project_job.zip").write_bytes(b"PK")
+    (root / "job_x.zip.tmp").write_bytes(b"partial")
+    return str(root)
+
+def test_stream_zip_matches_workspace(tmp_path):
+    root = _workspace(tmp_path)
+    for mode in ("deflate", "store"):
+        data = b"".join(stream_zip(root, mode, job_id="job"))
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            assert sorted(zf.namelist()) == ["README.md", "assets.zip", "src/app.js"]
+            assert zf.read("README.md") == b"readme"
+
+def test_packager_builds_once_outside_workspace(tmp_path):
+    root = _workspace(tmp_path)
+    packager = ArtifactPackager(str(tmp_path / "artifacts"), "deflate", 1, workers=2)
+    before = sorted(os.listdir(root))
+    release = threading.Event()
+    build = packager.build
+    packager.build = lambda *args: release.wait() and build(*args)
+    futures = [packager.submit("other", root) for _ in range(3)]
+    release.set()
+    assert len({id(f) for f in futures}) == 1
+    path = futures[0].result()
+    assert path == str(tmp_path / "artifacts" / "other.zip")
+    assert sorted(os.listdir(root)) == before
+    packager.shutdown()
+
+def test_packager_reuses_agent_archive(tmp_path):
+    root = _workspace(tmp_path)
+    agent_zip = os.path.join(root, "agent_project_job.zip")
+    packager = ArtifactPackager(str(tmp_path / "artifacts"), "store", None, workers=1)
+    assert packager.build("job", root) == agent_zip
+    packager.shutdown()
+
+@pytest.fixture
+def completed_job(manager, fake_docker):
+    manager.start()
+    job_id = manager.submit_job("build")
+    deadline = time.time() + 2
+    while manager.jobs[job_id]["status"] != "running" and time.time() < deadline:
+        time.sleep(0.01)
+    with open(os.path.join(manager.jobs[job_id]["output_path"], "index.html"), "w") as f:
+        f.write("<html></html>" * 100)
+    fake_docker.finish(manager.jobs[job_id]["container_id"], 0)
+    while not manager.jobs[job_id].get("artifact") and time.time() < deadline:
+        time.sleep(0.01)
+    return job_id
+
+def test_download_etag_and_range(manager, completed_job, monkeypatch):
+    from src.orchestrator.api import orchestrator
+    from src.orchestrator.api.async_job_manager import AsyncJobManager
+    monkeypatch.setattr(orchestrator, "job_manager", manager)
+    monkeypatch.setattr(orchestrator, "async_job_manager", AsyncJobManager(manager))
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=orchestrator.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            full = await client.get(f"/download/{completed_job}")
+            cached = await client.get(f"/download/{completed_job}", headers={"If-None-Match": full.headers["etag"]})
+            partial = await client.get(f"/download/{completed_job}", headers={"Range": "bytes=0-9"})
+            streamed = await client.get(f"/download/{completed_job}", params={"stream": "true", "compression": "store"})
+            return full, cached, partial, streamed
+
+    full, cached, partial, streamed = asyncio.run(scenario())
+    assert full.status_code == 200 and full.content.startswith(b"PK")
+    assert cached.status_code == 304
+    assert partial.status_code == 206 and partial.content == full.content[:10]
+    with zipfile.ZipFile(io.BytesIO(streamed.content)) as zf:
+        assert "index.html" in zf.namelist()
@@ -0,0 +1,197 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import httpx
+import pytest
+from tests.orchestrator.conftest import wait_for, wait_for_pump
+
+@pytest.fixture
+def api(manager, monkeypatch):
+    from src.orchestrator.api import orchestrator
+    from src.orchestrator.api.async_job_manager import AsyncJobManager
+    async_manager = AsyncJobManager(manager, {"launch": 2, "artifacts": 2, "status": 2})
+    monkeypatch.setattr(orchestrator, "job_manager", manager)
+    monkeypatch.setattr(orchestrator, "async_job_manager", async_manager)
+    yield orchestrator.app
+    async_manager.shutdown()
+
+def test_status_not_blocked_by_slow_downloads(api, manager, job_manager_module, monkeypatch):
+    manager.start()
+    job_id = manager.submit_job("existing")
+    finished = manager.submit_job("finished")
+    build = manager.packager.build
+
+    def slow_build(*args):
+        time.sleep(0.5)
+        return build(*args)
+
+    monkeypatch.setattr(manager.packager, "build", slow_build)
+    with manager.lock:
+        manager.jobs[finished]["status"] = "complete"
+    os.makedirs(manager.jobs[finished]["output_path"], exist_ok=True)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=api)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            downloads = [asyncio.create_task(client.get(f"/download/{finished}")) for _ in range(6)]
+            await asyncio.sleep(0.05)
+            start = time.perf_counter()
+            root = await client.get("/")
+            status = await client.get(f"/status/{job_id}")
+            elapsed = time.perf_counter() - start
+            await asyncio.gather(*downloads)
+            return root, status, elapsed
+
+    root, status, elapsed = asyncio.run(scenario())
+    assert root.status_code == 200
+    assert status.json()["status"] in ("pending", "running")
+    assert elapsed < 0.25
+
+def test_log_stream_resumes_from_offset(api, manager, fake_docker):
+    manager.start()
+    job_id = manager.submit_job("hello")
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "running")
+    container = fake_docker.containers.get(manager.jobs[job_id]["container_id"])
+    container.write(b"first\nsecond\n")
+    fake_docker.finish(container.id, 0)
+    wait_for_pump(manager, job_id)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=api)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            stream = await client.get(f"/logs/{job_id}/stream", headers={"Last-Event-ID": "6"})
+            return stream, await client.get(f"/logs/{job_id}"), await client.get(f"/logs/{job_id}?full=false")
+
+    stream, logs, tail_only = asyncio.run(scenario())
+    assert logs.json()["full_log"] == "first\nsecond\n" and logs.json()["last_1000_lines"] == "first\nsecond"
+    assert tail_only.json()["full_log"] is None
+    body = stream.text
+    assert body.startswith("id: 13\ndata: second\ndata: \n\n")
+    assert "event: end" in body
+
+def test_list_jobs_while_submitting(api, manager):
+    stop = threading.Event()
+
+    def submit_forever():
+        while not stop.is_set():
+            manager.submit_job("burst")
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=api)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            listings = [await client.get("/jobs") for _ in range(20)]
+            details = await client.get(f"/job/{listings[-1].json()['jobs'][0]['job_id']}")
+            return listings, details
+
+    submitter = threading.Thread(target=submit_forever)
+    submitter.start()
+    try:
+        listings, details = asyncio.run(scenario())
+    finally:
+        stop.set()
+        submitter.join()
+    assert all(r.status_code == 200 for r in listings)
+    assert details.json()["prompt"] == "burst"
+
+def test_jobs_pagination_filters_and_etag(api, manager):
+    job_ids = [manager.submit_job(f"p{i}") for i in range(5)]
+    with manager.lock:
+        manager.jobs[job_ids[0]]["status"] = "cancelled"
+        manager._save_job(job_ids[0])
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=api)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.get("/jobs", params={"limit": 3, "fields": "status,prompt"})
+            second = await client.get("/jobs", params={"limit": 3, "cursor": first.json()["next_cursor"]})
+            cached = await client.get(
+                "/jobs", params={"limit": 3, "fields": "status,prompt"}, headers={"If-None-Match": first.headers["etag"]}
+            )
+            cancelled = await client.get("/jobs", params={"status": "cancelled"})
+            bad = await client.get("/jobs", params={"cursor": "garbage"})
+            return first, second, cached, cancelled, bad
+
+    first, second, cached, cancelled, bad = asyncio.run(scenario())
+    assert [job["job_id"] for job in first.json()["jobs"]] == job_ids[:1:-1]
+    assert set(first.json()["jobs"][0]) == {"job_id", "status", "prompt"}
+    assert [job["job_id"] for job in second.json()["jobs"]] == job_ids[1::-1]
+    assert second.json()["next_cursor"] is None
+    assert cached.status_code == 304
+    assert [job["job_id"] for job in cancelled.json()["jobs"]] == [job_ids[0]]
+    assert bad.status_code == 400
+
+def test_metrics_endpoint_reports_hot_paths(api, manager, fake_docker):
+    manager.start()
+    job_id = manager.submit_job("hello")
+    deadline = time.time() + 2
+    while manager.jobs[job_id]["status"] != "running" and time.time() < deadline:
+        time.sleep(0.01)
+    fake_docker.finish(manager.jobs[job_id]["container_id"], 3)
+    while manager.jobs[job_id]["status"] != "complete" and time.time() < deadline:
+        time.sleep(0.01)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=api)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get(f"/status/{job_id}")
+            return await client.get("/metrics")
+
+    text = asyncio.run(scenario()).text
+    assert 'orchestrator_docker_call_seconds_count{op="run"}' in text
+    assert 'orchestrator_job_store_write_seconds_count{op="upsert"}' in text
+    assert 'orchestrator_lock_wait_seconds_bucket{lock="job_manager",le="+Inf"}' in text
+    assert 'orchestrator_job_duration_seconds_count{exit_code="3"}' in text
+    assert 'orchestrator_http_request_seconds_count{method="GET",route="/status/{job_id}",status="200"}' in text
+    assert 'orchestrator_jobs{status="complete"} 1' in text
+    assert 'orchestrator_scheduler_jobs{state="running"} 0' in text
+
+def test_batch_schedule_launches_in_parallel(api, manager, fake_docker):
+    fake_docker.run_latency = 0.2
+    manager.scheduler.max_concurrent = 8
+    writes = []
+    upsert_many = manager.store.upsert_many
+    manager.store.upsert_many = lambda jobs: writes.append(len(jobs)) or upsert_many(jobs)
+    manager.start()
+    items = [{"prompt": f"p{i}", "metadata": {"row": i}} for i in range(7)]
+    items.insert(3, {"prompt": "too big", "size": "huge"})
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=api)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/schedule/batch", json={"items": items})
+
+    start = time.perf_counter()
+    body = asyncio.run(scenario()).json()
+    assert body["scheduled"] == 7 and body["failed"] == 1
+    assert "huge" in body["jobs"][3]["error"] and body["jobs"][3]["job_id"] is None
+    assert writes == [7]
+    job_ids = [result["job_id"] for result in body["jobs"] if result["job_id"]]
+    assert manager.jobs[job_ids[4]]["metadata"] == {"row": 4}
+    assert wait_for(lambda: all(manager.jobs[j]["status"] == "running" for j in job_ids), timeout=1.0)
+    assert time.perf_counter() - start < 7 * 0.2  # serial launches would take at least 1.4s
+
+def test_status_long_poll_and_event_stream_follow_transitions(api, manager, fake_docker):
+    manager.start()
+    job_id = manager.submit_job("hello")
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "running")
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=api)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            poll = asyncio.create_task(client.get(f"/status/{job_id}", params={"wait": 5, "last_status": "running"}))
+            stream = asyncio.create_task(client.get("/events", params={"job_id": job_id}))
+            await asyncio.sleep(0.2)
+            start = time.perf_counter()
+            fake_docker.finish(manager.jobs[job_id]["container_id"], 0)
+            polled, streamed = await asyncio.gather(poll, stream)
+            stale = await client.get(f"/status/{job_id}", params={"wait": 5, "last_status": "pending"})
+            return polled, streamed, stale, time.perf_counter() - start
+
+    polled, streamed, stale, elapsed = asyncio.run(scenario())
+    assert polled.json()["status"] == "complete"
+    assert elapsed < 1.0
+    statuses = [json.loads(line[6:])["status"] for line in streamed.text.splitlines() if line.startswith("data: ")]
+    assert statuses == ["running", "complete"]
+    assert stale.json()["status"] == "complete"  # already past the status the client had: no wait
@@ -0,0 +1,42 @@
+import asyncio
+import json
+import pytest
+from benchmarks import bench_api
+from tests.orchestrator.conftest import wait_for
+
+@pytest.fixture
+def api(manager, monkeypatch):
+    from src.orchestrator.api import orchestrator
+    from src.orchestrator.api.async_job_manager import AsyncJobManager
+    async_manager = AsyncJobManager(manager, {"launch": 2, "artifacts": 2, "status": 2})
+    monkeypatch.setattr(orchestrator, "job_manager", manager)
+    monkeypatch.setattr(orchestrator, "async_job_manager", async_manager)
+    yield orchestrator.app
+    async_manager.shutdown()
+
+def test_scenario_reports_percentiles_per_endpoint(api, manager, fake_docker):
+    manager.start()
+    mix = bench_api.parse_pairs(bench_api.DEFAULT_MIX)
+    result = asyncio.run(bench_api.run_scenario(
+        api, manager, fake_docker, concurrency=4, history=200, duration=0.5, mix=mix,
+        latencies={"get": 0.001}, failure_rates={"run": 0.5}, job_duration=0.05,
+        finished_jobs=2, artifact_kb=4, log_lines=10, seed=1,
+    ))
+    json.dumps(result)
+    assert set(result["endpoints"]) == set(bench_api.ENDPOINTS)
+    for summary in result["endpoints"].values():
+        assert summary["requests"] > 0 and summary["errors"] == 0
+        assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"] <= summary["max_ms"]
+    assert result["total"]["requests"] == sum(s["requests"] for s in result["endpoints"].values())
+    # Launches fail in the fake daemon, not in the API: /schedule still answers and the job errors.
+    assert result["injected_failures"]["run"] > 0
+    assert wait_for(lambda: manager.store.count_by_status().get("error", 0) >= result["injected_failures"]["run"])
+
+def test_compare_flags_p95_change():
+    def report(p95):
+        endpoint = {"p95_ms": p95, "throughput_rps": 10.0}
+        return {"scenarios": [{"concurrency": 8, "history": 0, "endpoints": {"status": endpoint}}]}
+
+    [change] = bench_api.compare(report(15.0), report(10.0))
+    assert change["endpoint"] == "status" and change["p95_change_pct"] == 50.0
+    assert bench_api.percentile([4, 1, 3, 2], 50) == 2 and bench_api.percentile([1, 2, 3], 99) == 3
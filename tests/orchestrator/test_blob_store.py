@@ -0,0 +1,71 @@
+import os
+from src.orchestrator.api.blob_store import BlobStore
+from src.orchestrator.config import config
+from tests.orchestrator.conftest import wait_for
+
+def _workspace(root, unique):
+    os.makedirs(os.path.join(root, "node_modules", "react"))
+    with open(os.path.join(root, "node_modules", "react", "index.js"), "w") as f:
+        f.write("module.exports = {};\n" * 500)
+    with open(os.path.join(root, "app.js"), "w") as f:
+        f.write(unique)
+    os.makedirs(os.path.join(root, "logs"))
+    with open(os.path.join(root, "logs", "stdout.log"), "w") as f:
+        f.write("live log")
+    return root
+
+def test_ingest_links_identical_files_and_reports_savings(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    a = _workspace(str(tmp_path / "a"), "a")
+    b = _workspace(str(tmp_path / "b"), "bb")
+    store.ingest("a", a, exclude=["logs"])
+    store.ingest("b", b, exclude=["logs"])
+    shared = os.path.join("node_modules", "react", "index.js")
+    assert os.path.samefile(os.path.join(a, shared), os.path.join(b, shared))
+    assert os.stat(os.path.join(a, "logs", "stdout.log")).st_nlink == 1
+    report = store.report()
+    assert report["jobs"] == 2 and report["blobs"] == 3
+    assert report["bytes_saved"] == os.path.getsize(os.path.join(a, shared))
+    assert report["dedup_ratio"] > 1.9
+
+def test_release_refcounts_blobs_and_survives_restart(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    a = _workspace(str(tmp_path / "a"), "a")
+    b = _workspace(str(tmp_path / "b"), "bb")
+    manifest = store.ingest("a", a)
+    store.ingest("b", b)
+    store = BlobStore(str(tmp_path / "blobs"))
+    assert store.report()["jobs"] == 2
+    store.release("a")
+    shared = manifest["files"][os.path.join("node_modules", "react", "index.js")]["sha256"]
+    assert os.path.exists(store.blob_path(shared))
+    assert not os.path.exists(store.blob_path(manifest["files"]["app.js"]["sha256"]))
+    store.release("b")
+    assert store.report() == {
+        "jobs": 0, "blobs": 0, "logical_bytes": 0, "stored_bytes": 0, "bytes_saved": 0, "dedup_ratio": None
+    }
+
+def test_restore_rebuilds_workspace_from_manifest(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    a = _workspace(str(tmp_path / "a"), "a")
+    store.ingest("a", a, exclude=["logs"])
+    dest = str(tmp_path / "restored")
+    assert store.restore("a", dest) == 2
+    with open(os.path.join(dest, "app.js")) as f:
+        assert f.read() == "a"
+
+def test_completed_jobs_are_deduplicated(job_manager_module, fake_docker, monkeypatch, tmp_path):
+    from src.orchestrator.api.job_store import SqliteJobStore
+    monkeypatch.setattr(config, "BLOB_STORE_ENABLED", True)
+    manager = job_manager_module.JobManager(docker_client=fake_docker, store=SqliteJobStore(str(tmp_path / "j.db")))
+    manager.start()
+    try:
+        job_id = manager.submit_job("build")
+        assert wait_for(lambda: manager.jobs[job_id]["status"] == "running")
+        with open(os.path.join(manager.jobs[job_id]["output_path"], "index.html"), "w") as f:
+            f.write("<html></html>")
+        fake_docker.finish(manager.jobs[job_id]["container_id"], 0)
+        assert wait_for(lambda: manager.blobs.has_manifest(job_id))
+        assert manager.storage_report()["jobs"] == 1
+    finally:
+        manager.stop()
@@ -0,0 +1,90 @@
+import time
+import pytest
+from src.orchestrator.api.health_monitor import HealthMonitor, container_usage, parse_bytes
+from src.orchestrator.api.job_store import SqliteJobStore
+from src.orchestrator.config import config
+from tests.orchestrator.conftest import wait_for
+from benchmarks.fake_docker import FakeDockerClient
+
+GB = 1024 ** 3
+THRESHOLDS = {"cpu": (80.0, 95.0), "memory": (80.0, 95.0), "disk": (85.0, 95.0)}
+
+class FakeSampler:
+    def __init__(self, memory_used=2 * GB, cpu_used=1.0):
+        self.host = {"cpu_count": 4, "cpu_used": cpu_used, "memory_total": 10 * GB,
+                     "memory_used": memory_used, "disk_total": 100, "disk_used": 10}
+
+    def sample(self):
+        return dict(self.host)
+
+def test_parse_bytes_and_container_usage():
+    assert parse_bytes("2g") == 2 * GB
+    assert parse_bytes("512m") == 512 * 1024 ** 2
+    assert parse_bytes(1000) == 1000
+    stats = {
+        "cpu_stats": {"cpu_usage": {"total_usage": 300}, "system_cpu_usage": 1000, "online_cpus": 4},
+        "precpu_stats": {"cpu_usage": {"total_usage": 100}, "system_cpu_usage": 600},
+        "memory_stats": {"usage": 500, "stats": {"inactive_file": 100}},
+    }
+    assert container_usage(stats) == (2.0, 400)
+    assert container_usage({"memory_stats": {}}) is None
+
+def test_admission_projects_unsampled_reservations():
+    monitor = HealthMonitor("/", 60, THRESHOLDS, sampler=FakeSampler(memory_used=4 * GB))
+    assert monitor.can_admit(0.5, 1 * GB)  # nothing sampled yet: fail open
+    monitor.sample_once()
+    assert monitor.can_admit(0.5, 3 * GB)  # 70% projected
+    assert not monitor.can_admit(0.5, 4 * GB)  # 80% projected
+    assert "memory" in monitor.headroom()["admission_blocked_by"]
+    fake = FakeDockerClient()
+    container = fake.containers.run("img", detach=True)
+    container.usage = {"cpus": 0.1, "memory": 0}
+    monitor.watch("job", container, 0.5, 3 * GB)
+    # Until the stats stream reports, the full 3g request counts as used.
+    monitor.jobs["job"]["current"] = None
+    assert not monitor.can_admit(0.5, 1 * GB)
+    assert wait_for(lambda: monitor.jobs["job"]["current"] is not None)
+    # The host sample predates the job's first stats sample, so it cannot include the job's usage yet.
+    assert not monitor.can_admit(0.5, 1 * GB)
+    monitor.sample_once()
+    assert monitor.can_admit(0.5, 1 * GB)
+    assert monitor.unwatch("job") == {"cpus": 0.1, "memory_bytes": 0}
+    fake.finish(container.id)
+
+@pytest.fixture
+def monitored_manager(job_manager_module, fake_docker, monkeypatch):
+    monkeypatch.setattr(config, "HEALTH_MONITOR_ENABLED", True)
+    store = SqliteJobStore(f"{job_manager_module.OUTPUT_DIR}/monitored.db")
+    jm = job_manager_module.JobManager(docker_client=fake_docker, store=store)
+    jm.monitor.sampler = FakeSampler()
+    jm.scheduler.retry_interval = 0.05
+    yield jm
+    jm.stop()
+    store.close()
+
+def test_size_class_limits_admission_and_peak_usage(monitored_manager, fake_docker):
+    jm = monitored_manager
+    jm.start()
+    with pytest.raises(ValueError):
+        jm.submit_job("hello", size="huge")
+    jm.monitor.sampler.host["memory_used"] = 6 * GB
+    jm.monitor.sample_once()
+    blocked = jm.submit_job("big", size="large")  # 6g + 4g would be 100% of memory
+    small = jm.submit_job("small", size="small")
+    time.sleep(0.2)
+    assert jm.jobs[blocked]["status"] == "pending"
+    assert jm.jobs[small]["status"] == "pending"  # held behind the queue head
+    jm.monitor.sampler.host["memory_used"] = 2 * GB
+    jm.monitor.sample_once()
+    assert wait_for(lambda: jm.jobs[blocked]["status"] == "running")
+    container = fake_docker.containers_by_id[jm.jobs[blocked]["container_id"]]
+    assert container.kwargs["mem_limit"] == "4g"
+    assert container.kwargs["cpu_quota"] == config.CONTAINER_CPU_PERIOD
+    container.usage = {"cpus": 0.75, "memory": GB}
+    assert wait_for(lambda: (jm.health_report()["jobs"][blocked]["peak"] or {}).get("cpus") == 0.75)
+    assert jm.health_report()["jobs"][blocked]["size"] == "large"
+    container.usage = {"cpus": 0.25, "memory": GB // 2}
+    fake_docker.finish(container.id, 0)
+    assert wait_for(lambda: jm.jobs[blocked].get("peak_usage"))
+    assert jm.jobs[blocked]["peak_usage"] == {"cpus": 0.75, "memory_bytes": GB}
+    assert blocked not in jm.health_report()["jobs"]
@@ -0,0 +1,99 @@
+import json
+import os
+import sqlite3
+import tempfile
+import pytest
+from src.orchestrator.api.job_store import (
+    SCHEMA_MIGRATIONS, JobStore, JsonJobStore, SqliteJobStore, create_job_store, decode_cursor, encode_cursor,
+)
+
+def _job(status="running", created=1.0):
+    return {"container_id": "abc", "status": status, "created": created, "error": None}
+
+def test_sqlite_upsert_and_load():
+    with tempfile.TemporaryDirectory() as d:
+        store = SqliteJobStore(os.path.join(d, "jobs.db"))
+        store.upsert("a", _job())
+        store.upsert("a", _job(status="complete"))
+        store.upsert_many({"b": _job(), "c": _job()})
+        assert store.count() == 3
+        assert store.get("a")["status"] == "complete"
+        store.delete_many(["b", "c"])
+        assert list(store.load_all()) == ["a"]
+        store.close()
+
+def test_sqlite_uses_wal():
+    with tempfile.TemporaryDirectory() as d:
+        store = SqliteJobStore(os.path.join(d, "jobs.db"))
+        assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        store.close()
+
+def test_json_store_roundtrip():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "jobs.json")
+        store = JsonJobStore(path)
+        store.upsert("a", _job())
+        assert JsonJobStore(path).load_all() == {"a": _job()}
+
+def test_create_sqlite_store_imports_legacy_json():
+    with tempfile.TemporaryDirectory() as d:
+        with open(os.path.join(d, "jobs.json"), "w", encoding="utf-8") as f:
+            json.dump({"a": _job(), "b": _job(status="complete")}, f)
+        store = create_job_store("sqlite", d)
+        assert store.count() == 2
+        assert not os.path.exists(os.path.join(d, "jobs.json"))
+        assert os.path.exists(os.path.join(d, "jobs.json.imported"))
+        store.close()
+
+def test_job_store_is_abstract():
+    with pytest.raises(TypeError):
+        JobStore()
+
+def _seed(store):
+    statuses = ["running", "complete", "error"]
+    store.upsert_many({f"job-{i:02d}": _job(statuses[i % 3], created=float(i // 2)) for i in range(12)})
+
+def test_query_pages_newest_first_with_filters():
+    with tempfile.TemporaryDirectory() as d:
+        for store in (SqliteJobStore(os.path.join(d, "jobs.db")), JsonJobStore(os.path.join(d, "jobs.json"))):
+            _seed(store)
+            first = store.query(limit=5)
+            assert [job_id for job_id, _ in first] == ["job-11", "job-10", "job-09", "job-08", "job-07"]
+            after = (first[-1][1]["created"], first[-1][0])
+            assert [job_id for job_id, _ in store.query(after=after, limit=3)] == ["job-06", "job-05", "job-04"]
+            complete = store.query(statuses=["complete"], created_from=1.0, created_to=5.0)
+            assert [job_id for job_id, _ in complete] == ["job-07", "job-04"]
+            store.close()
+
+def test_sqlite_query_uses_index():
+    with tempfile.TemporaryDirectory() as d:
+        store = SqliteJobStore(os.path.join(d, "jobs.db"))
+        plan = store.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT job_id, data FROM jobs WHERE status IN (?) AND created < ? "
+            "ORDER BY created DESC, job_id DESC LIMIT ?", ("running", 10.0, 5)
+        ).fetchall()
+        assert any("idx_jobs_status_created" in row[-1] for row in plan)
+        store.close()
+
+def test_sqlite_schema_migrates_unversioned_database_once():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "jobs.db")
+        conn = sqlite3.connect(path)
+        for statement in SCHEMA_MIGRATIONS[0]:  # a database from before schema versioning
+            conn.execute(statement)
+        conn.execute("INSERT INTO jobs VALUES ('a', 'running', 1.0, '{}')")
+        conn.commit()
+        conn.close()
+        store = SqliteJobStore(path)
+        indexes = {row[0] for row in store.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_jobs_status_created", "idx_jobs_created_id"} <= indexes
+        assert not {"idx_jobs_status", "idx_jobs_created"} & indexes
+        assert store.conn.execute("PRAGMA user_version").fetchone()[0] == len(SCHEMA_MIGRATIONS)
+        assert store.count() == 1
+        store.close()
+        SqliteJobStore(path).close()  # already current: nothing to run
+
+def test_cursor_roundtrip_and_rejects_garbage():
+    assert decode_cursor(encode_cursor((12.5, "job-1"))) == (12.5, "job-1")
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
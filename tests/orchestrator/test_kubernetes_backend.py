@@ -0,0 +1,78 @@
+import asyncio
+import os
+import httpx
+import pytest
+from src.orchestrator.api.K8Manager import KubeApi, KubernetesBackend, pod_state
+from src.orchestrator.api.job_store import SqliteJobStore
+from src.orchestrator.config import config
+from tests.orchestrator.conftest import wait_for, wait_for_pump
+from tests.orchestrator.fake_kube import FakeKubeServer
+
+@pytest.fixture
+def kube():
+    server = FakeKubeServer()
+    yield server
+    server.close()
+
+@pytest.fixture
+def kube_manager(job_manager_module, kube, tmp_path):
+    backend = KubernetesBackend(KubeApi(kube.url, "agents", token="t0ken"), "agent:test", "workspaces", watch_timeout=1)
+    jm = job_manager_module.JobManager(store=SqliteJobStore(str(tmp_path / "j.db")), backend=backend)
+    jm.start()
+    yield jm
+    jm.stop()
+    jm.store.close()
+
+def test_pod_state_mapping():
+    assert pod_state({"status": {"phase": "Pending"}}) == ("running", None)
+    assert pod_state({"status": {"phase": "Failed", "containerStatuses": [
+        {"name": "agent", "state": {"terminated": {"exitCode": 3}}}]}}) == ("exited", 3)
+    assert pod_state({"status": {"phase": "Succeeded"}}) == ("exited", 0)
+
+def test_job_runs_as_kubernetes_job_with_watch_driven_status(kube_manager, kube):
+    jm = kube_manager
+    assert wait_for(lambda: jm.watcher.healthy)
+    job_id = jm.submit_job("hello", size="large")
+    assert wait_for(lambda: jm.get_status(job_id) == "running")
+    name = jm.jobs[job_id]["container_id"]
+    container = kube.jobs[name]["spec"]["template"]["spec"]["containers"][0]
+    assert container["resources"]["limits"] == {"cpu": "1.0", "memory": "4Gi"}
+    assert {"name": "JOB_PROMPT", "value": "hello"} in container["env"]
+    assert container["volumeMounts"][0]["subPath"] == job_id
+    kube.write(name, b"working\n")
+    kube.finish(name, 3)
+    assert wait_for(lambda: jm.get_status(job_id) == "complete")
+    assert jm.jobs[job_id]["exit_code"] == 3
+    wait_for_pump(jm, job_id)
+    with open(os.path.join(jm.jobs[job_id]["logs_path"], "stdout.log"), "rb") as f:
+        assert f.read() == b"working\n"
+    # Status came from the watch: one listing to seed it and one to reconcile at startup, no per-job polling.
+    assert len([path for method, path in kube.calls if "watch" not in path and path.endswith("managed-by%3Dagent-orchestrator")]) == 2
+
+def test_cancel_deletes_the_kubernetes_job(kube_manager, kube):
+    jm = kube_manager
+    job_id = jm.submit_job("long task")
+    assert wait_for(lambda: jm.jobs[job_id]["status"] == "running")
+    name = jm.jobs[job_id]["container_id"]
+    assert jm.cancel_job(job_id)
+    assert name not in kube.jobs
+    assert jm.get_status(job_id) == "cancelled"
+
+def test_templates_are_rejected_up_front(job_manager_module, kube, tmp_path, monkeypatch):
+    from src.orchestrator.api import orchestrator
+    monkeypatch.setattr(config, "WORKSPACE_TEMPLATES", {"react-vite": "npm install"})
+    backend = KubernetesBackend(KubeApi(kube.url, "agents", token="t0ken"), "agent:test", "workspaces", watch_timeout=1)
+    jm = job_manager_module.JobManager(store=SqliteJobStore(str(tmp_path / "j.db")), backend=backend)
+    assert jm.templates is None
+    with pytest.raises(ValueError):
+        jm.submit_job("hello", template="react-vite")
+    [result] = jm.submit_jobs([{"prompt": "hello", "template": "react-vite"}])
+    assert result["error"] and not jm.jobs
+    monkeypatch.setattr(orchestrator, "job_manager", jm)
+
+    async def get_templates():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=orchestrator.app), base_url="http://test") as client:
+            return await client.get("/templates")
+
+    assert asyncio.run(get_templates()).status_code == 400
+    jm.store.close()
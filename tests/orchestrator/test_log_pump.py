@@ -0,0 +1,63 @@
+import os
+import time
+from src.orchestrator.api.log_pump import RotatingLogWriter, read_from_offset, tail_log
+from src.orchestrator.utils import tail_lines
+from tests.orchestrator.conftest import wait_for, wait_for_pump
+
+def test_tail_lines_reads_backwards(tmp_path):
+    path = tmp_path / "big.log"
+    path.write_bytes(b"".join(f"line {i}\n".encode() for i in range(10000)))
+    assert tail_lines(str(path), 3, block_size=16) == ["line 9997", "line 9998", "line 9999"]
+    assert tail_lines(str(path), 0) == []
+
+def test_rotation_keeps_absolute_offsets(tmp_path):
+    path = str(tmp_path / "stdout.log")
+    writer = RotatingLogWriter(path, max_bytes=10, backup_count=2)
+    for i in range(6):
+        writer.write(f"line{i}\n".encode())  # 6 bytes each: every write after the first rotates
+    writer.close()
+    assert os.path.exists(path + ".2") and not os.path.exists(path + ".3")
+    # Offsets 0-17 were rotated away; a stale offset resumes at the oldest surviving byte.
+    assert read_from_offset(path, 0, 100) == (b"line3\n", 24)
+    assert read_from_offset(path, 30, 100) == (b"line5\n", 36)
+    assert read_from_offset(path, 36, 100) == (b"", 36)
+    assert tail_log(path, 2) == "line4\nline5"
+
+def test_pump_demuxes_container_output(manager, fake_docker):
+    manager.start()
+    job_id = manager.submit_job("hello")
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "running")
+    container = fake_docker.containers.get(manager.jobs[job_id]["container_id"])
+    container.write(b"hello\n")
+    container.write(b"oops\n", stream="stderr")
+    container.write(b"world\n")
+    fake_docker.finish(container.id, 0)
+    wait_for_pump(manager, job_id)
+    assert manager.get_logs(job_id) == "hello\nworld"
+    assert manager.get_logs(job_id, "stderr") == "oops"
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "complete")
+    assert manager.read_log(job_id, "stdout", 6) == (b"world\n", 12, False)
+    assert manager.read_log(job_id, "stdout", 12) == (b"", 12, True)
+
+def test_pooled_job_logs_skip_previous_output_and_stop(job_manager_module, fake_docker, monkeypatch, tmp_path):
+    from src.orchestrator.api.job_store import SqliteJobStore
+    from src.orchestrator.config import config
+    monkeypatch.setattr(config, "WARM_POOL_SIZE", 1)
+    monkeypatch.setattr(config, "WARM_POOL_MAX_USES", 2)
+    manager = job_manager_module.JobManager(docker_client=fake_docker, store=SqliteJobStore(str(tmp_path / "j.db")))
+    manager.start()
+    try:
+        assert wait_for(lambda: manager.pool.stats()["idle"] == 1)
+        container = next(iter(fake_docker.containers_by_id.values()))
+        container.write(b"previous job\n")
+        time.sleep(0.01)
+        job_id = manager.submit_job("hello")
+        assert wait_for(lambda: manager.jobs[job_id]["status"] == "running")
+        container.write(b"this job\n")
+        assert wait_for(lambda: manager.get_logs(job_id) == "this job")
+        manager._on_pooled_job_exit(job_id, 0)
+        manager.log_pumps[job_id].join(timeout=2)
+        assert not manager.log_pumps[job_id].alive
+        assert container.status == "running"
+    finally:
+        manager.stop()
@@ -0,0 +1,30 @@
+import threading
+import time
+from src.orchestrator.api.metrics import Counter, Gauge, Histogram, Registry, TimedLock
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    hist = registry.register(Histogram("op_seconds", "Op latency.", ["op"], buckets=(0.1, 1.0)))
+    for value in (0.05, 0.5, 5.0):
+        hist.observe(value, op="run")
+    registry.register(Gauge("things", "Things.", ["kind"], lambda: {("a",): 2}))
+    registry.register(Counter("freed_bytes_total", "Freed.")).inc(512)
+    lines = registry.render().splitlines()
+    assert 'op_seconds_bucket{op="run",le="0.1"} 1' in lines
+    assert 'op_seconds_bucket{op="run",le="1"} 2' in lines
+    assert 'op_seconds_bucket{op="run",le="+Inf"} 3' in lines
+    assert 'op_seconds_count{op="run"} 3' in lines
+    assert 'things{kind="a"} 2' in lines
+    assert "# TYPE freed_bytes_total counter" in lines and "freed_bytes_total 512" in lines
+
+def test_timed_lock_records_contention():
+    hist = Histogram("wait_seconds", "Wait.", ["lock"])
+    lock = TimedLock(hist, "jobs")
+    lock.acquire()
+    waiter = threading.Thread(target=lambda: lock.acquire() and lock.release())
+    waiter.start()
+    time.sleep(0.05)
+    lock.release()
+    waiter.join()
+    count, total = hist.snapshot(lock="jobs")
+    assert count == 2 and total >= 0.04
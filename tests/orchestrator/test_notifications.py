@@ -0,0 +1,76 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.orchestrator.api.notifications import TransitionFeed
+from tests.orchestrator.conftest import wait_for
+
+@pytest.fixture
+def receiver():
+    """Local webhook endpoint answering with the queued status codes (then 200), recording each body."""
+    received, codes = [], [503]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(codes.pop(0) if codes else 200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/hook", received, codes
+    server.shutdown()
+    server.server_close()
+
+def test_feed_replays_buffered_events_after_last_id():
+    feed = TransitionFeed(maxlen=3)
+    for status in ("pending", "running", "complete"):
+        feed.publish("a", status, None)
+    feed.publish("b", "pending", None)
+
+    async def scenario():
+        events = feed.subscribe("a", after=1)
+        replayed = [events.get_nowait() for _ in range(events.qsize())]
+        feed.publish("a", "cancelled", "complete")
+        await asyncio.sleep(0)
+        return replayed, events.get_nowait()
+
+    replayed, live = asyncio.run(scenario())
+    # The buffer holds only the last three events, so the first one is gone anyway.
+    assert [event["status"] for event in replayed] == ["running", "complete"]
+    assert live["id"] == 5 and live["previous"] == "complete"
+
+def test_completion_webhook_is_retried_until_delivered(manager, fake_docker, receiver):
+    url, received, codes = receiver
+    manager.notifier.backoff = 0.05
+    manager.start()
+    job_id = manager.submit_job("hello", callback_url=url)
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "running")
+    assert received == []
+    fake_docker.finish(manager.jobs[job_id]["container_id"], 2)
+    assert wait_for(lambda: manager.jobs[job_id].get("callback"))
+    assert manager.jobs[job_id]["callback"]["delivered"] is True
+    assert manager.jobs[job_id]["callback"]["attempts"] == 2
+    assert [body["status"] for body in received] == ["complete", "complete"]
+    assert received[-1]["job_id"] == job_id and received[-1]["exit_code"] == 2
+
+def test_webhook_gives_up_on_client_errors(manager, receiver):
+    url, received, codes = receiver
+    codes[:] = [404]
+    manager.start()
+    job_id = manager.submit_job("hello", callback_url=url)
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "running")
+    assert manager.cancel_job(job_id)
+    assert wait_for(lambda: manager.jobs[job_id].get("callback"))
+    callback = manager.jobs[job_id]["callback"]
+    assert (callback["delivered"], callback["attempts"], callback["status_code"]) == (False, 1, 404)
+    assert received[0]["status"] == "cancelled"
+
+def test_callback_url_must_be_http(manager):
+    with pytest.raises(ValueError):
+        manager.submit_job("hello", callback_url="file:///etc/passwd")
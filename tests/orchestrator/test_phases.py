@@ -0,0 +1,67 @@
+import json
+import os
+from src.orchestrator.api.phases import PHASES_FILE, build_timeline, phase_percentiles, read_markers
+from tests.orchestrator.conftest import wait_for
+
+def write_markers(path, markers, garbage=False):
+    with open(os.path.join(path, PHASES_FILE), "w") as f:
+        for marker in markers:
+            f.write(json.dumps(marker) + "\n")
+        if garbage:
+            f.write('{"phase": "archive", "event": "st')  # killed mid-write
+
+def test_timeline_pairs_markers_and_splits_agent_phase(tmp_path):
+    write_markers(str(tmp_path), [
+        {"phase": "setup", "event": "start", "at": 12.0},
+        {"phase": "setup", "event": "end", "at": 12.5},
+        {"phase": "agent", "event": "start", "at": 12.5},
+        {"phase": "first_output", "event": "mark", "at": 15.5},
+        {"phase": "model_call", "duration": 2.0, "at": 18.0},
+        {"phase": "agent", "event": "end", "at": 20.5, "exit_code": 0},
+        {"phase": "archive", "event": "start", "at": 21.0},
+    ], garbage=True)
+    markers = read_markers(os.path.join(str(tmp_path), PHASES_FILE))
+    assert len(markers) == 7
+    timeline = build_timeline(markers, created=0.0, dispatched=10.0, exited=24.0)
+    seconds = {span["phase"]: span["seconds"] for span in timeline}
+    assert seconds == {
+        "queued": 10.0, "container_boot": 2.0, "setup": 0.5, "agent": 8.0, "time_to_first_output": 3.0,
+        "agent_work": 5.0, "model_call": 2.0, "archive": 3.0,
+    }
+    assert [span for span in timeline if span["phase"] == "archive"][0]["open"] is True  # killed while zipping
+    assert timeline[0]["phase"] == "queued"
+
+def test_percentiles_rank_the_slowest_phase():
+    timelines = [
+        [{"phase": "agent_work", "seconds": float(n)}, {"phase": "container_boot", "seconds": 1.0},
+         {"phase": "agent", "seconds": n + 1.0}]
+        for n in range(1, 101)
+    ]
+    report = phase_percentiles(timelines)
+    assert report["jobs"] == 100 and report["slowest_phase"] == "agent_work"
+    work = report["phases"]["agent_work"]
+    assert (work["p50_seconds"], work["p95_seconds"], work["p99_seconds"], work["max_seconds"]) == (50, 95, 99, 100)
+
+def test_finished_job_gets_timeline_and_packaging_phase(manager, fake_docker):
+    manager.start()
+    job_id = manager.submit_job("hello")
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "running")
+    job = manager.jobs[job_id]
+    started = job["started"]
+    write_markers(job["output_path"], [
+        {"phase": "setup", "event": "start", "at": started + 0.1},
+        {"phase": "setup", "event": "end", "at": started + 0.2},
+        {"phase": "agent", "event": "start", "at": started + 0.2},
+        {"phase": "first_output", "event": "mark", "at": started + 0.7},
+        {"phase": "agent", "event": "end", "at": started + 1.2, "exit_code": 0},
+    ])
+    fake_docker.finish(job["container_id"], 0)
+    assert wait_for(lambda: manager.jobs[job_id].get("artifact"))
+    timeline = manager.get_timeline(job_id)
+    phases = [span["phase"] for span in timeline["phases"]]
+    assert {"queued", "container_boot", "setup", "time_to_first_output", "agent_work", "packaging"} <= set(phases)
+    assert phases[-1] == "packaging"
+    assert timeline["wall_seconds"] > 0
+    report = manager.phase_report()
+    assert report["jobs"] == 1 and report["phases"]["time_to_first_output"]["p50_seconds"] == 0.5
+    assert manager.get_timeline("missing") is None
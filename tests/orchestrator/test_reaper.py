@@ -0,0 +1,63 @@
+import os
+import time
+from src.orchestrator.api.reaper import RetentionReaper
+from tests.orchestrator.conftest import wait_for
+
+def test_only_due_jobs_are_reaped_in_batches():
+    batches = []
+    reaper = RetentionReaper(lambda ids: batches.append(ids) or {"jobs_reaped": len(ids)}, batch_size=2)
+    for i, due in enumerate([10, 30, 20, 15, 100]):
+        reaper.schedule(f"job-{i}", due)
+    reaper.schedule("job-4", 5)  # moved earlier; the old heap entry is skipped
+    assert reaper.pop_due(now=0) == []
+    assert reaper.pop_due(now=25) == ["job-4", "job-0"]
+    assert reaper.pop_due(now=25) == ["job-3", "job-2"]
+    assert reaper.pop_due(now=1000) == ["job-1"]
+    assert reaper.stats()["tracked_jobs"] == 0
+
+def test_background_reaper_wakes_at_deadline():
+    reaped = []
+    reaper = RetentionReaper(lambda ids: reaped.extend(ids) or {"jobs_reaped": len(ids)}, batch_size=10)
+    reaper.start()
+    try:
+        reaper.schedule("soon", time.time() + 0.05)
+        assert wait_for(lambda: reaped == ["soon"])
+        assert reaper.stats()["jobs_reaped"] == 1
+    finally:
+        reaper.stop()
+
+def test_expired_jobs_are_removed(manager, job_manager_module, fake_docker, monkeypatch):
+    monkeypatch.setattr(job_manager_module, "RETENTION_DAYS", 0)
+    manager.start()
+    job_id = manager.submit_job("hello")
+    kept = manager.submit_job("still running")
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "running")
+    assert wait_for(lambda: manager.jobs[kept]["status"] == "running")
+    container_id = manager.jobs[job_id]["container_id"]
+    output_path = manager.jobs[job_id]["output_path"]
+    with open(os.path.join(output_path, "index.html"), "w") as f:
+        f.write("<html></html>")
+    fake_docker.finish(container_id, 0)
+    assert wait_for(lambda: job_id not in manager.jobs)
+    assert wait_for(lambda: container_id not in fake_docker.containers_by_id)
+    assert not os.path.exists(output_path)
+    assert manager.store.get(job_id) is None
+    assert manager.watcher.get(container_id) is None
+    assert kept in manager.jobs
+    stats = manager.reaper.stats()
+    assert stats["jobs_reaped"] == 1 and stats["bytes_freed"] > 0 and stats["errors"] == 0
+
+def test_container_is_removed_when_job_finishes(manager, fake_docker):
+    from src.orchestrator.api.metrics import CONTAINERS_REMOVED
+    removed_before = CONTAINERS_REMOVED.value()
+    manager.start()
+    job_id = manager.submit_job("hello")
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "running")
+    container = fake_docker.containers.get(manager.jobs[job_id]["container_id"])
+    container.write(b"last words\n")
+    fake_docker.finish(container.id, 0)
+    assert wait_for(lambda: container.id not in fake_docker.containers_by_id)
+    assert manager.jobs[job_id]["status"] == "complete"  # the record and workspace stay until retention expires
+    assert manager.get_logs(job_id) == "last words"
+    assert CONTAINERS_REMOVED.value() == removed_before + 1
+    assert manager.watcher.get(container.id) is None
@@ -0,0 +1,51 @@
+import os
+import time
+from src.orchestrator.api.execution_backend import JOB_ID_LABEL
+from src.orchestrator.api.job_store import SqliteJobStore
+from tests.orchestrator.conftest import wait_for
+
+def test_startup_reconciles_with_one_labelled_listing(job_manager_module, fake_docker):
+    store = SqliteJobStore(os.path.join(job_manager_module.OUTPUT_DIR, "reconcile.db"))
+    new_job = job_manager_module.JobManager._new_job
+    history = {}
+    for i in range(2000):
+        job_id, job = new_job(f"old {i}", 0, None)
+        job.update({"status": "complete", "container_id": f"gone-{i}", "completed": time.time(), "exit_code": 0})
+        history[job_id] = job
+    image = job_manager_module.AGENT_IMAGE
+
+    def container(job_id):
+        return fake_docker.containers.run(image, f"agent_job_{job_id[:8]}", labels={JOB_ID_LABEL: job_id})
+
+    live_id, live = new_job("live", 0, None)
+    live.update({"status": "running", "container_id": container(live_id).id, "started": time.time()})
+    vanished_id, vanished = new_job("vanished", 0, None)
+    vanished.update({"status": "running", "container_id": "deadbeef", "started": time.time()})
+    launched_id, launched = new_job("launched before a crash", 0, None)  # still pending in the store
+    launched_container = container(launched_id)
+    lost_id = "7d4f3c2e-0000-4000-8000-000000000001"  # container with no job record at all
+    fake_docker.finish(container(lost_id).id, 4)
+    store.upsert_many({**history, live_id: live, vanished_id: vanished, launched_id: launched})
+
+    jm = job_manager_module.JobManager(docker_client=fake_docker, store=store)
+    calls_before = (fake_docker.list_calls, fake_docker.get_calls)
+    jm.start()
+    try:
+        assert wait_for(jm.reconciled.is_set)
+        assert jm.reconcile_stats["adopted"] == 2 and jm.reconcile_stats["orphaned"] == 1
+        assert jm.jobs[vanished_id]["status"] == "not_found"
+        assert jm.jobs[launched_id]["status"] == "running"
+        assert jm.jobs[launched_id]["container_id"] == launched_container.id
+        assert jm.queue_position(launched_id) is None  # adopted, so never launched a second time
+        assert jm.jobs[lost_id]["adopted"] and jm.jobs[lost_id]["status"] == "complete"
+        assert jm.jobs[lost_id]["exit_code"] == 4
+        assert jm.jobs[live_id]["status"] == "running"
+        # One labelled listing plus the watcher's resync; container lookups only for the unlabelled
+        # vanished job and the log pumps of running ones, never for the 2000 finished jobs.
+        assert fake_docker.list_calls - calls_before[0] <= 2
+        assert fake_docker.get_calls - calls_before[1] <= 4
+        # The adopted job that had already exited is finished, so its container is removed.
+        assert wait_for(lambda: len(fake_docker.containers_by_id) == 2)
+    finally:
+        jm.stop()
+        store.close()
@@ -0,0 +1,69 @@
+import os
+import pytest
+from src.orchestrator.api.job_store import SqliteJobStore
+from src.orchestrator.api.result_cache import ResultCache
+from src.orchestrator.config import config
+from tests.orchestrator.conftest import wait_for
+
+def test_keys_ttl_and_size_eviction():
+    image = {"id": "sha256:a"}
+    cache = ResultCache(ttl=100, max_bytes=10, image_id=lambda: image["id"], model_key="m1", image_ttl=0)
+    key = cache.key_for("build  a site\n")
+    assert key == cache.key_for(" build a site")
+    image["id"] = "sha256:b"
+    assert cache.key_for("build a site") != key
+    cache.put("k1", "job1", 4, stored=0)
+    cache.put("k2", "job2", 4, stored=50)
+    assert cache.get("k1", now=10) == "job1"  # k1 is now the most recently used
+    cache.put("k3", "job3", 4, stored=50)
+    assert cache.get("k2", now=60) is None  # evicted to stay under 10 bytes
+    assert cache.get("k1", now=120) is None  # expired
+    cache.forget_job("job3")
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (0, 1, 2, 1, 1)
+    assert stats["hit_rate"] == round(1 / 3, 4)
+
+@pytest.fixture
+def cached_manager(job_manager_module, fake_docker, monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "RESULT_CACHE_ENABLED", True)
+    jm = job_manager_module.JobManager(docker_client=fake_docker, store=SqliteJobStore(str(tmp_path / "j.db")))
+    jm.start()
+    yield jm
+    jm.stop()
+    jm.store.close()
+
+def test_identical_prompt_is_answered_from_cache(cached_manager, fake_docker):
+    jm = cached_manager
+    first = jm.submit_job("make a landing page")
+    assert wait_for(lambda: jm.jobs[first]["status"] == "running")
+    with open(os.path.join(jm.jobs[first]["output_path"], "index.html"), "w") as f:
+        f.write("<h1>hi</h1>")
+    fake_docker.finish(jm.jobs[first]["container_id"], 0)
+    assert wait_for(lambda: jm.cache.stats()["entries"] == 1)
+    containers = len(fake_docker.containers_by_id)
+
+    hit = jm.submit_job("  make a   landing page ")
+    assert jm.get_job(hit)["start_mode"] == "cached" and jm.scheduler.position(hit) is None
+    assert wait_for(lambda: jm.get_job(hit)["status"] == "complete")
+    job = jm.get_job(hit)
+    assert (job["status"], job["cache_hit_of"], job["exit_code"]) == ("complete", first, 0)
+    assert len(fake_docker.containers_by_id) == containers
+    with open(os.path.join(job["output_path"], "index.html")) as f:
+        assert f.read() == "<h1>hi</h1>"
+    assert jm.get_output(hit) == jm.packager.artifact_path(hit)
+    assert os.path.samefile(jm.get_output(hit), jm.get_output(first))
+
+    fresh = jm.submit_job("make a landing page", no_cache=True)
+    assert wait_for(lambda: jm.jobs[fresh]["status"] == "running")
+    assert jm.cache_report()["hits"] == 1
+
+def test_reaped_source_leaves_cache(cached_manager, fake_docker, job_manager_module, monkeypatch):
+    jm = cached_manager
+    job_id = jm.submit_job("hello")
+    assert wait_for(lambda: jm.jobs[job_id]["status"] == "running")
+    fake_docker.finish(jm.jobs[job_id]["container_id"], 0)
+    assert wait_for(lambda: jm.cache.stats()["entries"] == 1)
+    monkeypatch.setattr(job_manager_module, "RETENTION_DAYS", 0)
+    jm.reaper.schedule(job_id, 0)
+    assert wait_for(lambda: job_id not in jm.jobs)
+    assert jm.cache.stats()["entries"] == 0
@@ -0,0 +1,66 @@
+import time
+from threading import Event
+from src.orchestrator.api.scheduler import JobScheduler
+from tests.orchestrator.conftest import wait_for
+
+def test_priority_then_fifo_order_and_positions():
+    scheduler = JobScheduler(lambda job_id: None, max_concurrent=1)
+    scheduler.enqueue("low", priority=0, created=1.0)
+    scheduler.enqueue("later", priority=0, created=2.0)
+    assert scheduler.enqueue("urgent", priority=5, created=3.0) == 1
+    assert [scheduler.position(j) for j in ("urgent", "low", "later")] == [1, 2, 3]
+    assert scheduler.remove("low")
+    assert scheduler.position("later") == 2
+    assert scheduler.position("low") is None
+
+def test_concurrency_cap_and_promotion_on_release():
+    launched = []
+    scheduler = JobScheduler(launched.append, max_concurrent=2)
+    for i in range(4):
+        scheduler.enqueue(f"job{i}", created=float(i))
+    scheduler.start()
+    try:
+        assert wait_for(lambda: launched == ["job0", "job1"])
+        time.sleep(0.05)
+        assert scheduler.depth() == 2
+        scheduler.release("job0")
+        assert wait_for(lambda: launched == ["job0", "job1", "job2"])
+        assert scheduler.running_count() == 2
+    finally:
+        scheduler.stop()
+
+def test_pending_jobs_survive_restart(manager, job_manager_module, fake_docker):
+    job_id = manager.submit_job("queued", priority=3)
+    assert manager.get_status(job_id) == "pending"
+    restarted = job_manager_module.JobManager(docker_client=fake_docker, store=manager.store)
+    assert restarted.queue_position(job_id) == 1
+    assert restarted.jobs[job_id]["priority"] == 3
+
+def test_admission_check_holds_the_head_until_poked():
+    launched, room = [], {"ok": False}
+    scheduler = JobScheduler(launched.append, max_concurrent=4, admit=lambda job_id: room["ok"], retry_interval=60)
+    scheduler.enqueue("job0")
+    scheduler.start()
+    try:
+        time.sleep(0.05)
+        assert launched == [] and scheduler.depth() == 1
+        room["ok"] = True
+        scheduler.poke()
+        assert wait_for(lambda: launched == ["job0"])
+    finally:
+        scheduler.stop()
+
+def test_stop_waits_for_launches_in_flight():
+    started, finished = Event(), []
+
+    def launch(job_id):
+        started.set()
+        time.sleep(0.2)
+        finished.append(job_id)
+
+    scheduler = JobScheduler(launch, max_concurrent=2, launch_workers=2)
+    scheduler.enqueue("job0")
+    scheduler.start()
+    assert started.wait(2)
+    scheduler.stop()
+    assert finished == ["job0"]
@@ -0,0 +1,102 @@
+from src.orchestrator.api.execution_backend import JOB_ID_LABEL
+from src.orchestrator.api.status_watcher import REMOVED, ContainerStatusWatcher
+from tests.orchestrator.conftest import wait_for
+from benchmarks.fake_docker import FakeDockerClient
+
+IMAGE = "containerized-agent:latest"
+LABELS = {JOB_ID_LABEL: "job-1"}
+
+def _watcher(client, changes):
+    return ContainerStatusWatcher(
+        client, JOB_ID_LABEL, lambda cid, status, code: changes.append((cid, status, code)),
+        resync_interval=3600, reconnect_delay=0.01,
+    )
+
+def test_events_update_cache_without_inspecting_containers():
+    client = FakeDockerClient()
+    changes = []
+    watcher = _watcher(client, changes)
+    watcher.start()
+    try:
+        assert wait_for(lambda: watcher.healthy)
+        container = client.containers.run(IMAGE, labels=LABELS)
+        assert wait_for(lambda: watcher.get(container.id) == ("running", None))
+        client.finish(container.id, 3)
+        assert wait_for(lambda: watcher.get(container.id) == ("exited", 3))
+        assert (container.id, "exited", 3) in changes
+    finally:
+        watcher.stop()
+
+def test_resync_recovers_state_missed_while_disconnected():
+    client = FakeDockerClient()
+    watcher = _watcher(client, [])
+    running = client.containers.run(IMAGE, labels=LABELS)
+    gone = client.containers.run(IMAGE, labels=LABELS)
+    watcher.track(running.id)
+    watcher.track(gone.id)
+    # Both changes happen with no event stream connected.
+    running.status, running.exit_code = "exited", 0
+    client.containers_by_id.pop(gone.id)
+    watcher.resync()
+    assert watcher.get(running.id) == ("exited", 0)
+    assert watcher.get(gone.id) == (REMOVED, None)
+    assert client.list_calls == 1
+
+def test_watches_by_label_across_image_rebuilds():
+    client = FakeDockerClient()
+    watcher = _watcher(client, [])
+    watcher.start()
+    try:
+        assert wait_for(lambda: watcher.healthy)
+        # Started before the tag was rebuilt: Docker now reports the old image ID, not the tag.
+        old_build = client.containers.run("sha256:0ld", labels=LABELS)
+        unrelated = client.containers.run(IMAGE)
+        client.finish(old_build.id, 2)
+        client.finish(unrelated.id, 0)
+        assert wait_for(lambda: watcher.get(old_build.id) == ("exited", 2))
+        watcher.resync()
+        assert watcher.get(unrelated.id) is None
+    finally:
+        watcher.stop()
+
+def test_reconnects_after_stream_drop():
+    client = FakeDockerClient()
+    watcher = _watcher(client, [])
+    watcher.start()
+    try:
+        assert wait_for(lambda: watcher.healthy)
+        container = client.containers.run(IMAGE, labels=LABELS)
+        client.drop_event_streams()
+        container.status, container.exit_code = "exited", 1
+        assert wait_for(lambda: watcher.get(container.id) == ("exited", 1))
+        assert wait_for(lambda: watcher.healthy)
+    finally:
+        watcher.stop()
+
+def test_get_status_answers_from_cache(manager, fake_docker):
+    manager.start()
+    assert wait_for(lambda: manager.watcher.healthy)
+    job_id = manager.submit_job("hello")
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "running")
+    container_id = manager.jobs[job_id]["container_id"]
+    fake_docker.finish(container_id, 0)
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "complete")
+    fake_docker.containers_by_id.clear()  # any daemon lookup would now raise NotFound
+    assert manager.get_status(job_id) == "complete"
+    assert manager.jobs[job_id]["exit_code"] == 0
+
+def test_container_exiting_before_launch_returns_is_not_lost(manager, fake_docker, monkeypatch):
+    manager.start()
+    assert wait_for(lambda: manager.watcher.healthy)
+    run = fake_docker.containers.run
+
+    def run_and_exit(*args, **kwargs):
+        container = run(*args, **kwargs)
+        fake_docker.finish(container.id, 0)
+        assert wait_for(lambda: manager.watcher.get(container.id) == ("exited", 0))
+        return container
+
+    monkeypatch.setattr(fake_docker.containers, "run", run_and_exit)
+    job_id = manager.submit_job("hello")
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "complete")
+    assert manager.scheduler.running_count() == 0
@@ -0,0 +1,76 @@
+import os
+import pytest
+from src.orchestrator.api.job_store import SqliteJobStore
+from src.orchestrator.api.templates import TemplateStore, materialize
+from src.orchestrator.config import config
+from tests.orchestrator.conftest import wait_for
+
+def build_project(command, directory):
+    """Stand-in for a template build container: a small app with one dependency installed."""
+    os.makedirs(os.path.join(directory, "node_modules", "react"))
+    with open(os.path.join(directory, "package.json"), "w") as f:
+        f.write('{"name": "app", "scripts": {"build": "%s"}}' % command)
+    with open(os.path.join(directory, "node_modules", "react", "index.js"), "w") as f:
+        f.write("module.exports = {};\n" * 1000)
+    os.symlink("react/index.js", os.path.join(directory, "node_modules", "main.js"))
+
+def test_materialize_gives_each_workspace_private_files(tmp_path):
+    src, dest = str(tmp_path / "template"), str(tmp_path / "workspace")
+    os.makedirs(src)
+    build_project("vite build", src)
+    stats = materialize(src, dest)
+    assert stats["files"] == 3 and stats["mode"] in ("reflink", "copy")
+    assert stats["bytes_written"] + stats["bytes_shared"] == os.path.getsize(os.path.join(src, "package.json")) + 21000
+    assert os.readlink(os.path.join(dest, "node_modules", "main.js")) == "react/index.js"
+    dependency = os.path.join("node_modules", "react", "index.js")
+    assert not os.path.samefile(os.path.join(src, dependency), os.path.join(dest, dependency))
+    # In-place writes, as npm or the agent would make, never reach the template.
+    for rel in ("package.json", dependency):
+        with open(os.path.join(dest, rel), "r+") as f:
+            f.write("patched")
+    with open(os.path.join(src, "package.json")) as f:
+        assert "vite build" in f.read()
+    with open(os.path.join(src, dependency)) as f:
+        assert f.read().startswith("module.exports")
+
+def test_refresh_keeps_previous_version_and_survives_restart(tmp_path):
+    root = str(tmp_path / "templates")
+    store = TemplateStore(root, {"react": "vite build"}, build_project, refresh_interval=3600)
+    with pytest.raises(RuntimeError):
+        store.seed("react", str(tmp_path / "early"))
+    versions = []
+    for _ in range(3):
+        assert store.refresh("react")
+        versions.append(store.stats()["templates"]["react"]["version"])
+    assert len(set(versions)) == 3
+    kept = ["CURRENT", *versions[1:], *(version + ".json" for version in versions[1:])]
+    assert sorted(os.listdir(os.path.join(root, "react"))) == sorted(kept)
+    restarted = TemplateStore(root, {"react": "vite build"}, build_project, refresh_interval=3600)
+    assert restarted.ready("react")
+    assert restarted.stats()["templates"]["react"]["files"] == 3
+    failing = TemplateStore(root, {"react": "vite build"}, lambda command, directory: 1 / 0, refresh_interval=3600)
+    assert not failing.refresh("react")
+    assert failing.stats()["templates"]["react"]["version"] == versions[-1]
+
+def test_job_workspace_is_seeded_from_template(job_manager_module, fake_docker, monkeypatch):
+    monkeypatch.setattr(config, "WORKSPACE_TEMPLATES", {"react-vite": "npm install"})
+    store = SqliteJobStore(os.path.join(job_manager_module.OUTPUT_DIR, "templates.db"))
+    jm = job_manager_module.JobManager(docker_client=fake_docker, store=store)
+    jm.templates.build = build_project
+    jm.start()
+    try:
+        with pytest.raises(ValueError):
+            jm.submit_job("hello", template="rails")
+        assert wait_for(lambda: jm.templates.ready("react-vite"))
+        job_id = jm.submit_job("add a login page", template="react-vite")
+        assert wait_for(lambda: jm.jobs[job_id]["status"] == "running")
+        workspace = jm.jobs[job_id]["output_path"]
+        assert os.path.isfile(os.path.join(workspace, "node_modules", "react", "index.js"))
+        seed = jm.jobs[job_id]["seed"]
+        assert seed["template"] == "react-vite" and seed["files"] == 3 and seed["seconds"] < 1
+        report = jm.template_report()
+        assert report["templates"]["react-vite"]["seeds"] == 1
+        assert report["templates"]["react-vite"]["bytes_written"] == seed["bytes_written"]
+    finally:
+        jm.stop()
+        store.close()
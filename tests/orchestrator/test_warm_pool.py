@@ -0,0 +1,118 @@
+import os
+import time
+from src.orchestrator.api.warm_pool import EXIT_FILE, WarmPool
+from src.orchestrator.config import config
+from tests.orchestrator.conftest import wait_for
+
+def _pool(fake_docker, tmp_path, exits, **kwargs):
+    options = {"size": 2, "max_idle": 60, "max_uses": 1, "interval": 0.01}
+    options.update(kwargs)
+    return WarmPool(
+        fake_docker, "agent:latest", str(tmp_path), run_kwargs=dict,
+        on_job_exit=lambda job_id, code: exits.append((job_id, code)), **options
+    )
+
+def test_claim_hands_off_prompt_and_refills(fake_docker, tmp_path):
+    pool = _pool(fake_docker, tmp_path, [])
+    pool.start()
+    try:
+        assert wait_for(lambda: pool.stats()["idle"] == 2)
+        container_id, output_path = pool.claim("job-1", "build a todo app")
+        handoff = os.path.join(os.path.dirname(output_path), "next")
+        with open(os.path.join(handoff, "prompt"), encoding="utf-8") as f:
+            assert f.read() == "build a todo app"
+        assert os.path.exists(os.path.join(handoff, "ready"))
+        assert fake_docker.containers.get(container_id).kwargs["environment"]["AGENT_WARM_POOL"] == "1"
+        assert wait_for(lambda: pool.stats()["idle"] == 2 and pool.stats()["created"] == 3)
+    finally:
+        pool.stop()
+    assert pool.stats()["idle"] == 0
+
+def test_reusable_container_reports_exit_and_returns_to_pool(fake_docker, tmp_path):
+    exits = []
+    pool = _pool(fake_docker, tmp_path, exits, size=1, max_uses=2)
+    pool.start()
+    try:
+        assert wait_for(lambda: pool.stats()["idle"] == 1)
+        container_id, output_path = pool.claim("job-1", "p")
+        os.makedirs(output_path)
+        exit_file = os.path.join(output_path, EXIT_FILE)
+        open(exit_file, "w").close()  # created but not yet written
+        time.sleep(0.1)
+        assert exits == []
+        with open(exit_file, "w", encoding="utf-8") as f:
+            f.write("0\n")
+        assert wait_for(lambda: exits == [("job-1", 0)])
+        with pool.lock:
+            assert container_id in [pool.slots[slot_id]["container_id"] for slot_id in pool.idle]
+    finally:
+        pool.stop()
+
+def test_idle_containers_are_recycled(fake_docker, tmp_path):
+    pool = _pool(fake_docker, tmp_path, [], size=1, max_idle=0)
+    pool.start()
+    try:
+        assert wait_for(lambda: pool.stats()["retired"] >= 1)
+    finally:
+        pool.stop()
+
+def test_job_manager_uses_pooled_container(job_manager_module, fake_docker, monkeypatch, tmp_path):
+    from src.orchestrator.api.job_store import SqliteJobStore
+    monkeypatch.setattr(config, "WARM_POOL_SIZE", 1)
+    manager = job_manager_module.JobManager(docker_client=fake_docker, store=SqliteJobStore(str(tmp_path / "j.db")))
+    manager.start()
+    try:
+        assert wait_for(lambda: manager.pool.stats()["idle"] == 1)
+        job_id = manager.submit_job("hello")
+        assert wait_for(lambda: manager.jobs[job_id]["status"] == "running")
+        job = manager.jobs[job_id]
+        assert job["start_mode"] == "pooled"
+        with open(os.path.join(job["output_path"], job_manager_module.FIRST_OUTPUT_FILE), "w") as f:
+            f.write(str(job["dispatched"] + 1.5))
+        fake_docker.finish(job["container_id"], 0)
+        assert wait_for(lambda: manager.jobs[job_id].get("first_output"))
+        assert manager.start_latency_stats()["pooled"]["p50_seconds"] == 1.5
+    finally:
+        manager.stop()
+
+def test_reused_slot_hides_earlier_job_and_is_removed_on_retire(fake_docker, tmp_path):
+    exits = []
+    pool = _pool(fake_docker, tmp_path, exits, size=1, max_uses=2)
+    pool._spawn()  # no maintenance thread: the slot is only refilled and collected when the test says so
+    container_id, first_path = pool.claim("job-1", "p")
+    os.makedirs(first_path)
+    with open(os.path.join(first_path, "secret.txt"), "w") as f:
+        f.write("job-1 only")
+    with open(os.path.join(first_path, EXIT_FILE), "w") as f:
+        f.write("0")
+    pool._collect_finished()
+    assert exits == [("job-1", 0)] and pool.stats()["idle"] == 1
+    reused_id, second_path = pool.claim("job-2", "p")
+    slot_path = os.path.dirname(second_path)
+    assert reused_id == container_id
+    assert os.listdir(slot_path) == ["next"]  # nobody moved job-1's directory out, so claim wiped it
+    pool.forget(container_id)
+    assert not os.path.exists(slot_path)
+
+def test_pooled_job_output_moves_out_of_slot(job_manager_module, fake_docker, monkeypatch, tmp_path):
+    from src.orchestrator.api.job_store import SqliteJobStore
+    monkeypatch.setattr(config, "WARM_POOL_SIZE", 1)
+    monkeypatch.setattr(config, "WARM_POOL_MAX_USES", 2)
+    manager = job_manager_module.JobManager(docker_client=fake_docker, store=SqliteJobStore(str(tmp_path / "j.db")))
+    manager.start()
+    try:
+        assert wait_for(lambda: manager.pool.stats()["idle"] == 1)
+        job_id = manager.submit_job("hello")
+        assert wait_for(lambda: manager.jobs[job_id]["status"] == "running")
+        slot_output = manager.jobs[job_id]["output_path"]
+        with open(os.path.join(slot_output, "app.js"), "w") as f:
+            f.write("console.log(1)")
+        with open(os.path.join(slot_output, EXIT_FILE), "w") as f:
+            f.write("0")
+        assert wait_for(lambda: manager.jobs[job_id]["status"] == "complete")
+        output = manager.jobs[job_id]["output_path"]
+        assert output == os.path.join(job_manager_module.OUTPUT_DIR, job_id)
+        assert os.path.exists(os.path.join(output, "app.js")) and not os.path.exists(slot_output)
+        assert wait_for(lambda: manager.jobs[job_id].get("artifact"))
+    finally:
+        manager.stop()
@@ -0,0 +1,54 @@
+import time
+from src.orchestrator.api.watchdog import JobWatchdog
+from src.orchestrator.config import config
+from tests.orchestrator.conftest import wait_for
+
+def test_heap_entries_expire_rearm_and_escalate():
+    calls, activity = [], {}
+    dog = JobWatchdog(
+        lambda job_id, reason: calls.append((job_id, reason)),
+        lambda job_id: calls.append((job_id, "kill")),
+        activity.get,
+        grace=5,
+    )
+    dog.watch("slow", started=0, timeout=100, idle_timeout=None)
+    dog.watch("quiet", started=0, timeout=None, idle_timeout=10)
+    dog.watch("done", started=0, timeout=1, idle_timeout=None)
+    dog.forget("done")
+    activity["quiet"] = 8
+    assert dog.run_due(now=12) == 0  # output at t=8 pushes the idle deadline to t=18
+    assert dog.run_due(now=18) == 1 and calls == [("quiet", "idle")]
+    assert dog.run_due(now=23) == 1 and calls[-1] == ("quiet", "kill")  # still running after the grace period
+    assert dog.run_due(now=101) == 1 and calls[-1] == ("slow", "deadline")
+    dog.forget("slow")  # exited after SIGTERM, so it is never killed
+    assert dog.run_due(now=200) == 0
+    assert dog.stats() == {"watched_jobs": 0, "timed_out": {"deadline": 1, "idle": 1}, "killed": 1}
+
+def test_deadline_sends_sigterm_and_keeps_the_workspace(manager, fake_docker, monkeypatch):
+    monkeypatch.setattr(config, "JOB_TIMEOUT", 0.3)
+    manager.start()
+    job_id = manager.submit_job("hangs")
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "running")
+    container = fake_docker.containers_by_id[manager.jobs[job_id]["container_id"]]
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "timed_out")
+    assert container.signals == ["SIGTERM"]
+    assert manager.jobs[job_id]["exit_code"] == 143
+    assert manager.jobs[job_id]["timeout"]["reason"] == "deadline"
+    assert manager.get_output(job_id)  # archived like a completed job
+
+def test_idle_job_ignoring_sigterm_is_killed_after_grace(manager, fake_docker, monkeypatch):
+    monkeypatch.setattr(config, "JOB_IDLE_TIMEOUT", 0.3)
+    manager.watchdog.grace = 0.2
+    manager.start()
+    job_id = manager.submit_job("stuck")
+    exempt = manager.submit_job("allowed to be quiet", idle_timeout=0)
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "running")
+    container = fake_docker.containers_by_id[manager.jobs[job_id]["container_id"]]
+    container.ignore_sigterm = True
+    container.write(b"still working\n")
+    assert wait_for(lambda: manager.jobs[job_id]["status"] == "timed_out")
+    assert container.signals == ["SIGTERM", "SIGKILL"]
+    assert manager.jobs[job_id]["exit_code"] == 137
+    assert manager.jobs[job_id]["timeout"]["reason"] == "idle"
+    time.sleep(0.2)
+    assert manager.jobs[exempt]["status"] == "running"